@@ -1,8 +1,9 @@
 # backend/app/database.py
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from dotenv import load_dotenv
-from app.utilities.backup_manager import create_on_update_backup
+from app.utilities import backup_worker, backup_metrics, change_journal
+from app.utilities.backup_manager import ON_UPDATE_BACKUP_MODE, UNTRACKED_TABLES
 import os
 
 load_dotenv()
@@ -23,11 +24,38 @@ def get_db():
     finally:
         db.close()
 
+@event.listens_for(Session, "after_flush")
+def receive_after_flush(session, flush_context):
+    """Records which tables this session wrote (commits with no changes skip the backup)."""
+    touched = session.info.setdefault("touched_tables", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        touched.add(inspect(obj).mapper.local_table.name)
+    touched -= UNTRACKED_TABLES
+
+@event.listens_for(Session, "do_orm_execute")
+def receive_orm_execute(orm_execute_state):
+    """Bulk Query.delete()/update() bypass the flush, so record those too."""
+    if (orm_execute_state.is_delete or orm_execute_state.is_update) and orm_execute_state.bind_mapper:
+        if orm_execute_state.bind_mapper.local_table.name in UNTRACKED_TABLES:
+            return
+        touched = orm_execute_state.session.info.setdefault("touched_tables", set())
+        touched.add(orm_execute_state.bind_mapper.local_table.name)
+
+@event.listens_for(Session, "after_rollback")
+def receive_after_rollback(session):
+    session.info.pop("touched_tables", None)
+
 @event.listens_for(Session, "after_commit")
 def receive_after_commit(session):
-    """Triggers whenever any session commits data to the DB"""
+    """Triggers whenever any session commits data to the DB.
+    In "journal" mode the change_journal hooks record the rows instead of dumping.
+    In "dump" mode this only notifies the background worker; pg_dump runs off the request path."""
+    touched = session.info.pop("touched_tables", None)
+    if not touched or ON_UPDATE_BACKUP_MODE != "dump":
+        return
     try:
-        create_on_update_backup()
+        backup_metrics.note_commit()
+        backup_worker.notify_commit(touched)
     except Exception as e:
         print(f"Backup trigger failed: {e}")
 
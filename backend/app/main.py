@@ -1,12 +1,17 @@
 # backend/app/main.py
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from sqlalchemy import text
 from .database import engine
 from .routes import invoiceRoutes
 from .routes import docketRoutes
 from .routes import settingsRoutes
+from .routes import exportRoutes
+from .routes import assetRoutes
 from fastapi.middleware.cors import CORSMiddleware
 from .utilities.backup_manager import start_backup_scheduler
+from .utilities import request_metrics
+from .services import pdf_render_pool
 
 app = FastAPI()
 
@@ -26,10 +31,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency (compared with/without a running backup, and used to defer backups)
+@app.middleware("http")
+async def measure_latency(request: Request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    request_metrics.record((time.perf_counter() - start) * 1000, getattr(route, "path", request.url.path))
+    return response
+
 # Include routers
 app.include_router(invoiceRoutes.router)
 app.include_router(docketRoutes.router)
 app.include_router(settingsRoutes.router)
+app.include_router(exportRoutes.router)
+app.include_router(assetRoutes.router)
 
 # Test DB connection on startup
 @app.on_event("startup")
@@ -44,4 +60,8 @@ def test_connection():
 # Scheduler for backups
 @app.on_event("startup")
 def start_scheduler():
-    start_backup_scheduler()
\ No newline at end of file
+    start_backup_scheduler()
+
+@app.on_event("shutdown")
+def stop_render_pool():
+    pdf_render_pool.shutdown()
\ No newline at end of file
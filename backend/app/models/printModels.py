@@ -0,0 +1,30 @@
+# app/models/printModels.py
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from app.database import Base
+
+class PrintJob(Base):
+    __tablename__ = "print_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # No foreign key: the print history outlives deleted dockets
+    docket_id = Column(Integer, index=True)
+    filename = Column(String(255), unique=True, index=True) # PRINT_Qty-2_ID-15_Q-office_1700000000.pdf
+    # Named queue the job is routed to (PRINT_QUEUES); None = any watcher
+    queue = Column(String(50), nullable=True, index=True)
+    route = Column(String(20), nullable=True) # requested | terminal | docket_type | least_busy | failover
+    printer = Column(String(50), nullable=True) # Set by the watcher that claims the job
+    copies = Column(Integer, default=1)
+
+    # queued -> claimed -> printing -> done | failed
+    status = Column(String(20), default="queued")
+    attempts = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime)
+    claimed_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Watchers claim the oldest queued job
+    __table_args__ = (Index("ix_print_jobs_status_created", "status", "created_at"),)
@@ -0,0 +1,23 @@
+# app/routes/assetRoutes.py
+from fastapi import APIRouter, HTTPException, Response
+from app.services import render_resources
+
+# Fonts/images referenced by the /preview HTML (PDF renders fetch them in-process instead)
+ASSET_ROUTE = "/api/assets"
+
+router = APIRouter(
+    prefix=ASSET_ROUTE,
+    tags=["Assets"]
+)
+
+@router.get("/{name}")
+def get_asset(name: str):
+    data = render_resources.get_asset(name)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return Response(
+        content=data,
+        media_type=render_resources.get_mime_type(name),
+        # URLs carry ?v=<template version>, so a changed file gets a new URL
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
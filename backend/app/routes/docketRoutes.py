@@ -1,14 +1,16 @@
 # ./backend/app/routes/docketRoutes.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header
 from fastapi.responses import HTMLResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import date
-from app.database import get_db
-from app.schema.docketSchema import DocketCreate
-from app.services.docket import docket_crud, docket_list, docket_pdf, inventory_service, docket_printer
-from app.utilities.backup_manager import create_on_update_backup
+from app.database import get_db, SessionLocal
+from app.schema.docketSchema import DocketCreate, PrintJobUpdate
+from app.services.docket import docket_crud, docket_list, docket_pdf, inventory_service, docket_printer, print_events, print_routing
+from app.services import batch_export
+from app.routes.assetRoutes import ASSET_ROUTE
+from app.utilities import backup_worker
 
 router = APIRouter(
     prefix="/api/dockets",
@@ -52,9 +54,68 @@ def get_dockets(
     search: Optional[str] = None, 
     start_date: Optional[date] = None, 
     end_date: Optional[date] = None, 
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: Session = Depends(get_db)
 ):
-    return docket_list.get_dockets_paginated(db, page, limit, search, start_date, end_date)
+    # cursor (next_cursor / prev_cursor of a previous response) takes precedence over page
+    return docket_list.get_dockets_paginated(db, page, limit, search, start_date, end_date, cursor, include_total)
+
+# --- BATCH EXPORT (ZIP / merged PDF; progress at /api/exports/{id}) ---
+@router.post("/export")
+def export_dockets(
+    format: str = "zip",
+    search: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    return batch_export.start_export(db, "docket", format, search, start_date, end_date)
+
+# --- PRINT EVENTS (Server-Sent Events; replaces polling /print-status) ---
+@router.get("/print-events")
+def stream_print_events(
+    filename: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    initial = None
+    if filename and last_event_id is None:
+        # First connect: current state of the job, then every change after this point.
+        # Own short-lived session: a get_db session would hold its pooled connection until the stream ends
+        last_event_id = print_events.last_id()
+        db = SessionLocal()
+        try:
+            job = docket_printer.get_job_by_filename(db, filename)
+        finally:
+            db.close()
+        initial = [job] if job else []
+    return StreamingResponse(
+        print_events.stream(last_event_id, filename, initial),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: nginx passes events through as they are written
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# --- PRINT JOBS (claimed and updated by the printer watcher) ---
+@router.get("/print-jobs")
+def list_print_jobs(status: Optional[str] = None, limit: int = 50, db: Session = Depends(get_db)):
+    return docket_printer.list_jobs(db, status, limit)
+
+@router.get("/print-jobs/stats")
+def get_print_stats(hours: int = 24, db: Session = Depends(get_db)):
+    return {**docket_printer.get_print_stats(db, hours), "events": print_events.stats()}
+
+@router.get("/print-jobs/queues")
+def get_print_queues(db: Session = Depends(get_db)):
+    return print_routing.get_queue_stats(db)
+
+@router.post("/print-jobs/claim")
+def claim_print_job(printer: Optional[str] = None, filename: Optional[str] = None, db: Session = Depends(get_db)):
+    return docket_printer.claim_next_job(db, printer, filename)
+
+@router.post("/print-jobs/{job_id}/status")
+def update_print_job(job_id: int, data: PrintJobUpdate, db: Session = Depends(get_db)):
+    return docket_printer.update_job_status(db, job_id, data.status, data.error)
 
 @router.get("/{docket_id}")
 def get_docket(docket_id: int, db: Session = Depends(get_db)):
@@ -65,8 +126,8 @@ def get_price_history_route(customer: str, db: Session = Depends(get_db)):
     return docket_list.get_customer_price_list(db, customer)
 
 @router.get("/print-status/{filename}")
-def check_print_status(filename: str):
-    return docket_printer.check_print_status(filename)
+def check_print_status(filename: str, db: Session = Depends(get_db)):
+    return docket_printer.check_print_status(db, filename)
 
 @router.get("/{docket_id}")
 def get_docket(docket_id: int, db: Session = Depends(get_db)):
@@ -74,7 +135,7 @@ def get_docket(docket_id: int, db: Session = Depends(get_db)):
 
 @router.get("/{docket_id}/preview", response_class=HTMLResponse)
 def preview_docket(docket_id: int, db: Session = Depends(get_db)):
-    return docket_pdf.render_docket_html(db, docket_id)
+    return docket_pdf.render_docket_html(db, docket_id, asset_base=ASSET_ROUTE)
 
 # --- DOWNLOAD (PDF) ---
 @router.get("/{docket_id}/download")
@@ -88,12 +149,14 @@ def download_docket(docket_id: int, db: Session = Depends(get_db)):
 
 # --- PRINT TO PRINTER ---
 @router.post("/{docket_id}/print")
-def print_docket(docket_id: int, copies: int = 1, db: Session = Depends(get_db)):
-    return docket_printer.print_docket_to_printer(db, docket_id, copies)
-
-@router.get("/print-status/{filename}")
-def check_print_status(filename: str):
-    return docket_printer.check_print_status(filename)
+def print_docket(
+    docket_id: int,
+    copies: int = 1,
+    terminal: Optional[str] = None,
+    queue: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    return docket_printer.print_docket_to_printer(db, docket_id, copies, terminal, queue)
 
 # --- DELETE ---
 @router.delete("/{docket_id}")
@@ -103,5 +166,7 @@ def delete_docket(docket_id: int, db: Session = Depends(get_db)):
 # --- FORCE RUN BACKUP ---
 @router.post("/force-backup")
 def force_run_backup(db: Session = Depends(get_db)):
-    create_on_update_backup()
-    return {"message": "Backup process triggered"}
\ No newline at end of file
+    # Joins an in-flight dump instead of starting a second one
+    result = backup_worker.force_backup()
+    message = "Joined running backup" if result["joined"] else "Backup process triggered"
+    return {"message": message, **result}
\ No newline at end of file
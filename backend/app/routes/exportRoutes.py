@@ -0,0 +1,31 @@
+# app/routes/exportRoutes.py
+from fastapi import APIRouter
+from fastapi.responses import FileResponse
+from app.services import batch_export
+
+router = APIRouter(
+    prefix="/api/exports",
+    tags=["Exports"]
+)
+
+# Exports are started from POST /api/dockets/export and POST /api/invoices/export
+
+@router.get("/")
+def list_exports():
+    return batch_export.list_jobs()
+
+# --- PROGRESS ---
+@router.get("/{job_id}")
+def get_export_status(job_id: str):
+    return batch_export.get_status(job_id)
+
+# --- DOWNLOAD (streamed from disk) ---
+@router.get("/{job_id}/download")
+def download_export(job_id: str):
+    path, filename, media_type = batch_export.get_download(job_id)
+    return FileResponse(path, media_type=media_type, filename=filename)
+
+# --- CANCEL ---
+@router.delete("/{job_id}")
+def cancel_export(job_id: str):
+    return batch_export.cancel_export(job_id)
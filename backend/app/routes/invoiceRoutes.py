@@ -10,7 +10,8 @@ from app.schema.invoiceSchema import InvoiceCreate
 from pydantic import BaseModel
 
 from app.services.invoice import invoice_crud, invoice_list, invoice_status, invoice_pdf, selector_service
-from app.services import email_service
+from app.services import email_service, batch_export
+from app.routes.assetRoutes import ASSET_ROUTE
 class NoteUpdate(BaseModel):
     private_notes: str
 
@@ -30,7 +31,7 @@ def save_invoice(data: InvoiceCreate, db: Session = Depends(get_db)):
 
 @router.get("/{invoice_id}/preview", response_class=HTMLResponse)
 def preview_invoice_pdf(invoice_id: int, db: Session = Depends(get_db)):
-    return invoice_pdf.render_invoice_html(db, invoice_id)
+    return invoice_pdf.render_invoice_html(db, invoice_id, asset_base=ASSET_ROUTE)
 
 @router.get("/{invoice_id}/download")
 def download_invoice_pdf(invoice_id: int, db: Session = Depends(get_db)):
@@ -51,9 +52,23 @@ def get_invoices(
     search: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     db: Session = Depends(get_db)
 ):
-    return invoice_list.get_invoices_paginated(db, page, limit, search, start_date, end_date)
+    # cursor (next_cursor / prev_cursor of a previous response) takes precedence over page
+    return invoice_list.get_invoices_paginated(db, page, limit, search, start_date, end_date, cursor, include_total)
+
+# --- BATCH EXPORT (ZIP / merged PDF; progress at /api/exports/{id}) ---
+@router.post("/export")
+def export_invoices(
+    format: str = "zip",
+    search: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    return batch_export.start_export(db, "invoice", format, search, start_date, end_date)
 
 @router.get("/selectorsData")
 def get_selectors_data(db: Session = Depends(get_db)):
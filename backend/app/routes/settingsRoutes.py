@@ -3,7 +3,9 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from app.database import get_db
-from app.services import settings_service
+from app.services import settings_service, render_resources, pdf_render_pool, pdf_cache, font_subset
+from app.services.docket import docket_prerender
+from app.utilities import backup_worker, backup_catalog, backup_manager, backup_metrics, request_metrics
 from app.schema.settingsSchema import SettingUpdate, CurrencyCreate, UnitCreate, CompanyCreate, AccountCreate
 
 router = APIRouter(
@@ -17,6 +19,32 @@ def get_version():
     # Hardcoded backend version
     return {"version": "1.2.1"}
 
+@router.get("/backup-status")
+def get_backup_status():
+    return {
+        **backup_worker.get_status(),
+        "catalog": backup_catalog.summary(),
+        "resource_policy": backup_manager.get_resource_policy(),
+    }
+
+@router.get("/backup-metrics")
+def get_backup_metrics():
+    return backup_metrics.summary()
+
+@router.get("/render-stats")
+def get_render_stats():
+    return {
+        "pool": pdf_render_pool.get_stats(),
+        "cache": pdf_cache.stats(),
+        "resources": render_resources.stats(),
+        "fonts": font_subset.stats(),
+        "docket_prerender": docket_prerender.stats(),
+    }
+
+@router.get("/latency")
+def get_request_latency():
+    return request_metrics.summary()
+
 @router.get("/defaults")
 def get_defaults(db: Session = Depends(get_db)):
     return settings_service.get_all_settings(db)
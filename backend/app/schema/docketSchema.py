@@ -66,4 +66,8 @@ class DocketCreate(BaseModel):
 
     # Relationships
     items: List[DocketItemSchema] = []
-    deductions: List[DocketDeductionSchema] = []
\ No newline at end of file
+    deductions: List[DocketDeductionSchema] = []
+# --- PRINT JOB SCHEMA (reported by the printer watcher) ---
+class PrintJobUpdate(BaseModel):
+    status: str # printing | done | failed
+    error: Optional[str] = None
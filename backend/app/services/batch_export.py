@@ -0,0 +1,316 @@
+# backend/app/services/batch_export.py
+
+import os
+import time
+import uuid
+import logging
+import zipfile
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.services import pdf_render_pool
+
+logger = logging.getLogger(__name__)
+
+# --- CONFIGURATION ---
+# Where finished exports wait to be downloaded
+EXPORT_DIR = os.getenv("EXPORT_DIR", os.path.join(tempfile.gettempdir(), "scrap_exports"))
+# Finished/cancelled exports (and their files) are dropped after this long
+EXPORT_KEEP_SECONDS = int(os.getenv("EXPORT_KEEP_SECONDS", "3600"))
+# Refuse ranges larger than this (narrow the dates instead)
+EXPORT_MAX_DOCUMENTS = int(os.getenv("EXPORT_MAX_DOCUMENTS", "5000"))
+# Renders in flight per export; defaults to the render pool size so an export
+# keeps every worker busy without filling the queue interactive renders need
+EXPORT_CONCURRENCY = int(os.getenv("EXPORT_CONCURRENCY", str(max(pdf_render_pool.PDF_RENDER_WORKERS, 1))))
+
+FORMATS = {"zip": ("application/zip", ".zip"), "pdf": ("application/pdf", ".pdf")}
+
+_lock = threading.Lock()
+# One export at a time; later ones queue behind it
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-export")
+_jobs = {}  # job id -> ExportJob
+
+
+class ExportJob:
+    def __init__(self, kind, fmt, filters):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.format = fmt
+        self.filters = filters
+        self.status = "queued"      # queued -> running -> done | failed | cancelled
+        self.total = 0
+        self.done = 0
+        self.failed_ids = []
+        self.error = None
+        self.path = None
+        self.size = 0
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    @property
+    def filename(self):
+        start, end = self.filters.get("start_date"), self.filters.get("end_date")
+        span = "_".join(str(d) for d in (start, end) if d) or "all"
+        return f"{self.kind}s_{span}{FORMATS[self.format][1]}"
+
+    def to_dict(self):
+        elapsed = (self.finished_at or time.time()) - self.started_at if self.started_at else None
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "format": self.format,
+            "status": self.status,
+            "total": self.total,
+            "done": self.done,
+            "failed": len(self.failed_ids),
+            "failed_ids": self.failed_ids[:50],
+            "progress": round(self.done / self.total, 3) if self.total else (1.0 if self.status == "done" else 0.0),
+            "elapsed_seconds": round(elapsed, 1) if elapsed is not None else None,
+            "size": self.size,
+            "filename": self.filename,
+            "error": self.error,
+        }
+
+
+# ==========================================
+# 1. PUBLIC API
+# ==========================================
+def start_export(db: Session, kind, fmt="zip", search=None, start_date=None, end_date=None):
+    """Queues an export of every docket/invoice the list would show for these filters."""
+    if kind not in ("docket", "invoice"):
+        raise HTTPException(status_code=400, detail=f"Unknown export type: {kind}")
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Format must be one of: {', '.join(FORMATS)}")
+
+    _prune()
+    filters = {"search": search, "start_date": start_date, "end_date": end_date}
+    count = _filtered_query(db, kind, filters).count()
+    if count > EXPORT_MAX_DOCUMENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{count} {kind}s match; exports are limited to {EXPORT_MAX_DOCUMENTS}, narrow the date range"
+        )
+
+    job = ExportJob(kind, fmt, filters)
+    job.total = count
+    with _lock:
+        _jobs[job.id] = job
+        # The job uses its own sessions on the same engine as the request
+        job.future = _executor.submit(_run, job, db.get_bind())
+    return job.to_dict()
+
+def get_job(job_id):
+    with _lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Export not found or expired")
+    return job
+
+def get_status(job_id):
+    return get_job(job_id).to_dict()
+
+def cancel_export(job_id):
+    """Stops an export: a queued one never starts, a running one stops after the renders in flight."""
+    job = get_job(job_id)
+    if job.status in ("done", "failed", "cancelled"):
+        return job.to_dict()
+    job.cancel_event.set()
+    if job.future is not None and job.future.cancel():
+        _finish(job, "cancelled")
+    return job.to_dict()
+
+def get_download(job_id):
+    """(path, filename, media type) of a finished export."""
+    job = get_job(job_id)
+    if job.status != "done" or not job.path or not os.path.exists(job.path):
+        raise HTTPException(status_code=409, detail=f"Export is {job.status}, not ready for download")
+    return job.path, job.filename, FORMATS[job.format][0]
+
+def list_jobs():
+    _prune()
+    with _lock:
+        jobs = sorted(_jobs.values(), key=lambda j: j.created_at, reverse=True)
+    return [job.to_dict() for job in jobs]
+
+
+# ==========================================
+# 2. QUERIES (same filters as the list endpoints)
+# ==========================================
+def _filtered_query(db, kind, filters):
+    if kind == "docket":
+        from app.models.docketModels import Docket
+        from app.services.docket import docket_list
+        return docket_list.filter_dockets_query(db, **filters).with_entities(
+            Docket.id, Docket.scrdkt_number
+        ).order_by(Docket.docket_date, Docket.id)
+
+    from app.models.invoiceModels import Invoice
+    from app.services.invoice import invoice_list
+    return invoice_list.filter_invoices_query(db, **filters).with_entities(
+        Invoice.id, Invoice.scrinv_number
+    ).order_by(Invoice.invoice_date, Invoice.id)
+
+def _render_pdf(bind, kind, record_id):
+    from app.services.docket import docket_pdf
+    from app.services.invoice import invoice_pdf
+
+    chunks = None
+    db = Session(bind=bind)
+    try:
+        if kind == "docket":
+            html_content = docket_pdf.render_docket_html(db, record_id, inline_css=False)
+        else:
+            html_content, chunks = invoice_pdf.render_invoice_pdf_html(db, record_id)
+    finally:
+        db.close()
+    # Bulk exports skip pdf_cache so they don't evict the PDFs people are printing
+    if chunks:
+        # Large invoice: rendered in chunks and joined, as for a single download
+        return invoice_pdf.render_chunked_pdf(chunks)
+    return (docket_pdf if kind == "docket" else invoice_pdf).render_pdf(html_content)
+
+
+# ==========================================
+# 3. WORKER
+# ==========================================
+def _run(job, bind):
+    job.status = "running"
+    job.started_at = time.time()
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    target = os.path.join(EXPORT_DIR, job.id + FORMATS[job.format][1])
+
+    db = Session(bind=bind)
+    try:
+        rows = _filtered_query(db, job.kind, job.filters).all()
+    finally:
+        db.close()
+    job.total = len(rows)
+
+    try:
+        if job.format == "zip":
+            _write_zip(job, bind, rows, target)
+        else:
+            _write_merged_pdf(job, bind, rows, target)
+    except Exception as e:
+        _remove(target)
+        job.error = str(getattr(e, "detail", e))
+        logger.error(f"⚠️ {job.kind} export {job.id} failed: {job.error}")
+        _finish(job, "failed")
+        return
+
+    if job.cancel_event.is_set():
+        _remove(target)
+        _finish(job, "cancelled")
+        return
+
+    job.path = target
+    job.size = os.path.getsize(target)
+    logger.info(f"📦 Exported {job.done} {job.kind}s ({job.size / 1024 / 1024:.1f} MB) in {time.time() - job.started_at:.1f}s")
+    _finish(job, "done")
+
+def _render_all(job, bind, rows):
+    """
+    Yields (row, pdf bytes) in list order while keeping EXPORT_CONCURRENCY renders in flight,
+    so at most a window of PDFs is in memory. Stops early when the job is cancelled.
+    """
+    window = max(EXPORT_CONCURRENCY, 1)
+    with ThreadPoolExecutor(max_workers=window, thread_name_prefix=f"export-{job.id[:6]}") as pool:
+        pending = deque()
+        rows = iter(rows)
+        while True:
+            while len(pending) < window * 2 and not job.cancel_event.is_set():
+                row = next(rows, None)
+                if row is None:
+                    break
+                pending.append((row, pool.submit(_render_one, job, bind, row.id)))
+            if not pending:
+                return
+            row, future = pending.popleft()
+            if job.cancel_event.is_set():
+                future.cancel()
+                continue
+            pdf = future.result()
+            job.done += 1
+            if pdf is None:
+                job.failed_ids.append(row.id)
+                continue
+            yield row, pdf
+
+def _render_one(job, bind, record_id):
+    """Renders one PDF; waits and retries while the shared pool is full. None if it fails."""
+    delay = 0.5
+    while not job.cancel_event.is_set():
+        try:
+            return _render_pdf(bind, job.kind, record_id)
+        except HTTPException as e:
+            if e.status_code != 503:
+                logger.error(f"⚠️ Export of {job.kind} {record_id} failed: {e.detail}")
+                return None
+            time.sleep(delay)
+            delay = min(delay * 2, 5)
+        except Exception as e:
+            logger.error(f"⚠️ Export of {job.kind} {record_id} failed: {e}")
+            return None
+    return None
+
+def _write_zip(job, bind, rows, target):
+    # PDFs are already compressed; storing them keeps the export CPU-light
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_STORED) as archive:
+        used = set()
+        for row, pdf in _render_all(job, bind, rows):
+            name = f"{job.kind}_{row[1] or row.id}.pdf"
+            if name in used:
+                name = f"{job.kind}_{row[1] or ''}_{row.id}.pdf"
+            used.add(name)
+            archive.writestr(name, pdf)
+
+def _write_merged_pdf(job, bind, rows, target):
+    from io import BytesIO
+    from app.services.pdf_merge import StreamingPdfMerger
+
+    # Each PDF is copied into the output as it arrives and then dropped, so memory stays at the
+    # render window whatever the range (a PdfWriter would hold the whole document until the end)
+    temp_path = target + ".tmp"
+    with open(temp_path, "wb") as f:
+        merger = StreamingPdfMerger(f)
+        for row, pdf in _render_all(job, bind, rows):
+            if job.cancel_event.is_set():
+                return
+            merger.append(BytesIO(pdf), f"{job.kind} {row[1] or row.id}")
+        if job.cancel_event.is_set():
+            return
+        merger.close()
+    os.replace(temp_path, target)
+
+
+# ==========================================
+# 4. HOUSEKEEPING
+# ==========================================
+def _finish(job, status):
+    job.status = status
+    job.finished_at = time.time()
+
+def _remove(path):
+    for candidate in (path, path + ".tmp"):
+        try:
+            os.remove(candidate)
+        except OSError:
+            pass
+
+def _prune():
+    """Drops exports that finished more than EXPORT_KEEP_SECONDS ago, with their files."""
+    cutoff = time.time() - EXPORT_KEEP_SECONDS
+    with _lock:
+        expired = [job for job in _jobs.values() if job.finished_at and job.finished_at < cutoff]
+        for job in expired:
+            _jobs.pop(job.id, None)
+    for job in expired:
+        if job.path:
+            _remove(job.path)
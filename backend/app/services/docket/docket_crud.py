@@ -5,6 +5,8 @@ from fastapi import HTTPException
 from app.models.docketModels import Docket, DocketItem, DocketDeduction
 from app.schema.docketSchema import DocketCreate
 from app.utilities.scrdkt_generator import generate_next_scrdkt
+from app.services import pdf_cache, list_pagination
+from app.services.docket import docket_prerender
 
 def generate_new_docket_id(db: Session):
     # 1. Generate the unique IDs
@@ -122,6 +124,10 @@ def upsert_docket(db: Session, data: DocketCreate):
         ))
 
     db.commit()
+    pdf_cache.invalidate("docket", docket.id)
+    list_pagination.invalidate_counts("docket")
+    # Operators usually print right after saving: have the PDF ready by then
+    docket_prerender.schedule(db, docket.id)
     return {"message": "docket saved", "id": docket.id}
 
 def get_docket_by_id(db: Session, docket_id: int):
@@ -1,21 +1,18 @@
 # app/services/docket/docket_list.py
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, func, desc
+from sqlalchemy import or_, and_, func
 from datetime import date
 from app.models.docketModels import Docket, DocketItem
+from app.services import pdf_cache, list_pagination
 
-def get_dockets_paginated(
-    db: Session, 
-    page: int = 1, 
-    limit: int = 10, 
+def filter_dockets_query(
+    db: Session,
     search: str = None,
-    start_date: date = None, 
+    start_date: date = None,
     end_date: date = None
 ):
-    # Calculate offset
-    skip = (page - 1) * limit
-
+    """Saved, non-empty dockets matching the list filters (shared by the list and batch export)."""
     # Base Query
     query = db.query(Docket)
 
@@ -47,16 +44,40 @@ def get_dockets_paginated(
     if end_date:
         query = query.filter(Docket.docket_date <= end_date)
 
+    return query
+
+def get_dockets_paginated(
+    db: Session, 
+    page: int = 1, 
+    limit: int = 10, 
+    search: str = None,
+    start_date: date = None, 
+    end_date: date = None,
+    cursor: str = None,
+    include_total: bool = True
+):
+    query = filter_dockets_query(db, search, start_date, end_date)
+
     # 3. Get Total Count (for frontend pagination)
-    total = query.count()
+    # Page mode counts every time; cursor mode reuses a recent count
+    total = None
+    if include_total:
+        if cursor:
+            total = list_pagination.cached_count("docket", (search, start_date, end_date), query)
+        else:
+            total = query.count()
 
     # 4. Apply Sorting, Pagination & Optimization
     # joinedload prevents N+1 problem by fetching items in the same query
-    dockets = query.order_by(Docket.id.desc())\
-                   .options(joinedload(Docket.items), joinedload(Docket.deductions))\
-                   .offset(skip)\
-                   .limit(limit)\
-                   .all()
+    # A cursor seeks on the primary key instead of skipping (page - 1) * limit rows
+    dockets, next_cursor, prev_cursor = list_pagination.fetch_page(
+        query.options(joinedload(Docket.items), joinedload(Docket.deductions)),
+        "docket", limit, page, cursor,
+        order_by=[Docket.id.desc()],
+        reverse_order_by=[Docket.id.asc()],
+        seek=lambda direction, key: Docket.id < int(key[0]) if direction == "next" else Docket.id > int(key[0]),
+        key_of=lambda dkt: [dkt.id],
+    )
 
     results = []
 
@@ -102,8 +123,10 @@ def get_dockets_paginated(
     return {
         "data": results,
         "total": total,
-        "page": page,
-        "limit": limit
+        "page": None if cursor else page,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
     }
 
 def get_unique_customers(db: Session, search: str = None):
@@ -275,4 +298,6 @@ def delete_docket(db: Session, docket_id: int):
         
     db.delete(docket)
     db.commit()
+    pdf_cache.invalidate("docket", docket_id)
+    list_pagination.invalidate_counts("docket")
     return {"message": "Docket deleted"}
\ No newline at end of file
@@ -1,22 +1,11 @@
 # app/services/docket/docket_pdf.py
 
-import os
-import base64
-from io import BytesIO
 from decimal import Decimal
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
 
 from app.models.docketModels import Docket
-
-# --- Helper to load images/files ---
-def get_file_base64(file_path):
-    if not os.path.exists(file_path):
-        return ""
-    with open(file_path, "rb") as f:
-        return base64.b64encode(f.read()).decode('utf-8')
+from app.services import render_resources, pdf_render_pool, pdf_cache
 
 # --- Helper for Decimal conversion ---
 def to_decimal(val):
@@ -31,7 +20,13 @@ def format_weight(val):
         return "{:,.0f}".format(val)
     return "{:,.3f}".format(val)
 
-def render_docket_html(db: Session, docket_id: int):
+STYLESHEET = "docket_template_styles.css"
+
+def render_docket_html(db: Session, docket_id: int, asset_base: str = None, inline_css: bool = True):
+    """
+    Docket HTML. Fonts/images are URLs: "asset:" for PDFs, or under asset_base for browser previews.
+    inline_css=False leaves out the <style> block; the PDF renderer applies STYLESHEET pre-parsed instead.
+    """
     # 1. Fetch Data
     dkt = db.query(Docket).filter(Docket.id == docket_id).first()
     if not dkt:
@@ -102,36 +97,11 @@ def render_docket_html(db: Session, docket_id: int):
     # Construct the display label: e.g. "AUD$"
     currency_label = f"{currency_code}{sym}"
 
-    # 5. Setup Template Environment
-    template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("docket_template.html")
-    
-    # --- FONT EMBEDDING ---
-    font_path = os.path.join(template_dir, "Lexend-VariableFont_wght.ttf")
-    font_b64 = get_file_base64(font_path)
-    
-    font_face_css = f"""
-    @font-face {{
-        font-family: 'Lexend';
-        src: url(data:font/ttf;base64,{font_b64}) format('truetype');
-        font-weight: 100 900;
-        font-style: normal;
-    }}
-    """
-
-    # Read CSS and prepend font
-    css_path = os.path.join(template_dir, "docket_template_styles.css")
-    css_content = ""
-    if os.path.exists(css_path):
-        with open(css_path, 'r') as f:
-            css_content = font_face_css + f.read()
-
-    # --- Load Icon ---
-    icon_path = os.path.join(template_dir, "Recycling_Icon.png")
-    recycling_icon_b64 = get_file_base64(icon_path)
-    safari_logo_path = os.path.join(template_dir, "safari_copper_recycling_logo.png")
-    safari_logo_b64 = get_file_base64(safari_logo_path)
+    # 5. Template and CSS come from the shared per-process cache; font and images are referenced by URL
+    template = render_resources.get_template("docket_template.html")
+    css_content = render_resources.get_css(STYLESHEET, asset_base) if inline_css else ""
+    recycling_icon_url = render_resources.asset_url("Recycling_Icon.png", asset_base)
+    safari_logo_url = render_resources.asset_url("safari_copper_recycling_logo.png", asset_base)
 
     # --- FORMAT DATES (DD/MM/YYYY) ---
     formatted_date = dkt.docket_date.strftime("%d/%m/%Y") if dkt.docket_date else "N/A"
@@ -156,18 +126,22 @@ def render_docket_html(db: Session, docket_id: int):
         formatted_date=formatted_date,
         formatted_dob=formatted_dob,
         css_content=css_content,
-        recycling_icon=recycling_icon_b64,
-        safari_logo=safari_logo_b64,
+        recycling_icon_url=recycling_icon_url,
+        safari_logo_url=safari_logo_url,
         currency_label=currency_label 
     )
 
+def render_pdf(html_content):
+    """PDF bytes of docket HTML rendered with inline_css=False."""
+    return pdf_render_pool.pool.render(html_content, stylesheet=STYLESHEET)
+
 def generate_docket_pdf(db: Session, docket_id: int):
     try:
-        html_content = render_docket_html(db, docket_id)
-        pdf_buffer = BytesIO()
-        HTML(string=html_content).write_pdf(pdf_buffer)
-        pdf_buffer.seek(0)
-        return pdf_buffer
+        html_content = render_docket_html(db, docket_id, inline_css=False)
+        # Same content + templates = same PDF; only misses go to the render pool
+        return pdf_cache.get_or_render("docket", docket_id, html_content, render_pdf)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error generating PDF: {e}")
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
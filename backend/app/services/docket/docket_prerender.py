@@ -0,0 +1,132 @@
+# app/services/docket/docket_prerender.py
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.orm import Session
+
+from app.models.settingsModels import GlobalSetting
+from app.utilities.percentiles import describe
+
+logger = logging.getLogger(__name__)
+
+# --- CONFIGURATION ---
+# GlobalSetting that turns pre-rendering on/off ("true"/"false"); the env var is the default
+SETTING_KEY = "prerender_dockets"
+PRERENDER_DEFAULT = os.getenv("DOCKET_PRERENDER", "true")
+# How long a print waits for a pre-render that is already running (instead of rendering twice)
+PRINT_WAIT_SECONDS = float(os.getenv("DOCKET_PRERENDER_PRINT_WAIT", "30"))
+
+_lock = threading.Lock()
+# One background thread: renders queue behind each other instead of competing with requests
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="docket-prerender")
+
+_generations = {}  # docket_id -> save counter; a job only runs if it is still the latest save
+_pending = {}      # docket_id -> Future of the latest scheduled pre-render
+_saved_at = {}     # docket_id -> wall time of the latest save
+_stats = {"scheduled": 0, "rendered": 0, "superseded": 0, "failed": 0, "claimed_by_print": 0}
+_print_samples = deque(maxlen=200)  # (prerendered, request -> spool seconds, save -> spool seconds)
+
+
+# ==========================================
+# 1. SCHEDULING (called from upsert_docket)
+# ==========================================
+def is_enabled(db: Session):
+    setting = db.query(GlobalSetting).filter(GlobalSetting.key == SETTING_KEY).first()
+    value = setting.value if setting and setting.value is not None else PRERENDER_DEFAULT
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+def schedule(db: Session, docket_id: int):
+    """Queues a background render of a just-saved docket into the PDF cache (replaces any older one)."""
+    with _lock:
+        _saved_at[docket_id] = time.time()
+
+    if not is_enabled(db):
+        return
+
+    # The job uses its own session on the same engine as the request
+    bind = db.get_bind()
+    with _lock:
+        generation = _generations.get(docket_id, 0) + 1
+        _generations[docket_id] = generation
+        previous = _pending.get(docket_id)
+        if previous is not None and previous.cancel():
+            _stats["superseded"] += 1
+        _pending[docket_id] = _executor.submit(_run, bind, docket_id, generation)
+        _stats["scheduled"] += 1
+
+def _is_current(docket_id, generation):
+    with _lock:
+        return _generations.get(docket_id) == generation
+
+def _run(bind, docket_id, generation):
+    from app.services.docket import docket_pdf
+
+    if not _is_current(docket_id, generation):
+        with _lock:
+            _stats["superseded"] += 1
+        return
+
+    db = Session(bind=bind)
+    try:
+        docket_pdf.generate_docket_pdf(db, docket_id)
+        with _lock:
+            _stats["rendered"] += 1
+    except Exception as e:
+        with _lock:
+            _stats["failed"] += 1
+        logger.error(f"⚠️ Pre-render of docket {docket_id} failed: {e}")
+    finally:
+        db.close()
+        with _lock:
+            if _generations.get(docket_id) == generation:
+                _pending.pop(docket_id, None)
+
+
+# ==========================================
+# 2. PRINT SIDE
+# ==========================================
+def claim(docket_id: int):
+    """
+    Called before printing. A queued pre-render is cancelled (the print renders now instead);
+    a running one is waited for, so its PDF comes from the cache rather than a second render.
+    Returns True if a pre-render finished for this docket.
+    """
+    with _lock:
+        future = _pending.get(docket_id)
+    if future is None:
+        return False
+
+    if future.cancel():
+        with _lock:
+            _stats["claimed_by_print"] += 1
+            if _pending.get(docket_id) is future:
+                _pending.pop(docket_id, None)
+        return False
+
+    try:
+        future.result(timeout=PRINT_WAIT_SECONDS)
+    except Exception:
+        return False
+    return True
+
+def record_print(docket_id: int, prerendered: bool, request_seconds: float):
+    """Records print request -> spool and save -> spool latency (compare with/without pre-render)."""
+    with _lock:
+        saved_at = _saved_at.get(docket_id)
+        since_save = time.time() - saved_at if saved_at else None
+        _print_samples.append((prerendered, request_seconds, since_save))
+
+def stats():
+    with _lock:
+        samples = list(_print_samples)
+        result = {**_stats, "pending": len(_pending)}
+
+    for label, flag in (("prerendered", True), ("not_prerendered", False)):
+        result[f"print_seconds_{label}"] = describe([r for p, r, _ in samples if p == flag])
+        # Save -> paper, only for prints shortly after the save (operator printing straight away)
+        result[f"save_to_spool_seconds_{label}"] = describe([s for p, _, s in samples if p == flag and s is not None and s < 600])
+    return result
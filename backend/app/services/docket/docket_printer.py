@@ -2,51 +2,288 @@
 
 import os
 import time
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from app.models.printModels import PrintJob
+from app.models.docketModels import Docket
 from app.services.docket.docket_pdf import generate_docket_pdf
+from app.services.docket import docket_prerender, print_events, print_routing
+from app.services import pdf_cache
 
 SPOOL_DIR = "/app/print_spool"
 
-def print_docket_to_printer(db: Session, docket_id: int, copies: int = 1):
+# A claimed job the watcher never started is handed out again after this long...
+# (a job left "printing" this long is failed; print_watcher.py's PRINT_JOB_DEADLINE stays under it)
+PRINT_CLAIM_TIMEOUT = int(os.getenv("PRINT_CLAIM_TIMEOUT", "300"))
+# ...up to this many times, then it is failed
+PRINT_MAX_ATTEMPTS = int(os.getenv("PRINT_MAX_ATTEMPTS", "3"))
+
+# Status reported by the watcher -> statuses it may follow
+TRANSITIONS = {
+    "printing": ("claimed",),
+    "done": ("claimed", "printing"),
+    "failed": ("queued", "claimed", "printing"),
+}
+
+def print_docket_to_printer(db: Session, docket_id: int, copies: int = 1, terminal: str = None, queue: str = None):
     if not os.path.exists(SPOOL_DIR):
         os.makedirs(SPOOL_DIR)
 
+    # Pick the printer queue (by request, terminal, docket type or load) before rendering
+    docket_type = db.query(Docket.docket_type).filter(Docket.id == docket_id).scalar()
+    try:
+        queue, route = print_routing.choose_queue(db, docket_type, terminal, queue)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    start = time.monotonic()
+    # Reuse the background render started on save (waits if it is still running)
+    prerendered = docket_prerender.claim(docket_id) or pdf_cache.has_record("docket", docket_id)
     pdf_buffer = generate_docket_pdf(db, docket_id)
-    
-    timestamp = int(time.time())
-    # Generate unique filename
-    filename = f"PRINT_Qty-{copies}_ID-{docket_id}_{timestamp}.pdf"
+
+    filename = _spool_filename(db, docket_id, copies, queue)
     file_path = os.path.join(SPOOL_DIR, filename)
 
     try:
         with open(file_path, "wb") as f:
             f.write(pdf_buffer.read())
-            
-        print(f"✅ Dropped payload: {filename}")
-        
+
+        # The file is in place before the job exists, so a watcher never claims a job without its PDF
+        job = PrintJob(docket_id=docket_id, filename=filename, queue=queue, route=route, copies=copies,
+                       status="queued", attempts=0, created_at=datetime.now())
+        db.add(job)
+        db.commit()
+
+        print(f"✅ Queued print job {job.id}: {filename}")
+        print_events.publish_job(_job_dict(job))
+        docket_prerender.record_print(docket_id, prerendered, time.monotonic() - start)
+
         # CHANGED: Return the filename so frontend can track it
         return {
-            "message": "Sent to print queue", 
-            "filename": filename 
+            "message": "Sent to print queue",
+            "filename": filename,
+            "job_id": job.id,
+            "queue": queue
         }
 
     except Exception as e:
+        db.rollback()
+        if os.path.exists(file_path):
+            os.remove(file_path)
         print(f"❌ Spool Error: {e}")
         return {"error": str(e)}
 
-# --- NEW FUNCTION ---
-def check_print_status(filename: str):
+def _spool_filename(db: Session, docket_id: int, copies: int, queue: str = None):
+    """
+    PRINT_Qty-<copies>_ID-<docket>[_Q-<queue>]_<timestamp>.pdf (Q- names the assigned queue, for
+    watchers that only read filenames). Repeat prints within a second get a -2, -3... suffix.
+    """
+    queue_part = f"_Q-{queue}" if queue else ""
+    stem = f"PRINT_Qty-{copies}_ID-{docket_id}{queue_part}_{int(time.time())}"
+    filename, n = f"{stem}.pdf", 1
+    while os.path.exists(os.path.join(SPOOL_DIR, filename)) or \
+            db.query(PrintJob.id).filter(PrintJob.filename == filename).first():
+        n += 1
+        filename = f"{stem}-{n}.pdf"
+    return filename
+
+def check_print_status(db: Session, filename: str):
     """
-    Checks if the file still exists in the spool directory.
-    If it is gone, it means the watcher script picked it up.
+    Status of the print job for this spool file:
+    pending (waiting for the watcher), printing, completed (sent to the printer) or failed.
     """
     # Security: Prevent directory traversal
     if ".." in filename or "/" in filename or "\\" in filename:
         return {"status": "error", "message": "Invalid filename"}
 
-    file_path = os.path.join(SPOOL_DIR, filename)
-    
-    if os.path.exists(file_path):
-        return {"status": "pending"} # File is still there (Watcher hasn't taken it)
+    job = db.query(PrintJob).filter(PrintJob.filename == filename).first()
+    if job is None:
+        # Spooled before print jobs were recorded: fall back to whether the watcher took the file
+        if os.path.exists(os.path.join(SPOOL_DIR, filename)):
+            return {"status": "pending"}
+        return {"status": "completed"}
+
+    return {"status": client_status(job.status), "job": _job_dict(job)}
+
+def get_job_by_filename(db: Session, filename: str):
+    job = db.query(PrintJob).filter(PrintJob.filename == filename).first()
+    return _job_dict(job) if job else None
+
+def client_status(status):
+    """Job status as the docket form reports it: pending, printing, completed or failed."""
+    return {"done": "completed", "queued": "pending", "claimed": "pending"}.get(status, status)
+
+
+# ==========================================
+# WATCHER API
+# ==========================================
+def claim_next_job(db: Session, printer: str = None, filename: str = None):
+    """
+    Hands the oldest queued job to a printer watcher (None if nothing is waiting).
+    A watcher serving a named queue (printer = queue name) gets that queue's jobs, then
+    unrouted ones, then jobs waiting on a stalled queue (failover); any other watcher gets any job.
+    Watchers that pick files from the spool folder themselves pass the filename to claim that job.
+    The claim is a conditional UPDATE, so two watchers never get the same job.
+    """
+    print_routing.note_seen(printer)
+    _expire_stale_claims(db)
+    serving = printer if printer in print_routing.PRINT_QUEUES else None
+    for _ in range(5):
+        job, failover = _next_job(db, serving, filename)
+        if job is None:
+            return None
+        values = {
+            "status": "claimed",
+            "printer": printer,
+            "claimed_at": datetime.now(),
+            "attempts": PrintJob.attempts + 1,
+        }
+        if failover:
+            values.update({"queue": serving, "route": "failover"})
+        claimed = (
+            db.query(PrintJob)
+            .filter(PrintJob.id == job.id, PrintJob.status == "queued")
+            .update(values, synchronize_session=False)
+        )
+        db.commit()
+        if claimed:
+            result = _job_dict(db.query(PrintJob).filter(PrintJob.id == job.id).first())
+            print_events.publish_job(result)
+            return result
+    # Lost every race; the watcher polls again shortly
+    return None
+
+def _next_job(db: Session, queue, filename):
+    """(oldest claimable job id row, taken over from a stalled queue?)"""
+    query = db.query(PrintJob.id).filter(PrintJob.status == "queued")
+    oldest = lambda q: q.order_by(PrintJob.created_at, PrintJob.id).first()
+    if filename:
+        return query.filter(PrintJob.filename == filename).first(), False
+    if queue is None:
+        return oldest(query), False
+
+    own = oldest(query.filter(or_(PrintJob.queue == queue, PrintJob.queue.is_(None))))
+    if own is not None:
+        return own, False
+    stalled = print_routing.stalled_queues(db) - {queue}
+    if stalled:
+        return oldest(query.filter(PrintJob.queue.in_(stalled))), True
+    return None, False
+
+def update_job_status(db: Session, job_id: int, status: str, error: str = None):
+    """Records the watcher's progress: printing, then done or failed (with the error)."""
+    if status not in TRANSITIONS:
+        raise HTTPException(status_code=400, detail=f"Status must be one of: {', '.join(TRANSITIONS)}")
+
+    job = db.query(PrintJob).filter(PrintJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Print job not found")
+    if job.status not in TRANSITIONS[status]:
+        raise HTTPException(status_code=409, detail=f"Print job is {job.status}, can't mark it {status}")
+
+    now = datetime.now()
+    job.status = status
+    if status == "printing":
+        job.started_at = now
     else:
-        return {"status": "completed"} # File is gone (Watcher took it)
\ No newline at end of file
+        job.finished_at = now
+        job.error = error if status == "failed" else None
+    db.commit()
+    result = _job_dict(job)
+    print_events.publish_job(result)
+    return result
+
+def _expire_stale_claims(db: Session):
+    """
+    Claimed jobs whose watcher went quiet go back to the queue (or fail after PRINT_MAX_ATTEMPTS).
+    Jobs that reached "printing" are failed rather than retried: they may already be on paper.
+    """
+    cutoff = datetime.now() - timedelta(seconds=PRINT_CLAIM_TIMEOUT)
+    stale = (
+        db.query(PrintJob)
+        .filter(PrintJob.status.in_(("claimed", "printing")), PrintJob.claimed_at < cutoff)
+        .all()
+    )
+    if not stale:
+        return
+    for job in stale:
+        if job.status == "claimed" and (job.attempts or 0) < PRINT_MAX_ATTEMPTS:
+            job.status, job.printer, job.claimed_at = "queued", None, None
+        else:
+            job.status, job.finished_at = "failed", datetime.now()
+            job.error = f"No result from the printer watcher after {PRINT_CLAIM_TIMEOUT}s"
+    db.commit()
+    for job in stale:
+        print_events.publish_job(_job_dict(job))
+
+
+# ==========================================
+# REPORTING
+# ==========================================
+def list_jobs(db: Session, status: str = None, limit: int = 50):
+    query = db.query(PrintJob)
+    if status:
+        query = query.filter(PrintJob.status == status)
+    jobs = query.order_by(PrintJob.created_at.desc(), PrintJob.id.desc()).limit(limit).all()
+    return [_job_dict(job) for job in jobs]
+
+def get_print_stats(db: Session, hours: int = 24):
+    """Per printer over the last `hours`: jobs by status, copies printed, wait/start/print times and recent errors."""
+    since = datetime.now() - timedelta(hours=hours)
+    jobs = db.query(
+        PrintJob.printer, PrintJob.status, PrintJob.copies, PrintJob.error,
+        PrintJob.created_at, PrintJob.claimed_at, PrintJob.started_at, PrintJob.finished_at,
+    ).filter(PrintJob.created_at >= since).all()
+
+    printers = {}
+    for job in jobs:
+        entry = printers.setdefault(job.printer or "unassigned", {
+            "jobs": 0, "queued": 0, "claimed": 0, "printing": 0, "done": 0, "failed": 0,
+            "copies_printed": 0, "_waits": [], "_starts": [], "_prints": [], "last_error": None, "_last_error_at": None,
+        })
+        entry["jobs"] += 1
+        entry[job.status] = entry.get(job.status, 0) + 1
+        if job.claimed_at and job.created_at:
+            entry["_waits"].append((job.claimed_at - job.created_at).total_seconds())
+        if job.started_at and job.created_at:
+            # Spooled -> lp started: what the operator waits before the printer gets the job
+            entry["_starts"].append((job.started_at - job.created_at).total_seconds())
+        if job.status == "done":
+            entry["copies_printed"] += job.copies or 0
+            if job.started_at and job.finished_at:
+                entry["_prints"].append((job.finished_at - job.started_at).total_seconds())
+        if job.status == "failed" and (entry["_last_error_at"] is None or (job.finished_at or since) > entry["_last_error_at"]):
+            entry["last_error"], entry["_last_error_at"] = job.error, job.finished_at or since
+
+    for entry in printers.values():
+        waits, starts, prints = entry.pop("_waits"), entry.pop("_starts"), entry.pop("_prints")
+        entry.pop("_last_error_at")
+        finished = entry["done"] + entry["failed"]
+        entry["failure_rate"] = round(entry["failed"] / finished, 3) if finished else None
+        entry["jobs_per_hour"] = round(finished / hours, 2) if hours else None
+        entry["avg_wait_seconds"] = round(sum(waits) / len(waits), 2) if waits else None
+        entry["avg_start_seconds"] = round(sum(starts) / len(starts), 3) if starts else None
+        entry["avg_print_seconds"] = round(sum(prints) / len(prints), 2) if prints else None
+
+    return {"hours": hours, "printers": printers}
+
+def _job_dict(job):
+    return {
+        "id": job.id,
+        "client_status": client_status(job.status),
+        "docket_id": job.docket_id,
+        "filename": job.filename,
+        "queue": job.queue,
+        "route": job.route,
+        "printer": job.printer,
+        "copies": job.copies,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+        "created_at": job.created_at,
+        "claimed_at": job.claimed_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
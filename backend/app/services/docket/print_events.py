@@ -0,0 +1,167 @@
+# app/services/docket/print_events.py
+
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import deque
+
+# In-process broker for print job state changes, streamed to browsers as Server-Sent Events.
+# Publishers are sync route handlers (threadpool) so events cross into each subscriber's
+# event loop with call_soon_threadsafe. Recent events are kept so a reconnecting client
+# (EventSource sends Last-Event-ID) resumes where it stopped. One backend process only:
+# with several workers each would need its own watcher reports.
+
+# --- CONFIGURATION ---
+# Events kept for clients resuming with Last-Event-ID
+PRINT_EVENTS_BUFFER = int(os.getenv("PRINT_EVENTS_BUFFER", "1000"))
+# Undelivered events per subscriber before it is dropped (it reconnects and resumes)
+PRINT_EVENTS_QUEUE = int(os.getenv("PRINT_EVENTS_QUEUE", "200"))
+# Comment line sent on idle connections so proxies keep them open
+PRINT_EVENTS_HEARTBEAT = float(os.getenv("PRINT_EVENTS_HEARTBEAT", "15"))
+
+_lock = threading.Lock()
+_events = deque(maxlen=PRINT_EVENTS_BUFFER)  # (id, type, data)
+_subscribers = set()
+# Ids continue from the clock, so after a restart old Last-Event-IDs are recognised as expired
+_state = {"last_id": int(time.time() * 1000)}
+_stats = {"published": 0, "delivered": 0, "replayed": 0, "dropped_subscribers": 0}
+
+_CLOSED = object()  # queued to a subscriber that fell too far behind
+
+
+class _Subscriber:
+    def __init__(self, loop, filename=None):
+        self.loop = loop
+        self.filename = filename
+        self.queue = asyncio.Queue(maxsize=PRINT_EVENTS_QUEUE)
+        self.closed = False
+
+    def wants(self, data):
+        return self.filename is None or data.get("filename") == self.filename
+
+    def push(self, event):
+        """Runs on the subscriber's loop."""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Don't let one stalled browser hold memory; it resumes from Last-Event-ID
+            self.closed = True
+            with _lock:
+                _stats["dropped_subscribers"] += 1
+            self.queue.get_nowait()
+            self.queue.put_nowait(_CLOSED)
+
+
+# ==========================================
+# 1. PUBLISH (any thread)
+# ==========================================
+def publish(event_type, data):
+    """Records an event and hands it to every matching subscriber. Call after the change is committed."""
+    with _lock:
+        _state["last_id"] += 1
+        event = (_state["last_id"], event_type, data)
+        _events.append(event)
+        _stats["published"] += 1
+        targets = [s for s in _subscribers if s.wants(data)]
+    for subscriber in targets:
+        try:
+            subscriber.loop.call_soon_threadsafe(subscriber.push, event)
+        except RuntimeError:
+            # Loop already closed; the subscription is going away
+            pass
+
+def publish_job(job):
+    """Event for a print job dict (docket_printer._job_dict)."""
+    publish("job", {key: _json_value(value) for key, value in job.items()})
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+# ==========================================
+# 2. SUBSCRIBE (async, one per connection)
+# ==========================================
+def _parse_last_id(last_event_id):
+    try:
+        return int(last_event_id) if last_event_id not in (None, "") else None
+    except ValueError:
+        return None
+
+def _format(event):
+    event_id, event_type, data = event
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def last_id():
+    """Id of the newest event; events after it can be replayed by passing it to stream()."""
+    with _lock:
+        return _state["last_id"]
+
+async def stream(last_event_id=None, filename=None, initial=None, heartbeat=None):
+    """
+    SSE text for one client: the `initial` job snapshots, buffered events after
+    last_event_id, then live ones. A "reset" event means events were missed
+    (too old to replay): refetch the status.
+    """
+    heartbeat = PRINT_EVENTS_HEARTBEAT if heartbeat is None else heartbeat
+    subscriber = _Subscriber(asyncio.get_running_loop(), filename)
+    after = _parse_last_id(last_event_id)
+
+    # Register and snapshot the buffer together so nothing falls between replay and live events
+    with _lock:
+        _subscribers.add(subscriber)
+        current_id = _state["last_id"]
+        missed = after is not None and (after > current_id or (bool(_events) and _events[0][0] > after + 1))
+        backlog = [e for e in _events if after is not None and e[0] > after and subscriber.wants(e[2])]
+        _stats["replayed"] += len(backlog)
+
+    try:
+        # Tells EventSource how long to wait before reconnecting
+        yield "retry: 2000\n\n"
+        if missed:
+            yield _format((current_id, "reset", {"reason": "events expired"}))
+        for job in initial or ():
+            yield _format((after or current_id, "job", {key: _json_value(value) for key, value in job.items()}))
+        for event in backlog:
+            yield _format(event)
+
+        # Only events published after registering reach the queue, so there are no duplicates
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is _CLOSED:
+                return
+            with _lock:
+                _stats["delivered"] += 1
+            yield _format(event)
+    finally:
+        subscriber.closed = True
+        with _lock:
+            _subscribers.discard(subscriber)
+
+
+# ==========================================
+# 3. HOUSEKEEPING
+# ==========================================
+def stats():
+    with _lock:
+        return {
+            **_stats,
+            "subscribers": len(_subscribers),
+            "buffered": len(_events),
+            "last_id": _state["last_id"],
+        }
+
+def clear():
+    with _lock:
+        _events.clear()
+        _subscribers.clear()
+        _state["last_id"] = int(time.time() * 1000)
+        for key in _stats:
+            _stats[key] = 0
@@ -0,0 +1,185 @@
+# app/services/docket/print_routing.py
+
+import os
+import re
+import time
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.printModels import PrintJob
+
+# Named printer queues. Each print job is assigned a queue when it is spooled; the watcher
+# serving that queue (print_watcher.py --queue NAME) claims it. With no queues configured
+# any watcher takes any job, as before.
+
+# --- CONFIGURATION ---
+# e.g. "office,yard"
+PRINT_QUEUES = [q for q in (s.strip() for s in os.getenv("PRINT_QUEUES", "").split(",")) if q]
+# e.g. "docket_type:Sales=office, terminal:weighbridge=yard" (first match wins; unmatched -> least busy)
+PRINT_ROUTES = os.getenv("PRINT_ROUTES", "")
+# A queue is stalled when its watcher hasn't asked for work, or its oldest job has waited, this long.
+# New jobs avoid stalled queues and other queues take over their waiting jobs.
+PRINT_QUEUE_STALL_SECONDS = int(os.getenv("PRINT_QUEUE_STALL_SECONDS", "60"))
+
+ROUTE_FIELDS = ("docket_type", "terminal")
+ACTIVE_STATUSES = ("queued", "claimed", "printing")
+QUEUE_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,50}$")
+
+_lock = threading.Lock()
+_last_seen = {}  # queue -> time.time() of its watcher's last claim
+_started_at = time.time()
+
+
+# ==========================================
+# 1. CONFIGURATION
+# ==========================================
+def parse_routes(text):
+    """[(field, value, queue)] from "field:value=queue, ..." (values compared case-insensitively)."""
+    routes = []
+    for rule in re.split(r"[,;]", text or ""):
+        rule = rule.strip()
+        if not rule:
+            continue
+        match = re.match(r"^(\w+)\s*:\s*(.+?)\s*=\s*([A-Za-z0-9_-]+)$", rule)
+        if not match or match.group(1) not in ROUTE_FIELDS:
+            raise ValueError(f"Invalid print route '{rule}' (expected e.g. docket_type:Customer=office)")
+        routes.append((match.group(1), match.group(2).lower(), match.group(3)))
+    return routes
+
+for _name in PRINT_QUEUES:
+    if not QUEUE_NAME_PATTERN.match(_name):
+        raise ValueError(f"Invalid print queue name '{_name}' (letters, digits, _ and - only)")
+ROUTES = parse_routes(PRINT_ROUTES)
+
+def is_enabled():
+    return bool(PRINT_QUEUES)
+
+
+# ==========================================
+# 2. QUEUE HEALTH
+# ==========================================
+def note_seen(queue):
+    """Called on every claim: the watcher for this queue is alive."""
+    if queue:
+        with _lock:
+            _last_seen[queue] = time.time()
+
+def last_seen(queue):
+    """Seconds since the queue's watcher last claimed (counted from startup if it hasn't yet)."""
+    with _lock:
+        return time.time() - _last_seen.get(queue, _started_at)
+
+def queue_depths(db: Session):
+    """queue -> {status: count} over jobs not finished yet (one grouped, indexed query)."""
+    depths = {name: {status: 0 for status in ACTIVE_STATUSES} for name in PRINT_QUEUES}
+    rows = (
+        db.query(PrintJob.queue, PrintJob.status, func.count(PrintJob.id))
+        .filter(PrintJob.status.in_(ACTIVE_STATUSES))
+        .group_by(PrintJob.queue, PrintJob.status)
+        .all()
+    )
+    for queue, status, count in rows:
+        if queue in depths:
+            depths[queue][status] = count
+    return depths
+
+def oldest_waiting(db: Session):
+    """queue -> created_at of its oldest queued job."""
+    rows = (
+        db.query(PrintJob.queue, func.min(PrintJob.created_at))
+        .filter(PrintJob.status == "queued", PrintJob.queue.isnot(None))
+        .group_by(PrintJob.queue)
+        .all()
+    )
+    return dict(rows)
+
+def stalled_queues(db: Session, oldest=None):
+    """Queues whose watcher went quiet or whose oldest job has waited past PRINT_QUEUE_STALL_SECONDS."""
+    oldest = oldest_waiting(db) if oldest is None else oldest
+    cutoff = datetime.now() - timedelta(seconds=PRINT_QUEUE_STALL_SECONDS)
+    stalled = set()
+    for name in PRINT_QUEUES:
+        if last_seen(name) > PRINT_QUEUE_STALL_SECONDS:
+            stalled.add(name)
+        elif oldest.get(name) is not None and oldest[name] < cutoff:
+            stalled.add(name)
+    return stalled
+
+
+# ==========================================
+# 3. ROUTING
+# ==========================================
+def choose_queue(db: Session, docket_type=None, terminal=None, requested=None):
+    """
+    (queue, reason) for a new job: the requested queue, else the first matching route
+    (terminal / docket type), else the least busy queue. A stalled choice fails over to the
+    least busy healthy queue. (None, None) when no queues are configured.
+    """
+    if not PRINT_QUEUES:
+        return None, None
+
+    stalled = stalled_queues(db)
+    healthy = [q for q in PRINT_QUEUES if q not in stalled] or PRINT_QUEUES
+
+    choice, reason = None, None
+    if requested:
+        if requested not in PRINT_QUEUES:
+            raise ValueError(f"Unknown print queue '{requested}' (configured: {', '.join(PRINT_QUEUES)})")
+        choice, reason = requested, "requested"
+    else:
+        values = {"docket_type": docket_type, "terminal": terminal}
+        for field, value, queue in ROUTES:
+            if (values[field] or "").lower() == value and queue in PRINT_QUEUES:
+                choice, reason = queue, field
+                break
+
+    if choice is not None and choice not in stalled:
+        return choice, reason
+
+    depths = queue_depths(db)
+    least_busy = min(healthy, key=lambda q: (sum(depths[q].values()), PRINT_QUEUES.index(q)))
+    return least_busy, "failover" if choice is not None else "least_busy"
+
+
+# ==========================================
+# 4. STATS
+# ==========================================
+def get_queue_stats(db: Session):
+    """Per queue: depth by status, oldest wait, watcher last seen, stalled, and the last hour's throughput."""
+    depths = queue_depths(db)
+    oldest = oldest_waiting(db)
+    stalled = stalled_queues(db, oldest)
+    hour_ago = datetime.now() - timedelta(hours=1)
+    finished = (
+        db.query(PrintJob.queue, PrintJob.status, func.count(PrintJob.id))
+        .filter(PrintJob.status.in_(("done", "failed")), PrintJob.finished_at >= hour_ago)
+        .group_by(PrintJob.queue, PrintJob.status)
+        .all()
+    )
+    last_hour = {}
+    for queue, status, count in finished:
+        last_hour.setdefault(queue, {})[status] = count
+
+    queues = {}
+    for name in PRINT_QUEUES:
+        waiting_since = oldest.get(name)
+        queues[name] = {
+            **depths[name],
+            "depth": sum(depths[name].values()),
+            "oldest_queued_seconds": round((datetime.now() - waiting_since).total_seconds(), 1) if waiting_since else None,
+            "watcher_seen_seconds_ago": round(last_seen(name), 1),
+            "stalled": name in stalled,
+            "done_last_hour": last_hour.get(name, {}).get("done", 0),
+            "failed_last_hour": last_hour.get(name, {}).get("failed", 0),
+        }
+    return {
+        "enabled": is_enabled(),
+        "routes": [{"field": f, "value": v, "queue": q} for f, v, q in ROUTES],
+        "stall_seconds": PRINT_QUEUE_STALL_SECONDS,
+        "queues": queues,
+    }
+
+def clear():
+    with _lock:
+        _last_seen.clear()
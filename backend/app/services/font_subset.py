@@ -0,0 +1,220 @@
+# backend/app/services/font_subset.py
+
+import os
+import io
+import re
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+
+from app.services import render_resources
+
+logger = logging.getLogger(__name__)
+
+# Static, subsetted instances of the Lexend variable font: one small TTF per weight the
+# templates use, instead of embedding the whole variable font in every PDF.
+
+# --- CONFIGURATION ---
+# "false" = keep using the full variable font
+FONT_SUBSET = os.getenv("FONT_SUBSET", "true").strip().lower() in ("1", "true", "yes", "on")
+# Generated fonts are shared by the API process and the render workers through this directory
+FONT_CACHE_DIR = os.getenv("FONT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "scrap_fonts"))
+
+# Characters our documents can contain: Latin-1, Latin Extended-A (customer names),
+# general punctuation and currency signs. Anything else falls back to a system font.
+UNICODES = sorted(set(
+    list(range(0x20, 0x7F))
+    + list(range(0xA0, 0x180))
+    + list(range(0x2010, 0x2027))
+    + [0x2030, 0x2039, 0x203A, 0x2122, 0x2212]
+    + list(range(0x20A0, 0x20C1))
+))
+# Bump when UNICODES or the subset options change (part of the cache key)
+SUBSET_VERSION = "1"
+INSTANCE_PREFIX = "Lexend-"
+INSTANCE_SUFFIX = ".subset.ttf"
+
+# Browser defaults (<b>, <strong>, <th>, body text) are always covered
+DEFAULT_WEIGHTS = (400, 700)
+WEIGHT_KEYWORDS = {"normal": 400, "bold": 700, "bolder": 700, "lighter": 300}
+WEIGHT_PATTERN = re.compile(r"font-weight\s*:\s*([a-z]+|\d{3})", re.IGNORECASE)
+
+_lock = threading.Lock()
+_instances = {}  # (cache key, weight) -> ttf bytes
+_state = {"weights": None, "weights_stamp": None, "disabled_reason": None, "disabled_for": None}
+_stats = {"generated": 0, "disk_hits": 0, "memory_hits": 0, "seconds_generating": 0.0}
+
+
+# ==========================================
+# 1. WEIGHTS USED BY THE TEMPLATES
+# ==========================================
+def _template_sources():
+    return sorted(
+        entry.name for entry in os.scandir(render_resources.TEMPLATE_DIR)
+        if entry.is_file() and entry.name.endswith((".css", ".html"))
+    )
+
+def parse_weights(text):
+    """Numeric font weights referenced by CSS/HTML text."""
+    weights = set()
+    for value in WEIGHT_PATTERN.findall(text):
+        value = value.lower()
+        weight = int(value) if value.isdigit() else WEIGHT_KEYWORDS.get(value)
+        if weight:
+            weights.add(min(max(weight, 100), 900))
+    return weights
+
+def get_weights():
+    """Weights in the template stylesheets (plus the defaults); re-parsed only when a template changes."""
+    names = _template_sources()
+    stamp = tuple((name, render_resources._stamp(os.path.join(render_resources.TEMPLATE_DIR, name))) for name in names)
+    with _lock:
+        if _state["weights_stamp"] == stamp:
+            return _state["weights"]
+
+    weights = set(DEFAULT_WEIGHTS)
+    for name in names:
+        weights |= parse_weights(render_resources.get_text(name))
+    weights = tuple(sorted(weights))
+    with _lock:
+        _state["weights"], _state["weights_stamp"] = weights, stamp
+    return weights
+
+
+# ==========================================
+# 2. INSTANCES
+# ==========================================
+def is_enabled():
+    font_path = os.path.join(render_resources.TEMPLATE_DIR, render_resources.FONT_FILE)
+    if not FONT_SUBSET or not os.path.isfile(font_path):
+        return False
+    # After a failure, retry only once the font file changes
+    return _state["disabled_for"] is None or _state["disabled_for"] != _cache_key()
+
+def instance_name(weight):
+    return f"{INSTANCE_PREFIX}{weight}{INSTANCE_SUFFIX}"
+
+def parse_instance_name(name):
+    """Weight of a generated instance name, or None if the name isn't one."""
+    if not (name.startswith(INSTANCE_PREFIX) and name.endswith(INSTANCE_SUFFIX)):
+        return None
+    weight = name[len(INSTANCE_PREFIX):-len(INSTANCE_SUFFIX)]
+    return int(weight) if weight.isdigit() and 100 <= int(weight) <= 900 else None
+
+def _cache_key():
+    """Changes with the font file or the glyph set/options (weights are part of the file name)."""
+    stamp = render_resources._stamp(os.path.join(render_resources.TEMPLATE_DIR, render_resources.FONT_FILE))
+    return hashlib.sha1(repr((render_resources.FONT_FILE, stamp, SUBSET_VERSION)).encode()).hexdigest()[:12]
+
+def get_instance(weight):
+    """TTF bytes of Lexend at this weight, subsetted to UNICODES (memory, then disk, then generated)."""
+    key = _cache_key()
+    with _lock:
+        cached = _instances.get((key, weight))
+        if cached is not None:
+            _stats["memory_hits"] += 1
+            return cached
+
+    path = os.path.join(FONT_CACHE_DIR, f"{key}-{weight}.ttf")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        with _lock:
+            _stats["disk_hits"] += 1
+    except OSError:
+        data = _generate(weight)
+        _write(path, data)
+
+    with _lock:
+        # Instances of an older font file are no longer reachable
+        for stale in [k for k in _instances if k[0] != key]:
+            _instances.pop(stale)
+        _instances[(key, weight)] = data
+    return data
+
+def _generate(weight):
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+    from fontTools import subset
+
+    start = time.perf_counter()
+    font = TTFont(io.BytesIO(render_resources.get_bytes(render_resources.FONT_FILE)))
+    if "fvar" in font:
+        font = instancer.instantiateVariableFont(font, {"wght": weight})
+
+    options = subset.Options()
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+    options.layout_features = ["kern", "liga", "calt", "tnum", "lnum"]
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=UNICODES)
+    subsetter.subset(font)
+
+    buffer = io.BytesIO()
+    font.save(buffer)
+    seconds = time.perf_counter() - start
+    with _lock:
+        _stats["generated"] += 1
+        _stats["seconds_generating"] += seconds
+    logger.info(f"🔤 Generated Lexend {weight} subset ({len(buffer.getvalue()) / 1024:.0f} KB) in {seconds:.2f}s")
+    return buffer.getvalue()
+
+def _write(path, data):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.error(f"⚠️ Failed to cache font subset: {e}")
+
+
+# ==========================================
+# 3. @font-face RULES
+# ==========================================
+def get_font_face_css(asset_base=None):
+    """
+    One @font-face per weight, pointing at the static subsets.
+    None if subsetting is off or fontTools can't be used (caller falls back to the variable font).
+    """
+    if not is_enabled():
+        return None
+    try:
+        weights = get_weights()
+        # Generate up front so a fontTools problem shows up here, not as a missing font in the PDF
+        for weight in weights:
+            get_instance(weight)
+    except Exception as e:
+        _state["disabled_reason"], _state["disabled_for"] = str(e), _cache_key()
+        logger.error(f"⚠️ Font subsetting disabled, using the variable font: {e}")
+        return None
+
+    return "".join(f"""
+    @font-face {{
+        font-family: 'Lexend';
+        src: url({render_resources.asset_url(instance_name(weight), asset_base)}) format('truetype');
+        font-weight: {weight};
+        font-style: normal;
+    }}
+    """ for weight in weights)
+
+def stats():
+    with _lock:
+        return {
+            **_stats,
+            "enabled": is_enabled(),
+            "disabled_reason": _state["disabled_reason"],
+            "weights": list(_state["weights"] or ()),
+            "cached_instances": len(_instances),
+            "cache_dir": FONT_CACHE_DIR,
+        }
+
+def clear():
+    with _lock:
+        _instances.clear()
+        _state.update({"weights": None, "weights_stamp": None, "disabled_reason": None, "disabled_for": None})
+        for key in _stats:
+            _stats[key] = 0
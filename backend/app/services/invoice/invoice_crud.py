@@ -6,6 +6,7 @@ from app.models.invoiceModels import Invoice, InvoiceItem, TransportItem, Deduct
 from app.schema.invoiceSchema import InvoiceCreate
 from app.utilities.scrinv_generator import generate_next_scrinv
 from app.services.invoice import selector_service
+from app.services import pdf_cache, list_pagination
 
 def generate_new_id(db: Session):
     scrinv = generate_next_scrinv(db)
@@ -54,6 +55,8 @@ def delete_invoice(db: Session, invoice_id: int):
         raise HTTPException(status_code=404, detail="Invoice not found")
     db.delete(invoice)
     db.commit()
+    pdf_cache.invalidate("invoice", invoice_id)
+    list_pagination.invalidate_counts("invoice")
     return {"message": "deleted"}
 
 def upsert_invoice(db: Session, data: InvoiceCreate):
@@ -141,6 +144,8 @@ def upsert_invoice(db: Session, data: InvoiceCreate):
     
 
     db.commit()
+    pdf_cache.invalidate("invoice", invoice.id)
+    list_pagination.invalidate_counts("invoice")
     # Return invoice number for frontend
     return {
         "message": "invoice saved", 
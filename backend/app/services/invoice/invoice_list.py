@@ -1,22 +1,19 @@
 # backend/app/services/invoice/invoice_list.py
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, desc, case, func
+from sqlalchemy import or_, and_, case, func
 from app.models.invoiceModels import Invoice
 from typing import Optional
 from datetime import date
+from app.services import list_pagination
 
-def get_invoices_paginated(
-    db: Session, 
-    page: int = 1, 
-    limit: int = 10, 
+def filter_invoices_query(
+    db: Session,
     search: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None
 ):
-    # Calculate offset
-    skip = (page - 1) * limit
-
+    """Non-empty invoices matching the list filters (shared by the list and batch export)."""
     # Base Query
     query = db.query(Invoice)
 
@@ -44,25 +41,77 @@ def get_invoices_paginated(
     if end_date:
         query = query.filter(Invoice.invoice_date <= end_date)
 
+    return query
+
+# --- SORT KEY: unpaid first, newest date first (undated first, as Postgres orders DESC), id tie-breaker ---
+paid_rank = case((Invoice.status == 'Paid', 1), else_=0)
+
+def _seek(direction, key):
+    """Invoices after ("next") or before ("prev") the sort key [paid, invoice_date, id]."""
+    paid, invoice_date, invoice_id = int(key[0]), key[1], int(key[2])
+    if invoice_date is not None:
+        invoice_date = date.fromisoformat(invoice_date)
+
+    if direction == "next":
+        if invoice_date is None:
+            same_paid = or_(Invoice.invoice_date.isnot(None), Invoice.id < invoice_id)
+        else:
+            same_paid = or_(Invoice.invoice_date < invoice_date, and_(Invoice.invoice_date == invoice_date, Invoice.id < invoice_id))
+        return or_(paid_rank > paid, and_(paid_rank == paid, same_paid))
+
+    if invoice_date is None:
+        same_paid = and_(Invoice.invoice_date.is_(None), Invoice.id > invoice_id)
+    else:
+        same_paid = or_(
+            Invoice.invoice_date.is_(None),
+            Invoice.invoice_date > invoice_date,
+            and_(Invoice.invoice_date == invoice_date, Invoice.id > invoice_id),
+        )
+    return or_(paid_rank < paid, and_(paid_rank == paid, same_paid))
+
+def _sort_key(inv):
+    return [1 if inv.status == 'Paid' else 0, inv.invoice_date.isoformat() if inv.invoice_date else None, inv.id]
+
+def get_invoices_paginated(
+    db: Session, 
+    page: int = 1, 
+    limit: int = 10, 
+    search: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True
+):
+    query = filter_invoices_query(db, search, start_date, end_date)
+
     # --- 3. GET TOTAL COUNT ---
     # This count now reflects only the non-empty invoices
-    total = query.count()
-
-    # --- 4. SORTING ---
-    is_paid_order = case((Invoice.status == 'Paid', True), else_=False)
-    
-    query = query.order_by(
-        is_paid_order,              # Unpaid first
-        Invoice.invoice_date.desc(), # Newest date first
-        Invoice.id.desc()            # Tie-breaker
-    )
+    # Page mode counts every time; cursor mode reuses a recent count
+    total = None
+    if include_total:
+        if cursor:
+            total = list_pagination.cached_count("invoice", (search, start_date, end_date), query)
+        else:
+            total = query.count()
 
-    # --- 5. PAGINATION ---
-    invoices = query.options(
-        joinedload(Invoice.items), 
-        joinedload(Invoice.transport_items),
-        joinedload(Invoice.deductions)
-    ).offset(skip).limit(limit).all()
+    # --- 4. SORTING & PAGINATION ---
+    # A cursor seeks past the last row's sort key instead of skipping (page - 1) * limit rows
+    invoices, next_cursor, prev_cursor = list_pagination.fetch_page(
+        query.options(
+            joinedload(Invoice.items), 
+            joinedload(Invoice.transport_items),
+            joinedload(Invoice.deductions)
+        ),
+        "invoice", limit, page, cursor,
+        order_by=[
+            paid_rank,                                 # Unpaid first
+            Invoice.invoice_date.desc().nullsfirst(),  # Newest date first
+            Invoice.id.desc()                          # Tie-breaker
+        ],
+        reverse_order_by=[paid_rank.desc(), Invoice.invoice_date.asc().nullslast(), Invoice.id.asc()],
+        seek=_seek,
+        key_of=_sort_key,
+    )
 
     results = []
 
@@ -95,6 +144,8 @@ def get_invoices_paginated(
     return {
         "data": results,
         "total": total,
-        "page": page,
-        "limit": limit
+        "page": None if cursor else page,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor
     }
\ No newline at end of file
@@ -1,17 +1,16 @@
 # backend/app/services/invoice/invoice_pdf.py
 
 import os
-import base64
 from io import BytesIO
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML, CSS
 from datetime import datetime, timedelta, date
 
 from app.services.invoice import invoice_crud
 from app.models.settingsModels import CurrencyOption
+from app.services import render_resources, pdf_render_pool, pdf_cache
 
 # --- Helper for Decimal conversion ---
 def to_decimal(val):
@@ -30,13 +29,23 @@ def format_qty(val):
         s = s.rstrip('0').rstrip('.')
     return s
 
-def get_file_base64(file_path):
-    if not os.path.exists(file_path):
-        return ""
-    with open(file_path, "rb") as f:
-        return base64.b64encode(f.read()).decode('utf-8')
+STYLESHEET = "invoice_template_styles.css"
 
-def render_invoice_html(db: Session, invoice_id: int):
+# --- Large invoices ---
+# Invoices with more rows (line + transport items) than this are laid out in chunks
+LARGE_INVOICE_ROWS = int(os.getenv("LARGE_INVOICE_ROWS", "120"))
+# Line items per chunk (each chunk is its own WeasyPrint document)
+INVOICE_CHUNK_ROWS = int(os.getenv("INVOICE_CHUNK_ROWS", "60"))
+
+def render_invoice_html(db: Session, invoice_id: int, asset_base: str = None, inline_css: bool = True):
+    """
+    Invoice HTML. Fonts/images are URLs: "asset:" for PDFs, or under asset_base for browser previews.
+    inline_css=False leaves out the <style> block; the PDF renderer applies STYLESHEET pre-parsed instead.
+    """
+    return _render_template(get_invoice_context(db, invoice_id), asset_base, inline_css)
+
+def get_invoice_context(db: Session, invoice_id: int):
+    """Invoice data, formatted dates, currency symbol and totals for the template."""
     # 1. Get Data
     inv_dict = invoice_crud.get_invoice_by_id(db, invoice_id)
     
@@ -79,6 +88,7 @@ def render_invoice_html(db: Session, invoice_id: int):
         # Round the line total to 2 decimal places before summing
         line_total = round(qty * price, 2)
         items_total += line_total
+        i['line_total'] = line_total
         
         # [NEW] Add formatted quantity string to the item dictionary
         i['qty_formatted'] = format_qty(qty)
@@ -116,55 +126,136 @@ def render_invoice_html(db: Session, invoice_id: int):
         "total": total
     }
 
-    # 5. Setup Template
-    template_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("invoice_template.html")
-    
-    # --- FONT EMBEDDING ---
-    font_path = os.path.join(template_dir, "Lexend-VariableFont_wght.ttf")
-    font_b64 = get_file_base64(font_path)
-    
-    font_face_css = f"""
-    @font-face {{
-        font-family: 'Lexend';
-        src: url(data:font/ttf;base64,{font_b64}) format('truetype');
-        font-weight: 100 900;
-        font-style: normal;
-    }}
-    """
-
-    css_path = os.path.join(template_dir, "invoice_template_styles.css")
-    css_content = ""
-    if os.path.exists(css_path):
-        with open(css_path, 'r') as css_file:
-            css_content = font_face_css + css_file.read()
-            
-    header_img_path = os.path.join(template_dir, "invoice_header_logo.png")
-    footer_img_path = os.path.join(template_dir, "invoice_footer_logo.png")
+    return {
+        "invoice": inv_dict,
+        "totals": totals,
+        "formatted_date": formatted_date,
+        "formatted_due_date": formatted_due_date,
+        "symbol": symbol,
+    }
 
-    header_b64 = get_file_base64(header_img_path)
-    footer_b64 = get_file_base64(footer_img_path)
+def _render_template(context, asset_base=None, inline_css=True, chunk=None):
+    # 5. Template and CSS come from the shared per-process cache; font and logos are referenced by URL
+    template = render_resources.get_template("invoice_template.html")
+    css_content = render_resources.get_css(STYLESHEET, asset_base) if inline_css else ""
+    header_url = render_resources.asset_url("invoice_header_logo.png", asset_base)
+    footer_url = render_resources.asset_url("invoice_footer_logo.png", asset_base)
 
     # 6. Render
     return template.render(
-        invoice=inv_dict, 
-        totals=totals, 
+        **context,
         css_content=css_content,
-        formatted_date=formatted_date,
-        formatted_due_date=formatted_due_date,
-        symbol=symbol,
-        header_img_base64=header_b64, 
-        footer_img_base64=footer_b64
+        header_img_url=header_url,
+        footer_img_url=footer_url,
+        chunk=chunk
     )
 
+def render_invoice_pdf_html(db: Session, invoice_id: int):
+    """
+    (html, chunks) of the invoice PDF: chunks for a large invoice, else the single document's
+    HTML. The invoice data and totals are built once either way.
+    """
+    context = get_invoice_context(db, invoice_id)
+    chunks = render_invoice_chunks(db, invoice_id, context)
+    if chunks:
+        return None, chunks
+    return _render_template(context, inline_css=False), None
+
+def render_invoice_chunks(db: Session, invoice_id: int, context=None):
+    """
+    PDF HTML of a large invoice split into chunks of INVOICE_CHUNK_ROWS line items: the first
+    has the header, the last the transport rows, totals and payment details, and each carries
+    the running total forward. None if the invoice is small enough for one document.
+    Pass context (get_invoice_context) when the caller already has it.
+    """
+    if context is None:
+        context = get_invoice_context(db, invoice_id)
+    line_items = context["invoice"]["line_items"]
+    rows = len(line_items) + len(context["invoice"]["transport_items"])
+    if LARGE_INVOICE_ROWS <= 0 or rows <= LARGE_INVOICE_ROWS:
+        return None
+
+    size = max(INVOICE_CHUNK_ROWS, 1)
+    starts = list(range(0, len(line_items), size)) or [0]
+    chunks = []
+    running = Decimal("0.00")
+    for index, start in enumerate(starts):
+        items = line_items[start:start + size]
+        brought_forward = running
+        running += sum((item["line_total"] for item in items), Decimal("0.00"))
+        chunk = {
+            "index": index,
+            "first": index == 0,
+            "last": index == len(starts) - 1,
+            "line_items": items,
+            "row_offset": start,
+            "brought_forward": brought_forward,
+            "carried_forward": running,
+        }
+        chunks.append(_render_template(context, inline_css=False, chunk=chunk))
+    return chunks
+
+def render_pdf(html_content):
+    """PDF bytes of invoice HTML rendered with inline_css=False."""
+    return pdf_render_pool.pool.render(html_content, stylesheet=STYLESHEET)
+
+def render_chunked_pdf(chunks):
+    """
+    Renders the chunks side by side on the render pool (one WeasyPrint document each, so
+    layout cost and worker memory grow with the chunk, not the invoice), joins the pages
+    and stamps "Page N of M" over the result.
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    workers = max(pdf_render_pool.pool.workers, 1)
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks)), thread_name_prefix="invoice-chunk") as executor:
+        parts = list(executor.map(render_pdf, chunks))
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(BytesIO(part))
+
+    box = writer.pages[0].mediabox
+    numbers = PdfReader(BytesIO(pdf_render_pool.pool.render(
+        _page_numbers_html(len(writer.pages), float(box.width), float(box.height))
+    )))
+    for page, overlay in zip(writer.pages, numbers.pages):
+        page.merge_page(overlay)
+
+    output = BytesIO()
+    writer.write(output)
+    writer.close()
+    return output.getvalue()
+
+def _page_numbers_html(count, width_pt, height_pt):
+    """One blank page per PDF page, with the page number in the bottom margin."""
+    return f"""<!DOCTYPE html>
+<html><head><style>
+    @page {{
+        size: {width_pt}pt {height_pt}pt;
+        margin: 1cm;
+        @bottom-right {{
+            content: "Page " counter(page) " of " counter(pages);
+            font-family: Helvetica, Arial, sans-serif;
+            font-size: 8pt;
+            color: #666;
+        }}
+    }}
+    div {{ height: 1px; break-after: page; }}
+</style></head>
+<body>{"<div></div>" * (count - 1)}<div style="break-after: auto;"></div></body></html>"""
+
 def generate_invoice_pdf(db: Session, invoice_id: int):
     try:
-        html_content = render_invoice_html(db, invoice_id)
-        pdf_buffer = BytesIO()
-        HTML(string=html_content).write_pdf(pdf_buffer)
-        pdf_buffer.seek(0)
-        return pdf_buffer
+        html_content, chunks = render_invoice_pdf_html(db, invoice_id)
+        if chunks:
+            # Large invoice: key on all chunks together, render them in parallel and join
+            return pdf_cache.get_or_render("invoice", invoice_id, "".join(chunks), lambda _: render_chunked_pdf(chunks))
+
+        # Same content + templates = same PDF; only misses go to the render pool
+        return pdf_cache.get_or_render("invoice", invoice_id, html_content, render_pdf)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"PDF Generation Error: {e}")
         raise HTTPException(status_code=500, detail=f"Error generating PDF: {str(e)}")
\ No newline at end of file
@@ -3,6 +3,7 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.models.invoiceModels import Invoice
+from app.services import pdf_cache
 
 def update_status(db: Session, invoice_id: int, status_type: str):
     invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
@@ -14,4 +15,5 @@ def update_status(db: Session, invoice_id: int, status_type: str):
     
     invoice.status = new_status
     db.commit()
+    pdf_cache.invalidate("invoice", invoice_id)
     return {"message": f"status updated to {new_status}"}
\ No newline at end of file
@@ -0,0 +1,107 @@
+# backend/app/services/list_pagination.py
+
+import os
+import json
+import time
+import base64
+import binascii
+import threading
+from fastapi import HTTPException
+
+# Keyset ("cursor") pagination for the docket and invoice lists. A cursor holds the sort key
+# of the row it was taken from, so the next page is a seek on the list's index
+# (WHERE key < last key ... LIMIT n) instead of reading and discarding OFFSET rows.
+# Page numbers keep working; every response carries cursors either way.
+
+# --- CONFIGURATION ---
+# How long a cursor-mode list total is reused (saves a full COUNT per page); 0 = always count
+LIST_COUNT_CACHE_SECONDS = float(os.getenv("LIST_COUNT_CACHE_SECONDS", "30"))
+
+DIRECTIONS = ("next", "prev")
+
+_lock = threading.Lock()
+_counts = {}  # (kind, filters) -> (total, time.monotonic())
+
+
+# ==========================================
+# 1. CURSORS
+# ==========================================
+def encode_cursor(kind, direction, key):
+    """Opaque cursor: URL-safe base64 of {kind, direction, sort key}."""
+    payload = json.dumps({"k": kind, "d": direction, "v": key}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(kind, cursor):
+    """(direction, sort key) of a cursor from this list; 400 for anything else."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["k"] != kind or payload["d"] not in DIRECTIONS or not isinstance(payload["v"], list):
+            raise ValueError(payload)
+        return payload["d"], payload["v"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# ==========================================
+# 2. PAGES
+# ==========================================
+def fetch_page(query, kind, limit, page, cursor, order_by, reverse_order_by, seek, key_of):
+    """
+    One page of `query` as (rows, next_cursor, prev_cursor).
+    Without a cursor the page is read by OFFSET; with one, by seeking past its key:
+    seek(direction, key) is the filter for rows after ("next") or before ("prev") that key,
+    and reverse_order_by is order_by flipped (a "prev" page is read backwards, then reversed).
+    One extra row is fetched to know whether there is a further page.
+    """
+    if cursor:
+        direction, key = decode_cursor(kind, cursor)
+        try:
+            condition = seek(direction, key)
+        except (ValueError, TypeError, IndexError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        ordering = order_by if direction == "next" else reverse_order_by
+        rows = query.filter(condition).order_by(*ordering).limit(limit + 1).all()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if direction == "next":
+            has_next, has_prev = more, True
+        else:
+            rows.reverse()
+            has_next, has_prev = True, more
+    else:
+        rows = query.order_by(*order_by).offset((page - 1) * limit).limit(limit + 1).all()
+        has_next, has_prev = len(rows) > limit, page > 1
+        rows = rows[:limit]
+
+    next_cursor = encode_cursor(kind, "next", key_of(rows[-1])) if rows and has_next else None
+    prev_cursor = encode_cursor(kind, "prev", key_of(rows[0])) if rows and has_prev else None
+    return rows, next_cursor, prev_cursor
+
+
+# ==========================================
+# 3. TOTALS
+# ==========================================
+def cached_count(kind, filters, query):
+    """query.count(), reused for LIST_COUNT_CACHE_SECONDS per list + filters (dropped on saves/deletes)."""
+    cache_key = (kind, tuple(filters))
+    now = time.monotonic()
+    with _lock:
+        hit = _counts.get(cache_key)
+        if hit and now - hit[1] < LIST_COUNT_CACHE_SECONDS:
+            return hit[0]
+
+    total = query.count()
+    with _lock:
+        _counts[cache_key] = (total, now)
+    return total
+
+def invalidate_counts(kind):
+    """A record of this kind was saved or deleted: its list totals may have changed."""
+    with _lock:
+        for cache_key in [k for k in _counts if k[0] == kind]:
+            del _counts[cache_key]
+
+def clear():
+    with _lock:
+        _counts.clear()
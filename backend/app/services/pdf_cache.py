@@ -0,0 +1,185 @@
+# backend/app/services/pdf_cache.py
+
+import os
+import hashlib
+import logging
+import threading
+from io import BytesIO
+from collections import OrderedDict
+
+from app.services import render_resources
+
+logger = logging.getLogger(__name__)
+
+# --- CONFIGURATION ---
+# In-memory LRU limits
+PDF_CACHE_MAX_ENTRIES = int(os.getenv("PDF_CACHE_MAX_ENTRIES", "64"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Optional disk tier (survives restarts and is shared by uvicorn workers); "" = memory only
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "")
+PDF_CACHE_DISK_MAX_BYTES = int(os.getenv("PDF_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+
+_lock = threading.Lock()
+_entries = OrderedDict()   # key -> pdf bytes (most recently used last)
+_by_record = {}            # (kind, record id) -> key of its latest PDF
+_state = {"version": None, "bytes": 0}
+_stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+
+# ==========================================
+# 1. KEYS
+# ==========================================
+def make_key(kind, html_content):
+    """
+    Content address of a PDF: the rendered HTML (every header field, item, deduction and
+    currency ends up in it) plus the template/asset version (assets may be referenced, not inlined).
+    """
+    sha = hashlib.sha256()
+    sha.update(f"{kind}:{render_resources.version()}:".encode())
+    sha.update(html_content.encode("utf-8"))
+    return sha.hexdigest()
+
+def _disk_path(key):
+    return os.path.join(PDF_CACHE_DIR, key[:2], key + ".pdf")
+
+
+# ==========================================
+# 2. PUBLIC API
+# ==========================================
+def get_or_render(kind, record_id, html_content, render_fn):
+    """Returns the PDF for this HTML as a BytesIO, rendering (render_fn(html) -> bytes) only on a miss."""
+    _check_version()
+    key = make_key(kind, html_content)
+
+    pdf = _get(key)
+    if pdf is None:
+        pdf = render_fn(html_content)
+        _put(key, pdf)
+        with _lock:
+            _stats["misses"] += 1
+
+    with _lock:
+        previous = _by_record.get((kind, record_id))
+        _by_record[(kind, record_id)] = key
+    if previous and previous != key:
+        _drop(previous)
+    return BytesIO(pdf)
+
+def invalidate(kind, record_id):
+    """Drops the cached PDF of a record (called when it is saved, its status changes or it is deleted)."""
+    with _lock:
+        key = _by_record.pop((kind, record_id), None)
+    if key:
+        _drop(key)
+        with _lock:
+            _stats["invalidations"] += 1
+
+def has_record(kind, record_id):
+    """True if the latest PDF of this record is in memory (e.g. pre-rendered after save)."""
+    with _lock:
+        key = _by_record.get((kind, record_id))
+        return key is not None and key in _entries
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _by_record.clear()
+        _state["bytes"] = 0
+
+def stats():
+    with _lock:
+        lookups = _stats["hits"] + _stats["disk_hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "hit_ratio": round((_stats["hits"] + _stats["disk_hits"]) / lookups, 3) if lookups else None,
+            "entries": len(_entries),
+            "bytes": _state["bytes"],
+            "max_entries": PDF_CACHE_MAX_ENTRIES,
+            "max_bytes": PDF_CACHE_MAX_BYTES,
+            "disk_dir": PDF_CACHE_DIR or None,
+        }
+
+
+# ==========================================
+# 3. INTERNALS
+# ==========================================
+def _check_version():
+    """A template/asset edit makes every cached PDF stale: drop them instead of letting them age out."""
+    current = render_resources.version()
+    with _lock:
+        changed = _state["version"] not in (None, current)
+        _state["version"] = current
+    if changed:
+        logger.info("🧹 Templates changed, PDF cache cleared")
+        clear()
+
+def _get(key):
+    with _lock:
+        pdf = _entries.get(key)
+        if pdf is not None:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return pdf
+
+    if PDF_CACHE_DIR:
+        try:
+            with open(_disk_path(key), "rb") as f:
+                pdf = f.read()
+        except OSError:
+            return None
+        _put(key, pdf, write_disk=False)
+        with _lock:
+            _stats["disk_hits"] += 1
+        return pdf
+    return None
+
+def _put(key, pdf, write_disk=True):
+    with _lock:
+        if key not in _entries:
+            _state["bytes"] += len(pdf)
+        _entries[key] = pdf
+        _entries.move_to_end(key)
+        while _entries and (len(_entries) > PDF_CACHE_MAX_ENTRIES or _state["bytes"] > PDF_CACHE_MAX_BYTES):
+            _, evicted = _entries.popitem(last=False)
+            _state["bytes"] -= len(evicted)
+            _stats["evictions"] += 1
+
+    if PDF_CACHE_DIR and write_disk:
+        try:
+            path = _disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(pdf)
+            os.replace(temp_path, path)
+            _prune_disk()
+        except OSError as e:
+            logger.error(f"⚠️ Failed to write PDF cache file: {e}")
+
+def _drop(key):
+    with _lock:
+        pdf = _entries.pop(key, None)
+        if pdf is not None:
+            _state["bytes"] -= len(pdf)
+    if PDF_CACHE_DIR:
+        try:
+            os.remove(_disk_path(key))
+        except OSError:
+            pass
+
+def _prune_disk():
+    """Keeps the disk tier under PDF_CACHE_DISK_MAX_BYTES, oldest files first."""
+    files = []
+    for root, _, names in os.walk(PDF_CACHE_DIR):
+        for name in names:
+            if name.endswith(".pdf"):
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                files.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= PDF_CACHE_DISK_MAX_BYTES:
+            break
+        os.remove(path)
+        total -= size
@@ -0,0 +1,133 @@
+# backend/app/services/pdf_merge.py
+
+from array import array
+from collections import deque
+from pypdf import PdfReader
+from pypdf.generic import (
+    ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject, TextStringObject
+)
+
+# Joins PDFs into one file while it is being written: each part's pages and everything they
+# reference are copied to the output as soon as the part arrives, and the part is dropped.
+# Memory stays at one part plus a few numbers per page, however many parts are merged
+# (pypdf's PdfWriter keeps every object of the merged document until write()).
+
+CATALOG, PAGES = 1, 2  # object numbers reserved for the document root and page tree
+
+
+class StreamingPdfMerger:
+    """
+    merger = StreamingPdfMerger(f); merger.append(pdf, "label"); ...; merger.close()
+    f is a binary file opened for writing; labels become the outline (bookmarks).
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.offsets = array("q", [0] * (PAGES + 1))  # object number -> byte offset, for the xref table
+        self.next_number = PAGES + 1
+        self.pages = []        # object numbers of every page, in order
+        self.outline = []      # (label, object number of the part's first page)
+        f.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def append(self, source, label=None):
+        """Copies every page of source (path or file object) into the output."""
+        reader = PdfReader(source)
+        numbers = {}           # (idnum, generation) in the part -> object number in the output
+        pending = deque()
+
+        def number_for(ref):
+            key = (ref.idnum, ref.generation)
+            if key not in numbers:
+                numbers[key] = self._allocate()
+                pending.append(ref)
+            return numbers[key]
+
+        def renumber(obj):
+            # Rewrites references in place; dict/list item access is raw so references aren't resolved
+            if isinstance(obj, IndirectObject):
+                return IndirectObject(number_for(obj), 0, None)
+            if isinstance(obj, DictionaryObject):
+                for key, value in list(dict.items(obj)):
+                    dict.__setitem__(obj, key, renumber(value))
+            elif isinstance(obj, ArrayObject):
+                for index, value in enumerate(list(obj)):
+                    list.__setitem__(obj, index, renumber(value))
+            return obj
+
+        # The part's page tree is replaced by ours: /Parent of its pages points at PAGES
+        root_pages = dict.__getitem__(reader.trailer["/Root"].get_object(), "/Pages")
+        numbers[(root_pages.idnum, root_pages.generation)] = PAGES
+
+        # reader.pages carries inherited attributes (MediaBox, Resources) on each page
+        first = len(self.pages)
+        for page in reader.pages:
+            self.pages.append(number_for(page.indirect_reference))
+        while pending:
+            ref = pending.popleft()
+            self._write_object(numbers[(ref.idnum, ref.generation)], renumber(ref.get_object()))
+        if label is not None and len(self.pages) > first:
+            self.outline.append((label, self.pages[first]))
+
+        # The reader's object cache points back at the reader; emptying it frees the part now
+        # rather than at the next garbage collection
+        reader.resolved_objects.clear()
+        reader.flattened_pages = None
+
+    def close(self):
+        """Writes the page tree, outline, catalog and cross-reference table."""
+        catalog = DictionaryObject({
+            NameObject("/Type"): NameObject("/Catalog"),
+            NameObject("/Pages"): IndirectObject(PAGES, 0, None),
+        })
+        if self.outline:
+            catalog[NameObject("/Outlines")] = IndirectObject(self._write_outline(), 0, None)
+            catalog[NameObject("/PageMode")] = NameObject("/UseOutlines")
+
+        self._write_object(PAGES, DictionaryObject({
+            NameObject("/Type"): NameObject("/Pages"),
+            NameObject("/Kids"): ArrayObject(IndirectObject(n, 0, None) for n in self.pages),
+            NameObject("/Count"): NumberObject(len(self.pages)),
+        }))
+        self._write_object(CATALOG, catalog)
+
+        xref = self.f.tell()
+        size = self.next_number
+        self.f.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+        for number in range(1, size):
+            self.f.write(f"{self.offsets[number]:010d} 00000 n \n".encode())
+        self.f.write(f"trailer\n<< /Size {size} /Root {CATALOG} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+
+    # --- INTERNALS ---
+    def _allocate(self):
+        number = self.next_number
+        self.next_number += 1
+        self.offsets.append(0)
+        return number
+
+    def _write_object(self, number, obj):
+        self.offsets[number] = self.f.tell()
+        self.f.write(f"{number} 0 obj\n".encode())
+        obj.write_to_stream(self.f)
+        self.f.write(b"\nendobj\n")
+
+    def _write_outline(self):
+        root = self._allocate()
+        items = [self._allocate() for _ in self.outline]
+        for index, (label, page) in enumerate(self.outline):
+            item = DictionaryObject({
+                NameObject("/Title"): TextStringObject(label),
+                NameObject("/Parent"): IndirectObject(root, 0, None),
+                NameObject("/Dest"): ArrayObject([IndirectObject(page, 0, None), NameObject("/Fit")]),
+            })
+            if index:
+                item[NameObject("/Prev")] = IndirectObject(items[index - 1], 0, None)
+            if index < len(items) - 1:
+                item[NameObject("/Next")] = IndirectObject(items[index + 1], 0, None)
+            self._write_object(items[index], item)
+        self._write_object(root, DictionaryObject({
+            NameObject("/Type"): NameObject("/Outlines"),
+            NameObject("/First"): IndirectObject(items[0], 0, None),
+            NameObject("/Last"): IndirectObject(items[-1], 0, None),
+            NameObject("/Count"): NumberObject(len(items)),
+        }))
+        return root
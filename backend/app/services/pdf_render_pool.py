@@ -0,0 +1,243 @@
+# backend/app/services/pdf_render_pool.py
+
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from io import BytesIO
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, CancelledError, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
+
+from app.services import render_resources
+from app.utilities.percentiles import describe
+
+logger = logging.getLogger(__name__)
+
+# --- CONFIGURATION ---
+# Worker processes for HTML -> PDF (0 = render in the calling thread, used by the tests)
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+# A render taking longer than this is abandoned (504) and its worker killed
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+# Workers are replaced after this many renders each, to cap WeasyPrint memory growth
+PDF_RENDER_MAX_TASKS_PER_CHILD = int(os.getenv("PDF_RENDER_MAX_TASKS_PER_CHILD", "50"))
+# Renders running + waiting beyond this are rejected (503) instead of piling up
+PDF_RENDER_MAX_QUEUE = int(os.getenv("PDF_RENDER_MAX_QUEUE", "16"))
+
+
+# ==========================================
+# 1. WORKER SIDE (runs in the child process)
+# ==========================================
+# Parsed stylesheets and the FontConfiguration their @font-face rules were loaded into.
+# Built once per process; rebuilt together when a stylesheet's text changes (CSS or font edit).
+_style_lock = threading.Lock()
+_style_state = {"font_config": None, "sheets": {}}  # sheets: name -> (css text, CSS)
+
+def _get_stylesheet(name):
+    """Pre-parsed CSS for a template stylesheet (with the Lexend @font-face), plus its FontConfiguration."""
+    css_text = render_resources.get_css(name)
+    with _style_lock:
+        cached = _style_state["sheets"].get(name)
+        if cached and cached[0] == css_text:
+            return cached[1], _style_state["font_config"]
+
+        if cached or _style_state["font_config"] is None:
+            # Fonts can't be unregistered from a FontConfiguration: start a fresh one
+            _style_state["font_config"] = FontConfiguration()
+            _style_state["sheets"] = {}
+        font_config = _style_state["font_config"]
+        sheet = CSS(string=css_text, font_config=font_config, url_fetcher=render_resources.url_fetcher)
+        _style_state["sheets"][name] = (css_text, sheet)
+        return sheet, font_config
+
+def _render(html_content, stylesheet=None):
+    """
+    HTML -> PDF bytes. Returns (pdf, seconds spent rendering).
+    stylesheet names a template stylesheet applied pre-parsed (the HTML then has no <style> block).
+    """
+    start = time.perf_counter()
+    pdf_buffer = BytesIO()
+    options = {}
+    if stylesheet:
+        sheet, font_config = _get_stylesheet(stylesheet)
+        options = {"stylesheets": [sheet], "font_config": font_config}
+    # Fonts/images are "asset:" URLs answered from this worker's in-memory cache
+    HTML(string=html_content, url_fetcher=render_resources.url_fetcher).write_pdf(pdf_buffer, **options)
+    return pdf_buffer.getvalue(), time.perf_counter() - start
+
+
+# ==========================================
+# 2. POOL (runs in the API process)
+# ==========================================
+class PdfRenderPool:
+    """
+    Bounded, out-of-process PDF rendering.
+    Python 3.10 has no max_tasks_per_child, so recycling is done per executor:
+    after workers * max_tasks_per_child renders a fresh executor takes over and
+    the old one exits once its running jobs finish.
+    """
+
+    def __init__(self, workers=PDF_RENDER_WORKERS, timeout=PDF_RENDER_TIMEOUT,
+                 max_tasks_per_child=PDF_RENDER_MAX_TASKS_PER_CHILD, max_queue=PDF_RENDER_MAX_QUEUE,
+                 render_fn=None):
+        self.workers = workers
+        # (html, stylesheet) -> (pdf, seconds); must be picklable (a module-level function) for the workers
+        self.render_fn = render_fn or _render
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self.max_queue = max(max_queue, 1)
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._executor_renders = 0
+        self._inline_lock = threading.Lock()
+
+        self._in_flight = 0
+        self._stats = {"completed": 0, "failed": 0, "timeouts": 0, "rejected": 0, "recycles": 0}
+        self._latencies = deque(maxlen=200)   # total seconds per render (wait + render)
+        self._waits = deque(maxlen=200)       # seconds spent waiting for a free worker
+
+    # --- PUBLIC API ---
+    def render(self, html_content, stylesheet=None):
+        """Renders HTML to PDF bytes. Raises HTTPException 503 when full, 504 on timeout."""
+        with self._lock:
+            if self._in_flight >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise HTTPException(status_code=503, detail="PDF renderer is busy, try again shortly")
+            self._in_flight += 1
+
+        start = time.perf_counter()
+        try:
+            if self.workers <= 0:
+                # WeasyPrint isn't thread-safe; inline renders go one at a time
+                with self._inline_lock:
+                    pdf, render_seconds = self.render_fn(html_content, stylesheet)
+            else:
+                pdf, render_seconds = self._render_in_pool(html_content, stylesheet)
+        except HTTPException:
+            raise
+        except Exception:
+            with self._lock:
+                self._stats["failed"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        total = time.perf_counter() - start
+        with self._lock:
+            self._stats["completed"] += 1
+            self._latencies.append(total)
+            self._waits.append(max(total - render_seconds, 0))
+        return pdf
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "in_flight": self._in_flight,
+                "queued": max(self._in_flight - max(self.workers, 1), 0),
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout,
+                "max_tasks_per_child": self.max_tasks_per_child,
+                **self._stats,
+                "latency_seconds": describe(self._latencies),
+                "queue_wait_seconds": describe(self._waits),
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # --- INTERNALS ---
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is not None and self._executor_renders >= self.workers * self.max_tasks_per_child:
+                self._retire(self._executor)
+                self._executor = None
+                self._stats["recycles"] += 1
+            if self._executor is None:
+                # spawn, not fork: the API process has threads and open DB connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._executor_renders = 0
+            self._executor_renders += 1
+            return self._executor
+
+    def _retire(self, executor, kill=False):
+        """
+        Stops an executor. Normally it finishes the jobs it already has;
+        kill=True (a render is stuck) terminates its processes and cancels the rest.
+        """
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=kill)
+        if kill:
+            for process in processes:
+                process.terminate()
+
+    def _render_in_pool(self, html_content, stylesheet=None):
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                future = executor.submit(self.render_fn, html_content, stylesheet)
+            except (BrokenProcessPool, RuntimeError):
+                # Executor already shut down / broken: start a new one and retry
+                self._discard(executor, kill=False)
+                continue
+
+            try:
+                return self._wait(future)
+            except FutureTimeout:
+                future.cancel()
+                self._discard(executor, kill=True)
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                logger.error(f"⏱️ PDF render exceeded {self.timeout:.0f}s; worker pool recycled")
+                raise HTTPException(status_code=504, detail="PDF rendering timed out")
+            except (BrokenProcessPool, CancelledError):
+                # A worker died (e.g. OOM-killed) or another job's timeout killed this pool
+                self._discard(executor, kill=False)
+                if attempt:
+                    raise
+        raise HTTPException(status_code=503, detail="PDF renderer unavailable")
+
+    def _wait(self, future):
+        """Waits for a render; the timeout counts from when a worker picks it up, not from queueing."""
+        started = None
+        while True:
+            remaining = 0.1 if started is None else started + self.timeout - time.monotonic()
+            try:
+                return future.result(timeout=max(remaining, 0))
+            except FutureTimeout:
+                if started is not None:
+                    raise
+                if future.running():
+                    started = time.monotonic()
+
+    def _discard(self, executor, kill):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self._stats["recycles"] += 1
+        self._retire(executor, kill=kill)
+
+
+# Process-wide pool used by download, print and email
+pool = PdfRenderPool()
+
+def render_pdf(html_content, stylesheet=None):
+    """Renders HTML to PDF through the shared pool; returns a BytesIO positioned at 0."""
+    return BytesIO(pool.render(html_content, stylesheet))
+
+def get_stats():
+    return pool.stats()
+
+def shutdown():
+    pool.shutdown()
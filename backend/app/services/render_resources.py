@@ -0,0 +1,198 @@
+# backend/app/services/render_resources.py
+
+import os
+import base64
+import hashlib
+import mimetypes
+import threading
+from jinja2 import Environment, FileSystemLoader
+
+# Shared by docket and invoice rendering: templates, CSS, fonts and images are loaded
+# once per process and reloaded only when the file on disk changes (mtime/size).
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+FONT_FILE = "Lexend-VariableFont_wght.ttf"
+
+# Fonts/images are referenced by URL, not inlined. PDFs use "asset:<name>", answered from
+# memory by url_fetcher(); browser previews use the static /api/assets route instead.
+ASSET_SCHEME = "asset:"
+ASSET_TYPES = {".ttf": "font/ttf", ".png": "image/png", ".jpg": "image/jpeg", ".svg": "image/svg+xml"}
+
+_lock = threading.Lock()
+_env = None
+_files = {}   # (name, kind) -> (stamp, value)
+_stats = {"hits": 0, "misses": 0, "bytes_read": 0, "bytes_saved": 0, "asset_fetches": 0}
+
+
+# ==========================================
+# 1. TEMPLATES
+# ==========================================
+def get_environment():
+    """One Jinja environment per process. auto_reload re-compiles a template when its file changes."""
+    global _env
+    if _env is None:
+        with _lock:
+            if _env is None:
+                _env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), auto_reload=True)
+    return _env
+
+def get_template(name):
+    return get_environment().get_template(name)
+
+
+# ==========================================
+# 2. FILES (text / bytes / base64), cached by mtime
+# ==========================================
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _load(name, kind):
+    path = os.path.join(TEMPLATE_DIR, name)
+    stamp = _stamp(path)
+    key = (name, kind)
+
+    with _lock:
+        cached = _files.get(key)
+        if cached and cached[0] == stamp:
+            _stats["hits"] += 1
+            _stats["bytes_saved"] += stamp[1] if stamp else 0
+            return cached[1]
+
+    if stamp is None:
+        value = b"" if kind == "bytes" else ""
+    else:
+        with open(path, "rb") as f:
+            data = f.read()
+        if kind == "text":
+            value = data.decode("utf-8")
+        elif kind == "bytes":
+            value = data
+        else:
+            value = base64.b64encode(data).decode("utf-8")
+
+    with _lock:
+        _files[key] = (stamp, value)
+        _stats["misses"] += 1
+        _stats["bytes_read"] += stamp[1] if stamp else 0
+    return value
+
+def get_text(name):
+    """File contents as text ("" if missing)."""
+    return _load(name, "text")
+
+def get_bytes(name):
+    """Raw file contents (b"" if missing)."""
+    return _load(name, "bytes")
+
+def get_base64(name):
+    """File contents base64-encoded, for data: URIs ("" if missing)."""
+    return _load(name, "base64")
+
+
+# ==========================================
+# 3. ASSET URLS
+# ==========================================
+def get_asset(name):
+    """
+    Bytes of a font/image a template may reference, or None. Only files directly in
+    TEMPLATE_DIR with an asset extension (never templates or paths), plus the generated
+    Lexend subsets.
+    """
+    if os.path.basename(name) != name or os.path.splitext(name)[1].lower() not in ASSET_TYPES:
+        return None
+
+    from app.services import font_subset
+    weight = font_subset.parse_instance_name(name)
+    if weight is not None:
+        return font_subset.get_instance(weight) if font_subset.is_enabled() else None
+
+    if not os.path.isfile(os.path.join(TEMPLATE_DIR, name)):
+        return None
+    return get_bytes(name)
+
+def asset_url(name, asset_base=None):
+    """
+    URL of a font/image for a template. Without asset_base it is "asset:<name>" (PDF renders);
+    with one it is "<asset_base>/<name>?v=<version>" so browsers can cache it until it changes.
+    """
+    if not asset_base:
+        return ASSET_SCHEME + name
+    return f"{asset_base.rstrip('/')}/{name}?v={version()}"
+
+def url_fetcher(url, *args, **kwargs):
+    """WeasyPrint url_fetcher: "asset:" URLs come from the in-memory cache, anything else from WeasyPrint."""
+    if url.startswith(ASSET_SCHEME):
+        name = url[len(ASSET_SCHEME):].split("?", 1)[0]
+        data = get_asset(name)
+        if data is None:
+            raise ValueError(f"Unknown template asset: {name}")
+        with _lock:
+            _stats["asset_fetches"] += 1
+        return {"string": data, "mime_type": get_mime_type(name), "redirected_url": url}
+
+    from weasyprint import default_url_fetcher
+    return default_url_fetcher(url, *args, **kwargs)
+
+def get_mime_type(name):
+    ext = os.path.splitext(name)[1].lower()
+    return ASSET_TYPES.get(ext) or mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+# ==========================================
+# 4. STYLESHEETS
+# ==========================================
+def get_font_face_css(asset_base=None):
+    """Static subsets per weight used by the templates when available, else the variable font."""
+    from app.services import font_subset
+    subset_css = font_subset.get_font_face_css(asset_base)
+    if subset_css:
+        return subset_css
+
+    return f"""
+    @font-face {{
+        font-family: 'Lexend';
+        src: url({asset_url(FONT_FILE, asset_base)}) format('truetype');
+        font-weight: 100 900;
+        font-style: normal;
+    }}
+    """
+
+def get_css(name, asset_base=None):
+    """Template stylesheet with the Lexend @font-face prepended ("" if the stylesheet is missing)."""
+    css = get_text(name)
+    return get_font_face_css(asset_base) + css if css else ""
+
+
+# ==========================================
+# 5. VERSION
+# ==========================================
+def version():
+    """Changes whenever any template, stylesheet, font or image in TEMPLATE_DIR is edited."""
+    stamps = sorted(
+        (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+        for entry in os.scandir(TEMPLATE_DIR) if entry.is_file()
+    )
+    return hashlib.sha1(repr(stamps).encode()).hexdigest()[:12]
+
+
+# ==========================================
+# 6. STATS
+# ==========================================
+def stats():
+    with _lock:
+        return {**_stats, "cached_files": len(_files)}
+
+def clear():
+    """Drops every cached file and the compiled templates (next render reloads from disk)."""
+    global _env
+    from app.services import font_subset
+    font_subset.clear()
+    with _lock:
+        _files.clear()
+        _env = None
+        for key in _stats:
+            _stats[key] = 0
@@ -0,0 +1,237 @@
+# backend/app/utilities/backup_catalog.py
+
+import os
+import re
+import json
+import fcntl
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from app.utilities.backup_manager import (
+    BACKUP_ROOT, BACKUP_EXTENSIONS, detect_format, get_backup_size, file_digest, backup_timestamp
+)
+
+logger = logging.getLogger(__name__)
+
+# --- CONFIGURATION ---
+# One manifest describes every backup, so listing/retention never walk /backups
+CATALOG_FILE = os.path.join(BACKUP_ROOT, "catalog.json")
+ALEMBIC_VERSIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic", "versions"
+)
+
+# Folders under BACKUP_ROOT that hold data, not tier entries
+NON_TIER_DIRS = ("blobs", "journal")
+
+_lock = threading.Lock()
+_cache = {"stamp": None, "entries": []}
+
+
+# ==========================================
+# 1. SCHEMA REVISION
+# ==========================================
+def get_schema_revision():
+    """Head revision of alembic/versions (the one no other migration points back to)."""
+    if not os.path.isdir(ALEMBIC_VERSIONS_DIR):
+        return None
+
+    revisions, parents = set(), set()
+    for filename in os.listdir(ALEMBIC_VERSIONS_DIR):
+        if not filename.endswith(".py"):
+            continue
+        with open(os.path.join(ALEMBIC_VERSIONS_DIR, filename)) as f:
+            source = f.read()
+        rev = re.search(r"^revision[^=]*=\s*['\"]([^'\"]+)['\"]", source, re.M)
+        down = re.search(r"^down_revision[^=]*=\s*['\"]([^'\"]+)['\"]", source, re.M)
+        if rev:
+            revisions.add(rev.group(1))
+        if down:
+            parents.add(down.group(1))
+
+    heads = sorted(revisions - parents)
+    return ",".join(heads) if heads else None
+
+
+# ==========================================
+# 2. STORAGE (locked JSON manifest)
+# ==========================================
+@contextmanager
+def _locked():
+    """Thread + process lock (manage_db runs in its own process)."""
+    with _lock:
+        os.makedirs(os.path.dirname(CATALOG_FILE), exist_ok=True)
+        with open(CATALOG_FILE + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _read():
+    try:
+        st = os.stat(CATALOG_FILE)
+    except FileNotFoundError:
+        return None
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    if _cache["stamp"] != stamp:
+        with open(CATALOG_FILE) as f:
+            _cache["entries"] = json.load(f).get("entries", [])
+        _cache["stamp"] = stamp
+    return list(_cache["entries"])
+
+def _load_or_rebuild():
+    """Catalog entries; seeded from a disk scan when there is no catalog yet. Call under _locked()."""
+    entries = _read()
+    if entries is None:
+        entries = _scan()
+        _write(entries)
+        logger.info(f"📒 Backup catalog built from disk ({len(entries)} entries)")
+    return entries
+
+def _write(entries):
+    temp_path = CATALOG_FILE + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump({"entries": entries}, f, indent=1)
+    os.replace(temp_path, CATALOG_FILE)
+
+def _relative(path):
+    return os.path.relpath(path, BACKUP_ROOT)
+
+def tier_of(path):
+    """daily / weekly / monthly / on_update ... from the folder the backup sits in."""
+    return _relative(path).split(os.sep)[0]
+
+
+# ==========================================
+# 3. PUBLIC API
+# ==========================================
+def group_of(path):
+    """Table group of an on-update group dump (update_backup_<group>_<timestamp>.sql), else None."""
+    stem = os.path.basename(path.rstrip("/")).split(".")[0]
+    if not stem.startswith("update_backup_"):
+        return None
+
+    from app.utilities.reset_tables import TABLE_GROUPS
+    for group in TABLE_GROUPS:
+        if stem.startswith(f"update_backup_{group}_"):
+            return group
+    return None
+
+def make_entry(path, sha256=None, duration=None, taken_at=None, group=None):
+    return {
+        "path": _relative(path),
+        "tier": tier_of(path),
+        "timestamp": (taken_at or backup_timestamp(path)).isoformat(timespec="seconds"),
+        "size": get_backup_size(path),
+        "sha256": sha256,
+        "format": detect_format(path),
+        "duration": round(duration, 3) if duration is not None else None,
+        "schema_revision": get_schema_revision(),
+        "group": group, # None = whole database
+    }
+
+def add_entry(entry):
+    with _locked():
+        # First write on an existing install: keep the backups already on disk in the catalog
+        entries = [e for e in _load_or_rebuild() if e["path"] != entry["path"]]
+        entries.append(entry)
+        _write(entries)
+    return entry
+
+def add_link(source_path, target_path):
+    """Catalogs a tier link of an existing backup (same data, checksum and revision)."""
+    source = get_entry(source_path)
+    entry = dict(source) if source else make_entry(target_path)
+    entry["path"] = _relative(target_path)
+    entry["tier"] = tier_of(target_path)
+    return add_entry(entry)
+
+def remove_entry(path):
+    rel = _relative(path)
+    with _locked():
+        _write([e for e in _load_or_rebuild() if e["path"] != rel])
+
+def get_entry(path):
+    rel = _relative(path)
+    return next((e for e in list_entries() if e["path"] == rel), None)
+
+def list_entries(tier=None):
+    """Catalog entries, newest first. Builds the catalog from disk the first time."""
+    entries = _read()
+    if entries is None:
+        with _locked():
+            entries = _load_or_rebuild()
+    if tier:
+        entries = [e for e in entries if e["tier"] == tier]
+    return sorted(entries, key=lambda e: e["timestamp"], reverse=True)
+
+def full_path(entry):
+    return os.path.join(BACKUP_ROOT, entry["path"])
+
+def rebuild():
+    """Recreates the catalog by scanning BACKUP_ROOT (after manual file changes)."""
+    with _locked():
+        entries = _scan()
+        _write(entries)
+    logger.info(f"📒 Backup catalog rebuilt ({len(entries)} entries)")
+    return entries
+
+def _scan():
+    """Entries for every backup under BACKUP_ROOT."""
+    found = []
+    if os.path.exists(BACKUP_ROOT):
+        for root, dirs, files in os.walk(BACKUP_ROOT):
+            if root == BACKUP_ROOT:
+                dirs[:] = [d for d in dirs if d not in NON_TIER_DIRS]
+                continue
+            for d in list(dirs):
+                if d.endswith(".dir"):
+                    found.append(os.path.join(root, d))
+                    dirs.remove(d)
+            for f in files:
+                if f.endswith(BACKUP_EXTENSIONS):
+                    found.append(os.path.join(root, f))
+
+    entries = []
+    for path in found:
+        # Checksums are filled in lazily by verify(); hashing thousands of files here would be slow
+        entry = make_entry(path, group=group_of(path))
+        entry["schema_revision"] = None
+        entries.append(entry)
+    return entries
+
+def verify(entry):
+    """
+    Re-hashes a backup and compares with the catalog.
+    Returns "ok", "missing", "mismatch" or "unverified" (no stored checksum; one is recorded now).
+    """
+    path = full_path(entry)
+    if not os.path.exists(path):
+        return "missing"
+    if os.path.isdir(path):
+        return "ok"
+
+    digest = file_digest(path)
+    if entry.get("sha256") is None:
+        entry = dict(entry, sha256=digest)
+        add_entry(entry)
+        return "unverified"
+    return "ok" if digest == entry["sha256"] else "mismatch"
+
+def summary():
+    """Per-tier counts, sizes and latest backup (for the backup status API)."""
+    tiers = {}
+    for entry in list_entries():
+        tier = tiers.setdefault(entry["tier"], {"count": 0, "bytes": 0, "latest": None})
+        tier["count"] += 1
+        tier["bytes"] += entry["size"] or 0
+        if tier["latest"] is None:
+            tier["latest"] = entry
+    return {
+        "tiers": tiers,
+        "schema_revision": get_schema_revision(),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+    }
@@ -1,9 +1,14 @@
 # backend/app/utilities/backup_manager.py
 
 import os
+import gzip
+import json
+import time
 import shutil
+import hashlib
 import subprocess
 import logging
+import threading
 from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
 
@@ -20,22 +25,397 @@ os.environ["PGPASSWORD"] = os.getenv("POSTGRES_PASSWORD", "password")
 # MATCHES DOCKER VOLUME
 BACKUP_ROOT = "/backups"
 
-def run_pg_dump(target_path):
-    """Core function to execute pg_dump for consistent logic across backup types."""
+# Content-addressed store: every distinct dump is kept once, tiers are hardlinks into it
+BLOB_ROOT = os.path.join(BACKUP_ROOT, "blobs")
+
+# Dump/restore durations are appended here so the formats can be compared
+TIMINGS_FILE = os.path.join(BACKUP_ROOT, "backup_timings.jsonl")
+
+# Scheduled backups: "plain" (.sql), "gzip" (.sql.gz), "custom" (.dump) or "directory" (.dir, dumped with -j)
+SCHEDULED_BACKUP_FORMAT = os.getenv("BACKUP_FORMAT", "custom")
+# On-update dumps stay plain SQL (group restores replay them with psql), compressed while streaming
+ON_UPDATE_BACKUP_FORMAT = os.getenv("ON_UPDATE_BACKUP_FORMAT", "gzip")
+BACKUP_JOBS = int(os.getenv("BACKUP_JOBS", "4"))
+BACKUP_COMPRESSION = int(os.getenv("BACKUP_COMPRESSION", "6"))
+
+# What happens after each commit:
+#   "journal" - append the changed rows to the change journal (full dumps only on the cron)
+#   "dump"    - run a full pg_dump through the background worker
+ON_UPDATE_BACKUP_MODE = os.getenv("ON_UPDATE_BACKUP_MODE", "journal")
+
+# Operational tables whose rows change constantly and aren't worth restoring (the print
+# queue): writes to them don't trigger backups or journal entries, and dumps keep only their schema
+UNTRACKED_TABLES = {"print_jobs"}
+
+# Format name -> (pg_dump -F flag, file extension)
+BACKUP_FORMATS = {
+    "plain": ("p", ".sql"),
+    "gzip": ("p", ".sql.gz"), # plain SQL, gzipped by us as pg_dump streams it
+    "custom": ("c", ".dump"),
+    "directory": ("d", ".dir"),
+}
+BACKUP_EXTENSIONS = tuple(ext for _, ext in BACKUP_FORMATS.values())
+
+# Resource policy for pg_dump (it competes with the API for CPU and disk):
+#   BACKUP_NICE            - CPU niceness added to pg_dump (0 = normal priority)
+#   BACKUP_IONICE_CLASS    - ionice class: 1 realtime, 2 best-effort, 3 idle ("" = don't use ionice)
+#   BACKUP_IONICE_LEVEL    - priority within the best-effort class (0 high .. 7 low)
+#   BACKUP_BANDWIDTH_LIMIT - max bytes/second written by the dump, e.g. 20M ("0" = unlimited)
+#   BACKUP_DEFER_LATENCY_MS   - wait while the p95 request latency is above this (0 = never wait)
+#   BACKUP_MAX_DEFER_SECONDS  - ... but never longer than this
+BACKUP_NICE = int(os.getenv("BACKUP_NICE", "10"))
+BACKUP_IONICE_CLASS = os.getenv("BACKUP_IONICE_CLASS", "2")
+BACKUP_IONICE_LEVEL = os.getenv("BACKUP_IONICE_LEVEL", "7")
+BACKUP_BANDWIDTH_LIMIT = os.getenv("BACKUP_BANDWIDTH_LIMIT", "0")
+BACKUP_DEFER_LATENCY_MS = float(os.getenv("BACKUP_DEFER_LATENCY_MS", "0"))
+BACKUP_MAX_DEFER_SECONDS = float(os.getenv("BACKUP_MAX_DEFER_SECONDS", "300"))
+
+# Only one pg_dump at a time (background worker, cron and manual triggers share this)
+DUMP_LOCK = threading.Lock()
+
+def parse_bytes(value):
+    """'512K' / '20M' / '1G' / '1048576' -> bytes."""
+    value = str(value).strip().upper()
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value or 0)
+
+def get_resource_policy():
+    return {
+        "nice": BACKUP_NICE,
+        "ionice_class": BACKUP_IONICE_CLASS or None,
+        "ionice_level": BACKUP_IONICE_LEVEL if BACKUP_IONICE_CLASS == "2" else None,
+        "ionice_available": shutil.which("ionice") is not None,
+        "bandwidth_limit_bytes": parse_bytes(BACKUP_BANDWIDTH_LIMIT) or None,
+        "defer_latency_ms": BACKUP_DEFER_LATENCY_MS or None,
+        "max_defer_seconds": BACKUP_MAX_DEFER_SECONDS,
+    }
+
+def get_format_extension(fmt):
+    return BACKUP_FORMATS.get(fmt, BACKUP_FORMATS["plain"])[1]
+
+def detect_format(path):
+    """Works out the dump format from the file name (old dumps are all plain .sql)."""
+    for fmt, (_, ext) in BACKUP_FORMATS.items():
+        if path.endswith(ext):
+            return fmt
+    return "plain"
+
+def get_backup_size(path):
+    """Size in bytes of a dump file, or the total of a directory-format dump."""
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, f))
+            for root, _, files in os.walk(path)
+            for f in files
+        )
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+def record_timing(action, fmt, path, seconds, success=True, **extra):
+    """
+    Appends one dump/restore timing to the timings log (JSON lines).
+    backup_metrics summarizes this log; extra keys (lag_seconds, deferred_seconds) are stored as-is.
+    """
+    size = get_backup_size(path) if success else 0
+    entry = {
+        "action": action,
+        "format": fmt,
+        "tier": os.path.basename(os.path.dirname(path.rstrip("/"))),
+        "file": os.path.basename(path.rstrip("/")),
+        "seconds": round(seconds, 3),
+        "bytes": size,
+        "bytes_per_second": round(size / seconds) if size and seconds > 0 else None,
+        "success": success,
+        "at": datetime.now().isoformat(timespec="seconds"),
+        **extra,
+    }
     try:
-        command = [
-            "pg_dump",
-            "-h", DB_HOST,
-            "-U", DB_USER,
-            "-d", DB_NAME,
-            "-f", target_path
-        ]
-        # Overwrites the file if it already exists at target_path
+        os.makedirs(os.path.dirname(TIMINGS_FILE), exist_ok=True)
+        with open(TIMINGS_FILE, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError as e:
+        logger.error(f"⚠️ Failed to record backup timing: {e}")
+
+def tables_to_groups(tables):
+    """
+    Maps touched table names onto reset_tables.TABLE_GROUPS.
+    Returns None (= dump everything) if any table is unknown or no tables were given.
+    """
+    if not tables:
+        return None
+
+    from app.utilities.reset_tables import TABLE_GROUPS
+    groups = set()
+    for table in tables:
+        group = next((g for g, members in TABLE_GROUPS.items() if any(t.name == table for t in members)), None)
+        if group is None:
+            return None
+        groups.add(group)
+    return sorted(groups)
+
+def get_group_tables(group):
+    from app.utilities.reset_tables import TABLE_GROUPS
+    return [t.name for t in TABLE_GROUPS[group]]
+
+def build_pg_dump_command(target_path, fmt="plain", tables=None):
+    """pg_dump arguments. target_path=None writes to stdout (used by the bandwidth cap)."""
+    flag, _ = BACKUP_FORMATS[fmt]
+    command = [
+        "pg_dump",
+        "-h", DB_HOST,
+        "-U", DB_USER,
+        "-d", DB_NAME,
+        "-F", flag,
+    ]
+    if target_path:
+        command += ["-f", target_path]
+    if fmt in ("custom", "directory"):
+        command += ["-Z", str(BACKUP_COMPRESSION)]
+    if fmt == "directory":
+        # Parallel dump is only supported by the directory format
+        command += ["-j", str(BACKUP_JOBS)]
+    if tables:
+        # Group dump: only these tables (and their owned sequences); restoring it replaces just them
+        for table in tables:
+            command += ["-t", f"public.{table}"]
+        command += ["--clean", "--if-exists"]
+    else:
+        for table in sorted(UNTRACKED_TABLES):
+            command += [f"--exclude-table-data=public.{table}"]
+    return command
+
+class _HashingWriter:
+    """File wrapper that hashes and counts bytes as they are written (no second read pass)."""
+
+    def __init__(self, f):
+        self.f = f
+        self.sha = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha.update(data)
+        self.size += len(data)
+        return self.f.write(data)
+
+    def flush(self):
+        self.f.flush()
+
+def run_governed(command, output_path=None, bandwidth_limit=None, compress=False):
+    """
+    Runs a backup command at the configured CPU / IO priority.
+    With output_path, the command's stdout is streamed into output_path (gzipped if compress),
+    no faster than bandwidth_limit bytes/second (the dump blocks on the full pipe meanwhile).
+    Returns (sha256, bytes written) of the file for streamed runs, else None.
+    """
+    if BACKUP_IONICE_CLASS and shutil.which("ionice"):
+        prefix = ["ionice", "-c", BACKUP_IONICE_CLASS]
+        if BACKUP_IONICE_CLASS == "2":
+            prefix += ["-n", BACKUP_IONICE_LEVEL]
+        command = prefix + command
+    # nice / ionice wrap the command (no preexec_fn: forking a threaded process with one can deadlock)
+    if BACKUP_NICE and shutil.which("nice"):
+        command = ["nice", "-n", str(BACKUP_NICE)] + command
+
+    if not output_path:
         subprocess.run(command, check=True)
-        return True
-    except subprocess.CalledProcessError as e:
+        return
+
+    chunk_size = 64 * 1024
+    start = time.monotonic()
+    with open(output_path, "wb") as out:
+        hashed = _HashingWriter(out)
+        # mtime=0 and no file name in the header: identical dumps give identical bytes (dedup)
+        sink = gzip.GzipFile(fileobj=hashed, mode="wb", compresslevel=BACKUP_COMPRESSION, mtime=0) if compress else hashed
+
+        process = subprocess.Popen(command, stdout=subprocess.PIPE)
+        try:
+            for chunk in iter(lambda: process.stdout.read(chunk_size), b""):
+                sink.write(chunk)
+                if bandwidth_limit:
+                    # Sleep until the average rate of bytes hitting disk is back under the cap
+                    ahead = hashed.size / bandwidth_limit - (time.monotonic() - start)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            if compress:
+                sink.close() # writes the gzip trailer through the hashing writer
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, command)
+
+        out.flush()
+        os.fsync(out.fileno())
+    return hashed.sha.hexdigest(), hashed.size
+
+def wait_for_quiet_requests():
+    """
+    Holds a backup back while the API is slow (p95 above BACKUP_DEFER_LATENCY_MS),
+    for at most BACKUP_MAX_DEFER_SECONDS. Returns the seconds waited.
+    """
+    if not BACKUP_DEFER_LATENCY_MS:
+        return 0
+
+    from app.utilities import request_metrics
+    start = time.monotonic()
+    while time.monotonic() - start < BACKUP_MAX_DEFER_SECONDS:
+        latency = request_metrics.recent_latency_ms()
+        if latency is None or latency <= BACKUP_DEFER_LATENCY_MS:
+            break
+        time.sleep(1)
+
+    waited = time.monotonic() - start
+    if waited >= 1:
+        logger.info(f"⏸️ Backup deferred {waited:.0f}s while requests were slow")
+    return waited
+
+def remove_backup(path):
+    """Removes a tier entry. Blob data is only freed by gc_blobs once nothing links to it."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+    from app.utilities import backup_catalog
+    backup_catalog.remove_entry(path)
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def link_backup(source, target):
+    """Hardlinks a backup (file, or every file of a directory dump) into another tier."""
+    if os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            dest_root = os.path.join(target, os.path.relpath(root, source))
+            os.makedirs(dest_root, exist_ok=True)
+            for f in files:
+                link_backup(os.path.join(root, f), os.path.join(dest_root, f))
+        return
+    try:
+        os.link(source, target)
+    except OSError:
+        # Different filesystem / no hardlink support: fall back to a real copy
+        shutil.copy2(source, target)
+
+def store_backup(temp_path, target_path, digest=None):
+    """
+    Moves a finished dump into the blob store (keyed by SHA-256) and links it at target_path.
+    If an identical dump is already stored, the new bytes are discarded.
+    Pass digest when it was computed while streaming, to skip re-reading the file.
+    Returns (digest, duplicate).
+    """
+    digest = digest or file_digest(temp_path)
+    ext = get_format_extension(detect_format(target_path))
+    blob_path = os.path.join(BLOB_ROOT, digest[:2], digest + ext)
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+
+    duplicate = os.path.exists(blob_path)
+    if duplicate:
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, blob_path)
+
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    link_backup(blob_path, target_path)
+    return digest, duplicate
+
+def gc_blobs():
+    """Deletes blobs no tier links to any more (link count 1 = only the store itself)."""
+    if not os.path.exists(BLOB_ROOT):
+        return
+    for root, _, files in os.walk(BLOB_ROOT):
+        for f in files:
+            blob_path = os.path.join(root, f)
+            if os.stat(blob_path).st_nlink <= 1:
+                os.remove(blob_path)
+                logger.info(f"🗑️ Freed unreferenced backup data: {f}")
+
+def backup_timestamp(path):
+    """
+    When a backup was taken, from its *_YYYY-MM-DD_HHMMSS name.
+    (mtime can't be used: a deduplicated backup shares the inode of an older blob.)
+    """
+    stem = os.path.basename(path.rstrip("/")).split(".")[0]
+    try:
+        return datetime.strptime(stem[-17:], "%Y-%m-%d_%H%M%S")
+    except ValueError:
+        return datetime.fromtimestamp(os.path.getmtime(path))
+
+def run_pg_dump(target_path, fmt="plain", group=None):
+    """
+    Core function to execute pg_dump for consistent logic across backup types.
+    pg_dump's stdout is streamed (gzipped for "gzip") into a .partial file and hashed on the way,
+    so a crashed dump never looks like a backup and nothing is written twice;
+    the finished file is renamed into the blob store. Returns the content digest (None on failure).
+    With a group, only that TABLE_GROUPS entry is dumped.
+    """
+    deferred = wait_for_quiet_requests()
+
+    start = time.monotonic()
+    started_at = datetime.now()
+    temp_path = target_path + ".partial"
+    try:
+        tables = get_group_tables(group) if group else None
+
+        with DUMP_LOCK:
+            # Directory format refuses to write into an existing directory
+            if os.path.exists(temp_path):
+                remove_backup(temp_path)
+
+            if fmt == "directory":
+                # Directory dumps write many files themselves: no streaming, no bandwidth cap,
+                # and they can't live in the blob store; tiers hardlink their files instead
+                run_governed(build_pg_dump_command(temp_path, fmt, tables))
+                if os.path.exists(target_path):
+                    remove_backup(target_path)
+                os.replace(temp_path, target_path)
+                digest, duplicate = None, False
+            else:
+                # Stream stdout straight into the (compressed) file, hashing as it is written
+                streamed_digest, _ = run_governed(
+                    build_pg_dump_command(None, fmt, tables), temp_path,
+                    bandwidth_limit=parse_bytes(BACKUP_BANDWIDTH_LIMIT), compress=(fmt == "gzip")
+                )
+                digest, duplicate = store_backup(temp_path, target_path, streamed_digest)
+
+        if duplicate:
+            logger.info(f"♻️ Identical to an existing backup, no new data written: {os.path.basename(target_path)}")
+
+        elapsed = time.monotonic() - start
+        from app.utilities import backup_catalog, backup_metrics
+        backup_catalog.add_entry(backup_catalog.make_entry(target_path, digest, elapsed, started_at, group))
+        record_timing(
+            "dump", fmt, target_path, elapsed,
+            lag_seconds=backup_metrics.mark_covered(started_at), deferred_seconds=round(deferred, 3)
+        )
+        return digest or "directory"
+    except (subprocess.CalledProcessError, OSError) as e:
         logger.error(f"❌ Backup Failed: {e}")
-        return False
+        record_timing("dump", fmt, target_path, time.monotonic() - start, success=False, deferred_seconds=round(deferred, 3))
+        if os.path.isdir(temp_path):
+            shutil.rmtree(temp_path)
+        elif os.path.exists(temp_path):
+            os.remove(temp_path)
+        return None
+
+def remove_stale_partials():
+    """Deletes .partial leftovers of dumps that were killed mid-way (never cataloged)."""
+    if not os.path.exists(BACKUP_ROOT):
+        return
+    for root, dirs, files in os.walk(BACKUP_ROOT):
+        for name in [d for d in dirs if d.endswith(".partial")]:
+            shutil.rmtree(os.path.join(root, name))
+            dirs.remove(name)
+        for name in files:
+            if name.endswith(".partial"):
+                os.remove(os.path.join(root, name))
+                logger.info(f"🗑️ Removed incomplete dump: {name}")
 
 def create_scheduled_backup():
     """Daily/Weekly/Monthly scheduled backup logic."""
@@ -43,7 +423,8 @@ def create_scheduled_backup():
     
     today = datetime.now()
     timestamp = today.strftime("%Y-%m-%d_%H%M%S")
-    filename = f"scheduled_backup_{timestamp}.sql"
+    fmt = SCHEDULED_BACKUP_FORMAT if SCHEDULED_BACKUP_FORMAT in BACKUP_FORMATS else "plain"
+    filename = f"scheduled_backup_{timestamp}{get_format_extension(fmt)}"
     
     daily_dir = os.path.join(BACKUP_ROOT, "daily")
     weekly_dir = os.path.join(BACKUP_ROOT, "weekly")
@@ -52,73 +433,105 @@ def create_scheduled_backup():
     for folder in [daily_dir, weekly_dir, monthly_dir]:
         os.makedirs(folder, exist_ok=True)
 
+    with DUMP_LOCK:
+        remove_stale_partials()
+
     target_file = os.path.join(daily_dir, filename)
 
-    if run_pg_dump(target_file):
+    # Start a fresh journal segment; this dump becomes the base it is replayed onto
+    from app.utilities import change_journal, backup_catalog
+    journal_segment = change_journal.rotate()
+
+    if run_pg_dump(target_file, fmt):
         logger.info(f"✅ Daily backup created: {filename}")
+        change_journal.record_base(target_file, journal_segment, today.isoformat(), datetime.now().isoformat())
 
         # Sunday = 6
         if today.weekday() == 6:
-            shutil.copy2(target_file, os.path.join(weekly_dir, filename))
-            logger.info(f"📅 Sunday: Copied to Weekly")
+            link_backup(target_file, os.path.join(weekly_dir, filename))
+            backup_catalog.add_link(target_file, os.path.join(weekly_dir, filename))
+            logger.info(f"📅 Sunday: Linked to Weekly")
 
         # 1st of Month
         if today.day == 1:
-            shutil.copy2(target_file, os.path.join(monthly_dir, filename))
-            logger.info(f"📅 1st of Month: Copied to Monthly")
+            link_backup(target_file, os.path.join(monthly_dir, filename))
+            backup_catalog.add_link(target_file, os.path.join(monthly_dir, filename))
+            logger.info(f"📅 1st of Month: Linked to Monthly")
 
     # CLEANUP
     cleanup_old_files(daily_dir, days=7)
     cleanup_old_files(weekly_dir, days=30)
     cleanup_old_files(monthly_dir, days=365)
+    gc_blobs()
+    change_journal.cleanup_segments()
 
-def create_on_update_backup():
-    """Triggered whenever the database is successfully updated. Keeps the last 10 copies."""
+def create_on_update_backup(tables=None):
+    """
+    Dumps the database after updates. Keeps the last 10 copies (per table group).
+    Called by the background backup worker, not directly from the commit hook.
+    When the commits only touched known TABLE_GROUPS, only those groups are dumped.
+    """
     update_dir = os.path.join(BACKUP_ROOT, "on_update")
     os.makedirs(update_dir, exist_ok=True)
-    
-    # 1. Create unique filename with timestamp
+
+    groups = tables_to_groups(tables)
     timestamp = datetime.now().strftime("%Y-%m-%d_%H%M%S")
-    filename = f"update_backup_{timestamp}.sql"
-    target_path = os.path.join(update_dir, filename)
-    
-    if run_pg_dump(target_path):
-        logger.info(f"💾 On-Update backup saved: {filename}")
 
-        # 2. Cleanup logic: Keep only the last 10 files
-        try:
-            # Get list of full paths for .sql files in the directory
-            files = [
-                os.path.join(update_dir, f) 
-                for f in os.listdir(update_dir) 
-                if f.endswith('.sql')
-            ]
-            
-            # Sort files by modification time (oldest first)
-            files.sort(key=os.path.getmtime)
-            
-            # Remove oldest files until we have 10 or fewer
-            while len(files) > 10:
-                oldest_file = files.pop(0) # Remove first item from list (the oldest)
-                os.remove(oldest_file)     # Delete file from disk
-                logger.info(f"🗑️ Deleted old update backup: {os.path.basename(oldest_file)}")
-                
-        except Exception as e:
-            logger.error(f"⚠️ Failed to cleanup old update backups: {e}")
+    success = True
+    for group in (groups or [None]):
+        # 1. Create unique filename with timestamp
+        label = f"{group}_" if group else ""
+        ext = get_format_extension(ON_UPDATE_BACKUP_FORMAT)
+        target_path = os.path.join(update_dir, f"update_backup_{label}{timestamp}{ext}")
+        success = _dump_on_update(target_path, group) and success
+    return success
+
+def _dump_on_update(target_path, group):
+    from app.utilities import backup_catalog
+    filename = os.path.basename(target_path)
+
+    def same_scope():
+        return [e for e in backup_catalog.list_entries("on_update") if e.get("group") == group]
+
+    previous = same_scope()
+
+    fmt = ON_UPDATE_BACKUP_FORMAT if ON_UPDATE_BACKUP_FORMAT in ("plain", "gzip") else "gzip"
+    digest = run_pg_dump(target_path, fmt, group=group)
+    if not digest:
+        return False
+
+    # Nothing changed since the last on-update dump of this scope: don't keep a second entry for it
+    if previous and previous[0]["sha256"] == digest:
+        remove_backup(target_path)
+        logger.info(f"♻️ No changes since {os.path.basename(previous[0]['path'])}, skipped on-update backup")
+        return True
+
+    logger.info(f"💾 On-Update backup saved: {filename}")
+
+    # 2. Cleanup logic: Keep only the last 10 (read from the catalog, newest first)
+    try:
+        for entry in same_scope()[10:]:
+            remove_backup(backup_catalog.full_path(entry)) # Drop the reference; gc_blobs frees the data
+            logger.info(f"🗑️ Deleted old update backup: {os.path.basename(entry['path'])}")
+
+        gc_blobs()
+
+    except Exception as e:
+        logger.error(f"⚠️ Failed to cleanup old update backups: {e}")
+
+    return True
 
 def cleanup_old_files(directory, days):
-    """Deletes SQL files in a directory older than a certain number of days."""
-    cutoff_time = datetime.now() - timedelta(days=days)
-    if not os.path.exists(directory): 
-        return
+    """Deletes backups in a tier folder older than a certain number of days (uses the catalog, not mtimes)."""
+    from app.utilities import backup_catalog
+
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat(timespec="seconds")
+    tier = os.path.basename(directory.rstrip("/"))
 
-    for filename in os.listdir(directory):
-        file_path = os.path.join(directory, filename)
-        if os.path.isfile(file_path) and filename.endswith(".sql"):
-            file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
-            if file_time < cutoff_time:
-                os.remove(file_path)
-                logger.info(f"🗑️ Deleted old backup: {filename}")
+    for entry in backup_catalog.list_entries(tier):
+        if entry["timestamp"] < cutoff:
+            remove_backup(backup_catalog.full_path(entry))
+            logger.info(f"🗑️ Deleted old backup: {os.path.basename(entry['path'])}")
 
 # --- SCHEDULER START ---
 def start_backup_scheduler():
@@ -0,0 +1,154 @@
+# backend/app/utilities/backup_metrics.py
+
+import os
+import json
+import threading
+from datetime import datetime
+
+from app.utilities.backup_manager import TIMINGS_FILE, ON_UPDATE_BACKUP_MODE
+from app.utilities.percentiles import percentile
+
+# --- CONFIGURATION ---
+# Only the newest runs are summarized (the timings log itself is never truncated)
+RECENT_RUNS = int(os.getenv("BACKUP_METRICS_RECENT_RUNS", "200"))
+
+# Histogram bucket upper bounds
+DURATION_BUCKETS = [0.5, 1, 2, 5, 10, 30, 60, 120, 300, 600]              # seconds
+SIZE_BUCKETS = [1 << 20, 10 << 20, 50 << 20, 100 << 20, 500 << 20, 1 << 30]  # bytes
+LAG_BUCKETS = [1, 5, 10, 30, 60, 120, 300, 900, 3600]                      # seconds
+
+_lock = threading.Lock()
+_cache = {"stamp": None, "runs": []}
+
+# Commits not yet covered by a backup (this process only)
+_commits = {"last_commit_at": None, "oldest_uncovered_at": None, "last_covered_at": None}
+
+
+# ==========================================
+# 1. COMMIT LAG
+# ==========================================
+def note_commit(covered=False):
+    """
+    Called after each data commit. covered=True when the commit is already safe
+    (written to the change journal); otherwise it waits for the next on-update dump.
+    """
+    now = datetime.now()
+    with _lock:
+        _commits["last_commit_at"] = now
+        if covered:
+            _commits["last_covered_at"] = now
+        elif _commits["oldest_uncovered_at"] is None:
+            _commits["oldest_uncovered_at"] = now
+
+def mark_covered(snapshot_at):
+    """
+    A dump that started at snapshot_at finished. Returns how long the oldest commit it
+    covers waited for a backup (None if nothing was waiting).
+    """
+    with _lock:
+        oldest = _commits["oldest_uncovered_at"]
+        if oldest is None or oldest > snapshot_at:
+            return None
+
+        _commits["last_covered_at"] = snapshot_at
+        last = _commits["last_commit_at"]
+        # Commits made while the dump ran aren't in it; they are counted from the snapshot
+        _commits["oldest_uncovered_at"] = snapshot_at if last and last > snapshot_at else None
+        return round((snapshot_at - oldest).total_seconds(), 3)
+
+def current_lag():
+    with _lock:
+        oldest = _commits["oldest_uncovered_at"]
+        return {
+            "mode": ON_UPDATE_BACKUP_MODE,
+            "last_commit_at": _iso(_commits["last_commit_at"]),
+            "last_covered_at": _iso(_commits["last_covered_at"]),
+            "oldest_uncovered_commit_at": _iso(oldest),
+            "uncovered_for_seconds": round((datetime.now() - oldest).total_seconds(), 3) if oldest else 0,
+        }
+
+def _iso(value):
+    return value.isoformat(timespec="seconds") if value else None
+
+
+# ==========================================
+# 2. RUN HISTORY (from the timings log)
+# ==========================================
+def load_runs():
+    """Newest RECENT_RUNS entries of the timings log (cached until the file changes)."""
+    try:
+        st = os.stat(TIMINGS_FILE)
+    except FileNotFoundError:
+        return []
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        if _cache["stamp"] != stamp:
+            runs = []
+            with open(TIMINGS_FILE) as f:
+                for line in f:
+                    try:
+                        runs.append(json.loads(line))
+                    except ValueError:
+                        continue # half-written line
+            _cache["runs"] = runs[-RECENT_RUNS:]
+            _cache["stamp"] = stamp
+        return list(_cache["runs"])
+
+def histogram(values, buckets):
+    """Counts per bucket, keyed by upper bound ("+Inf" for the overflow)."""
+    counts = {str(b): 0 for b in buckets}
+    counts["+Inf"] = 0
+    for value in values:
+        key = next((str(b) for b in buckets if value <= b), "+Inf")
+        counts[key] += 1
+    return counts
+
+def _summarize(runs):
+    ok = [r for r in runs if r.get("success")]
+    durations = [r["seconds"] for r in ok]
+    sizes = [r["bytes"] for r in ok if r.get("bytes")]
+    throughputs = [r["bytes"] / r["seconds"] for r in ok if r.get("bytes") and r["seconds"] > 0]
+    lags = [r["lag_seconds"] for r in ok if r.get("lag_seconds") is not None]
+    failures = [r for r in runs if not r.get("success")]
+
+    return {
+        "runs": len(runs),
+        "failures": len(failures),
+        "last_failure_at": failures[-1]["at"] if failures else None,
+        "last_run": runs[-1] if runs else None,
+        "duration_seconds": {
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "max": max(durations) if durations else None,
+            "histogram": histogram(durations, DURATION_BUCKETS),
+        },
+        "size_bytes": {
+            "last": sizes[-1] if sizes else None,
+            "avg": round(sum(sizes) / len(sizes)) if sizes else None,
+            "histogram": histogram(sizes, SIZE_BUCKETS),
+        },
+        "throughput_bytes_per_second": {
+            "avg": round(sum(throughputs) / len(throughputs)) if throughputs else None,
+            "min": round(min(throughputs)) if throughputs else None,
+        },
+        "lag_seconds": {
+            "p50": percentile(lags, 50),
+            "max": max(lags) if lags else None,
+            "histogram": histogram(lags, LAG_BUCKETS),
+        },
+    }
+
+def summary():
+    """Dump/restore metrics per action and tier over the recent runs, plus the live commit lag."""
+    groups = {}
+    for run in load_runs():
+        key = f"{run['action']}:{run.get('tier') or 'unknown'}"
+        groups.setdefault(key, []).append(run)
+
+    return {
+        "by_kind": {key: _summarize(runs) for key, runs in sorted(groups.items())},
+        "lag": current_lag(),
+        "recent_runs": RECENT_RUNS,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+    }
@@ -0,0 +1,184 @@
+# backend/app/utilities/backup_worker.py
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+
+from app.utilities import backup_manager
+
+logger = logging.getLogger(__name__)
+
+# --- CONFIGURATION ---
+# Wait for this many seconds without a new commit before dumping (merges bursts of saves)
+QUIET_PERIOD_SECONDS = float(os.getenv("BACKUP_QUIET_PERIOD_SECONDS", "5"))
+# Never hold a pending backup longer than this, even if commits keep arriving
+MAX_DELAY_SECONDS = float(os.getenv("BACKUP_MAX_DELAY_SECONDS", "60"))
+# How long /force-backup waits for the dump before returning
+FORCE_TIMEOUT_SECONDS = float(os.getenv("BACKUP_FORCE_TIMEOUT_SECONDS", "300"))
+
+
+class BackupWorker:
+    """
+    Runs on-update backups on a single background thread.
+    Commits only call notify(); the worker waits for a quiet period (or the max delay)
+    and then runs ONE dump covering every commit seen so far.
+    backup_fn receives the set of table names touched since the last run
+    (None = unknown / everything, e.g. a forced backup).
+    """
+
+    def __init__(self, backup_fn, quiet_period=QUIET_PERIOD_SECONDS, max_delay=MAX_DELAY_SECONDS):
+        self.backup_fn = backup_fn
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+
+        self._cond = threading.Condition()
+        self._thread = None
+
+        # Pending state (monotonic clock)
+        self._pending_since = None
+        self._last_commit = None
+        self._pending_commits = 0
+        self._pending_tables = set()
+        self._force = False
+
+        # Run state
+        self._running = False
+        self._runs_completed = 0
+        self._last_started_at = None
+        self._last_finished_at = None
+        self._last_success = None
+        self._last_error = None
+        self._last_commits_covered = 0
+
+    # --- PUBLIC API ---
+    def notify(self, tables=None):
+        """Called from the commit hook with the tables it wrote. Never blocks on the dump."""
+        with self._cond:
+            if tables is None:
+                self._pending_tables = None
+            elif self._pending_tables is not None:
+                self._pending_tables.update(tables)
+
+            now = time.monotonic()
+            if self._pending_since is None:
+                self._pending_since = now
+            self._last_commit = now
+            self._pending_commits += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def force(self, timeout=FORCE_TIMEOUT_SECONDS):
+        """
+        Runs a backup now and waits for it.
+        If a dump is already running, joins that one instead of queueing a second.
+        """
+        with self._cond:
+            joined = self._running
+            if not joined:
+                self._force = True
+                self._ensure_thread()
+                self._cond.notify_all()
+
+            # Wait for the in-flight run (joined) or the one we just requested to finish
+            target = self._runs_completed + 1
+            finished = self._cond.wait_for(lambda: self._runs_completed >= target, timeout=timeout)
+
+            result = self._status_locked()
+            result["joined"] = joined
+            result["completed"] = finished
+            return result
+
+    def status(self):
+        with self._cond:
+            return self._status_locked()
+
+    # --- INTERNALS ---
+    def _status_locked(self):
+        pending_for = None
+        if self._pending_since is not None:
+            pending_for = round(time.monotonic() - self._pending_since, 3)
+
+        return {
+            "running": self._running,
+            "pending": self._pending_since is not None or self._force,
+            "pending_commits": self._pending_commits,
+            "pending_tables": None if self._pending_tables is None else sorted(self._pending_tables),
+            "pending_for_seconds": pending_for,
+            "runs_completed": self._runs_completed,
+            "last_started_at": self._last_started_at,
+            "last_finished_at": self._last_finished_at,
+            "last_success": self._last_success,
+            "last_error": self._last_error,
+            "last_commits_covered": self._last_commits_covered,
+            "quiet_period_seconds": self.quiet_period,
+            "max_delay_seconds": self.max_delay,
+        }
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="backup-worker", daemon=True)
+            self._thread.start()
+
+    def _wait_for_work(self):
+        """Blocks (holding the condition) until a dump is due."""
+        while True:
+            if self._force:
+                return
+            if self._pending_since is None:
+                self._cond.wait()
+                continue
+
+            now = time.monotonic()
+            due_at = min(self._last_commit + self.quiet_period, self._pending_since + self.max_delay)
+            if now >= due_at:
+                return
+            self._cond.wait(due_at - now)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                self._wait_for_work()
+
+                # Claim everything pending; commits arriving during the dump start a new batch
+                commits_covered = self._pending_commits
+                # A forced run always takes a full dump
+                tables = None if self._force else self._pending_tables
+                self._pending_tables = set()
+                self._pending_since = None
+                self._last_commit = None
+                self._pending_commits = 0
+                self._force = False
+                self._running = True
+                self._last_started_at = datetime.now().isoformat()
+
+            success = False
+            error = None
+            try:
+                success = bool(self.backup_fn(tables))
+            except Exception as e:
+                error = str(e)
+                logger.error(f"❌ Background backup crashed: {e}")
+
+            with self._cond:
+                self._running = False
+                self._runs_completed += 1
+                self._last_finished_at = datetime.now().isoformat()
+                self._last_success = success
+                self._last_error = error
+                self._last_commits_covered = commits_covered
+                self._cond.notify_all()
+
+
+# Process-wide worker used by the commit hook and the force-backup route
+worker = BackupWorker(backup_manager.create_on_update_backup)
+
+def notify_commit(tables=None):
+    worker.notify(tables)
+
+def force_backup(timeout=FORCE_TIMEOUT_SECONDS):
+    return worker.force(timeout=timeout)
+
+def get_status():
+    return worker.status()
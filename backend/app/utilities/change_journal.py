@@ -0,0 +1,423 @@
+# backend/app/utilities/change_journal.py
+
+import os
+import gzip
+import json
+import uuid
+import logging
+import threading
+from datetime import date, datetime
+from sqlalchemy import event, inspect, select, Date, DateTime
+from sqlalchemy.orm import Session
+
+from app.utilities.backup_manager import BACKUP_ROOT, ON_UPDATE_BACKUP_MODE, UNTRACKED_TABLES
+
+logger = logging.getLogger(__name__)
+
+# --- CONFIGURATION ---
+JOURNAL_ENABLED = ON_UPDATE_BACKUP_MODE == "journal"
+JOURNAL_DIR = os.path.join(BACKUP_ROOT, "journal")
+# Start a new segment once the active one reaches this size (closed segments are gzipped)
+SEGMENT_MAX_BYTES = int(os.getenv("JOURNAL_SEGMENT_MAX_BYTES", str(4 * 1024 * 1024)))
+# fsync every commit so a crash can't lose acknowledged changes
+JOURNAL_FSYNC = os.getenv("JOURNAL_FSYNC", "true").lower() == "true"
+
+ACTIVE_SUFFIX = ".jsonl"
+CLOSED_SUFFIX = ".jsonl.gz"
+BASES_FILE = "bases.jsonl"
+
+_lock = threading.Lock()
+
+
+# ==========================================
+# 1. CAPTURE (SQLAlchemy session hooks)
+# ==========================================
+def _encode(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def _row_values(obj):
+    """Column name -> value for a mapped object, without triggering lazy loads."""
+    state = inspect(obj)
+    mapper = state.mapper
+    values = {}
+    for column in mapper.local_table.columns:
+        key = mapper.get_property_by_column(column).key
+        values[column.name] = _encode(state.dict.get(key))
+    return values
+
+def _primary_key(table, values):
+    return {c.name: values.get(c.name) for c in table.primary_key.columns}
+
+def _pending(session):
+    return session.info.setdefault("journal_steps", [])
+
+@event.listens_for(Session, "after_flush")
+def _capture_flush(session, flush_context):
+    """Records every row inserted, updated or deleted by this flush as one ordered step."""
+    if not JOURNAL_ENABLED:
+        return
+    changes = []
+
+    for obj in session.new:
+        table = inspect(obj).mapper.local_table
+        if table.name in UNTRACKED_TABLES:
+            continue
+        values = _row_values(obj)
+        changes.append({"table": table.name, "op": "insert", "pk": _primary_key(table, values), "values": values})
+
+    for obj in session.dirty:
+        if not session.is_modified(obj, include_collections=False):
+            continue
+        table = inspect(obj).mapper.local_table
+        if table.name in UNTRACKED_TABLES:
+            continue
+        values = _row_values(obj)
+        changes.append({"table": table.name, "op": "update", "pk": _primary_key(table, values), "values": values})
+
+    for obj in session.deleted:
+        table = inspect(obj).mapper.local_table
+        if table.name in UNTRACKED_TABLES:
+            continue
+        values = _row_values(obj)
+        changes.append({"table": table.name, "op": "delete", "pk": _primary_key(table, values)})
+
+    if changes:
+        _pending(session).append(changes)
+
+@event.listens_for(Session, "do_orm_execute")
+def _capture_bulk(orm_execute_state):
+    """
+    Query(...).delete() / .update() skip the flush, so look up the affected
+    primary keys with the same WHERE clause and journal them explicitly.
+    """
+    if not JOURNAL_ENABLED or not (orm_execute_state.is_delete or orm_execute_state.is_update):
+        return None
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.local_table.name in UNTRACKED_TABLES:
+        return None
+
+    session = orm_execute_state.session
+    statement = orm_execute_state.statement
+    table = mapper.local_table
+    pk_cols = list(table.primary_key.columns)
+
+    lookup = select(*pk_cols)
+    if statement.whereclause is not None:
+        lookup = lookup.where(statement.whereclause)
+    pks = [dict(row._mapping) for row in session.execute(lookup)]
+
+    result = orm_execute_state.invoke_statement()
+
+    if orm_execute_state.is_delete:
+        changes = [{"table": table.name, "op": "delete", "pk": pk} for pk in pks]
+    else:
+        changes = []
+        for pk in pks:
+            row = session.execute(
+                select(table).where(*[c == pk[c.name] for c in pk_cols])
+            ).first()
+            if row is not None:
+                values = {k: _encode(v) for k, v in row._mapping.items()}
+                changes.append({"table": table.name, "op": "update", "pk": pk, "values": values})
+
+    if changes:
+        _pending(session).append(changes)
+    return result
+
+@event.listens_for(Session, "after_commit")
+def _write_commit(session):
+    steps = session.info.pop("journal_steps", None)
+    if not steps:
+        return
+    from app.utilities import backup_metrics
+    try:
+        append_transaction(steps)
+        backup_metrics.note_commit(covered=True)
+    except Exception as e:
+        logger.error(f"❌ Change journal write failed: {e}")
+        backup_metrics.note_commit()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rollback(session):
+    session.info.pop("journal_steps", None)
+
+
+# ==========================================
+# 2. SEGMENTS (append-only storage)
+# ==========================================
+def _segment_path(seq, suffix):
+    return os.path.join(JOURNAL_DIR, f"segment_{seq:06d}{suffix}")
+
+def _segment_seq(filename):
+    return int(filename.split("_")[1].split(".")[0])
+
+def list_segments():
+    """Returns [(seq, path)] for all segments (closed and active), oldest first."""
+    if not os.path.exists(JOURNAL_DIR):
+        return []
+    segments = [
+        (_segment_seq(f), os.path.join(JOURNAL_DIR, f))
+        for f in os.listdir(JOURNAL_DIR)
+        if f.startswith("segment_") and (f.endswith(ACTIVE_SUFFIX) or f.endswith(CLOSED_SUFFIX))
+    ]
+    return sorted(segments)
+
+def _active_segment():
+    """Returns (seq, path) of the segment currently being appended to."""
+    segments = list_segments()
+    for seq, path in reversed(segments):
+        if path.endswith(ACTIVE_SUFFIX):
+            return seq, path
+    seq = segments[-1][0] + 1 if segments else 1
+    return seq, _segment_path(seq, ACTIVE_SUFFIX)
+
+def _close_segment(path):
+    """Compresses a finished segment in place of the plain file."""
+    if not os.path.exists(path):
+        return
+    closed = path[:-len(ACTIVE_SUFFIX)] + CLOSED_SUFFIX
+    with open(path, "rb") as src, gzip.open(closed + ".tmp", "wb") as dst:
+        dst.write(src.read())
+    os.replace(closed + ".tmp", closed)
+    os.remove(path)
+
+def append_transaction(steps):
+    """Appends one committed transaction to the active segment."""
+    with _lock:
+        # Timestamp under the lock so the journal stays in commit order (point-in-time replay relies on it)
+        record = {
+            "txid": uuid.uuid4().hex,
+            "ts": datetime.now().isoformat(),
+            "steps": steps,
+        }
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        seq, path = _active_segment()
+        with open(path, "a") as f:
+            f.write(line)
+            f.flush()
+            if JOURNAL_FSYNC:
+                os.fsync(f.fileno())
+
+        if os.path.getsize(path) >= SEGMENT_MAX_BYTES:
+            _close_segment(path)
+    return record["txid"]
+
+def rotate():
+    """
+    Closes the active segment and returns the sequence number the next one will use.
+    Called right before a base dump: every change from that segment on is replayed
+    on top of the base (replay is idempotent, so overlap with the dump is harmless).
+    """
+    with _lock:
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        seq, path = _active_segment()
+        if os.path.exists(path):
+            _close_segment(path)
+            seq += 1
+        return seq
+
+def _read_segment(path):
+    opener = gzip.open if path.endswith(CLOSED_SUFFIX) else open
+    with opener(path, "rt") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # A torn final line from a crash is not a committed transaction
+                logger.warning(f"⚠️ Skipping unreadable journal line in {os.path.basename(path)}")
+
+def read_transactions(from_segment=1, until=None, before_txid=None):
+    """
+    Yields committed transactions from the given segment onwards, in commit order.
+    Stops at the first transaction committed after `until` (datetime), or right
+    before the transaction `before_txid` when given.
+    """
+    for seq, path in list_segments():
+        if seq < from_segment:
+            continue
+        for transaction in _read_segment(path):
+            if before_txid and transaction["txid"] == before_txid:
+                return
+            if until and datetime.fromisoformat(transaction["ts"]) > until:
+                return
+            yield transaction
+
+def find_transaction(txid):
+    """Returns the journaled transaction with this id (or None)."""
+    for _, path in list_segments():
+        for transaction in _read_segment(path):
+            if transaction["txid"] == txid:
+                return transaction
+    return None
+
+def summarize(transaction):
+    """One-line description of a transaction, e.g. 'delete dockets#12, delete docket_items x3'."""
+    counts = {}
+    for step in transaction["steps"]:
+        for change in step:
+            key = (change["op"], change["table"])
+            counts.setdefault(key, []).append(change["pk"])
+
+    parts = []
+    for (op, table), pks in counts.items():
+        if len(pks) == 1:
+            pk = ",".join(str(v) for v in pks[0].values())
+            parts.append(f"{op} {table}#{pk}")
+        else:
+            parts.append(f"{op} {table} x{len(pks)}")
+    return ", ".join(parts)
+
+def recent_transactions(limit=20, table=None):
+    """Newest-first transactions (optionally only those touching `table`) for picking a restore point."""
+    found = []
+    for _, path in reversed(list_segments()):
+        segment = list(_read_segment(path))
+        for transaction in reversed(segment):
+            if table and not any(c["table"] == table for step in transaction["steps"] for c in step):
+                continue
+            found.append(transaction)
+            if len(found) >= limit:
+                return found
+    return found
+
+
+# ==========================================
+# 3. BASES (full dumps the journal applies to)
+# ==========================================
+def record_base(backup_path, segment, started_at, finished_at=None):
+    entry = {
+        "backup": backup_path,
+        "segment": segment,
+        "started_at": started_at,
+        "finished_at": finished_at or started_at,
+    }
+    with _lock:
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        with open(os.path.join(JOURNAL_DIR, BASES_FILE), "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+def list_bases():
+    """Base dumps that still exist on disk, oldest first."""
+    path = os.path.join(JOURNAL_DIR, BASES_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        bases = [json.loads(line) for line in f if line.strip()]
+    return [b for b in bases if os.path.exists(b["backup"])]
+
+def latest_base():
+    bases = list_bases()
+    return bases[-1] if bases else None
+
+def base_for(point_in_time):
+    """
+    Newest base whose dump had finished by `point_in_time`.
+    (The dump's snapshot may include anything up to its finish, so a later base
+    could already contain changes we are trying to roll back.)
+    """
+    candidates = [
+        b for b in list_bases()
+        if datetime.fromisoformat(b.get("finished_at", b["started_at"])) <= point_in_time
+    ]
+    return candidates[-1] if candidates else None
+
+def cleanup_segments():
+    """Deletes segments that no remaining base dump needs."""
+    bases = list_bases()
+    if not bases:
+        return
+    oldest_needed = min(b["segment"] for b in bases)
+    for seq, path in list_segments():
+        if seq < oldest_needed and path.endswith(CLOSED_SUFFIX):
+            os.remove(path)
+            logger.info(f"🗑️ Deleted old journal segment: {os.path.basename(path)}")
+
+
+# ==========================================
+# 4. REPLAY
+# ==========================================
+def _decode(column, value):
+    if value is None:
+        return None
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column.type, Date):
+        return date.fromisoformat(value)
+    return value
+
+def _upsert(conn, table, values):
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    row = {c.name: _decode(c, values.get(c.name)) for c in table.columns if c.name in values}
+    pk_names = [c.name for c in table.primary_key.columns]
+    stmt = insert(table).values(**row)
+    updates = {k: stmt.excluded[k] for k in row if k not in pk_names}
+    if updates:
+        stmt = stmt.on_conflict_do_update(index_elements=pk_names, set_=updates)
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=pk_names)
+    conn.execute(stmt)
+
+def _delete(conn, table, pk):
+    conn.execute(table.delete().where(*[c == pk[c.name] for c in table.primary_key.columns]))
+
+def apply_transaction(conn, transaction, metadata):
+    order = {t.name: i for i, t in enumerate(metadata.sorted_tables)}
+
+    for step in transaction["steps"]:
+        # Within a flush: children deleted before parents, parents written before children
+        deletes = sorted((c for c in step if c["op"] == "delete"), key=lambda c: -order.get(c["table"], 0))
+        writes = sorted((c for c in step if c["op"] != "delete"), key=lambda c: order.get(c["table"], 0))
+
+        for change in deletes + writes:
+            table = metadata.tables.get(change["table"])
+            if table is None:
+                continue
+            if change["op"] == "delete":
+                _delete(conn, table, change["pk"])
+            else:
+                _upsert(conn, table, change["values"])
+
+def _reset_sequences(conn, metadata):
+    """After replaying explicit ids, move Postgres sequences past the highest id."""
+    if conn.dialect.name != "postgresql":
+        return
+    from sqlalchemy import text
+    for table in metadata.sorted_tables:
+        if "id" in table.columns:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+            ))
+
+def replay(engine, from_segment=1, metadata=None, until=None, before_txid=None, schema=None):
+    """
+    Streams journaled transactions from `from_segment` into the database.
+    `until` / `before_txid` stop the replay at a point in time (see read_transactions).
+    `schema` replays into another schema with the same tables (e.g. a scratch copy).
+    """
+    if metadata is None:
+        from app.utilities.reset_tables import Base
+        metadata = Base.metadata
+
+    count = 0
+    with engine.begin() as conn:
+        if schema:
+            conn = conn.execution_options(schema_translate_map={None: schema})
+        for transaction in read_transactions(from_segment, until=until, before_txid=before_txid):
+            apply_transaction(conn, transaction, metadata)
+            count += 1
+        if not schema:
+            _reset_sequences(conn, metadata)
+    return count
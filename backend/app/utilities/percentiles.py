@@ -0,0 +1,20 @@
+# backend/app/utilities/percentiles.py
+
+# Latency/duration summaries shared by the request, backup, render and pre-render metrics.
+
+def percentile(values, pct, digits=None):
+    """Nearest-rank percentile (pct 0-100) of values, None if there are none; rounded when digits is given."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    value = ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+    return value if digits is None else round(value, digits)
+
+def describe(values, pcts=(50, 95), digits=3, suffix=""):
+    """{"count", "p50", "p95", ..., "max"} of values (keys end in suffix, e.g. "_ms"); None figures when empty."""
+    ordered = sorted(values)
+    result = {"count": len(ordered)}
+    for pct in pcts:
+        result[f"p{pct}{suffix}"] = percentile(ordered, pct, digits)
+    result[f"max{suffix}"] = round(ordered[-1], digits) if ordered else None
+    return result
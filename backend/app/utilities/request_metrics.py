@@ -0,0 +1,58 @@
+# backend/app/utilities/request_metrics.py
+
+import os
+import time
+import threading
+from collections import deque
+
+from app.utilities.percentiles import percentile, describe
+
+# --- CONFIGURATION ---
+# How many recent requests are kept for the latency figures
+SAMPLE_LIMIT = int(os.getenv("REQUEST_METRICS_SAMPLES", "2000"))
+
+_lock = threading.Lock()
+# (monotonic time, duration ms, path, backup running)
+_samples = deque(maxlen=SAMPLE_LIMIT)
+
+
+def backup_running():
+    """True while a pg_dump holds the dump lock."""
+    from app.utilities.backup_manager import DUMP_LOCK
+    return DUMP_LOCK.locked()
+
+def record(duration_ms, path):
+    """Called by the HTTP middleware after each request."""
+    with _lock:
+        _samples.append((time.monotonic(), duration_ms, path, backup_running()))
+
+def recent_latency_ms(window_seconds=30, pct=95):
+    """p95 latency of requests in the last window (None if idle). Used to defer backups."""
+    cutoff = time.monotonic() - window_seconds
+    with _lock:
+        durations = [d for t, d, _, _ in _samples if t >= cutoff]
+    return percentile(durations, pct, digits=1)
+
+def summary():
+    """Latency split by whether a backup was running, so its impact on requests is visible."""
+    with _lock:
+        samples = list(_samples)
+
+    during = [d for _, d, _, running in samples if running]
+    idle = [d for _, d, _, running in samples if not running]
+
+    slowest = {}
+    for _, duration, path, _ in samples:
+        slowest[path] = max(slowest.get(path, 0), duration)
+
+    return {
+        "during_backup": describe(during, pcts=(50, 95, 99), digits=1, suffix="_ms"),
+        "no_backup": describe(idle, pcts=(50, 95, 99), digits=1, suffix="_ms"),
+        "recent_p95_ms": recent_latency_ms(),
+        "slowest_paths": dict(sorted(slowest.items(), key=lambda kv: kv[1], reverse=True)[:10]),
+        "backup_running": backup_running(),
+    }
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,259 @@
+# backend/benchmarks/pdf_suite.py
+"""
+Render time and peak memory of dockets and invoices across sizes.
+
+    python -m benchmarks.pdf_suite                                  # all cases, JSON to stdout
+    python -m benchmarks.pdf_suite -o results.json                  # ... and to a file
+    python -m benchmarks.pdf_suite --baseline base.json -o new.json # compare with an earlier run
+    python -m benchmarks.pdf_suite --only docket                    # dockets only (or "invoice", or "docket:20")
+    python -m benchmarks.pdf_suite --only invoice --large           # chunked vs single-document large invoices
+
+Dockets are built at both sides of every layout boundary of docket_template.html
+(layout-5 ... layout-40), invoices at growing line/transport item counts. --large adds
+invoices of up to 2000 rows, each rendered chunked ("invoice:") and as one document
+("invoice-single:"), to compare how time and memory scale. Each case runs
+in its own process so peak RSS belongs to that case alone. render_*_html (Jinja) and
+generate_*_pdf (WeasyPrint, PDF cache cleared each time) are timed separately.
+Needs WeasyPrint installed; renders run inline (PDF_RENDER_WORKERS=0) so RSS includes them.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import subprocess
+import statistics
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Both sides of each layout-N threshold, plus one well past the last
+DOCKET_ITEMS = [1, 5, 6, 10, 11, 15, 16, 20, 21, 25, 26, 30, 31, 35, 36, 40, 41, 60]
+# (line items, transport items)
+INVOICE_ITEMS = [(1, 0), (10, 2), (25, 5), (50, 10), (100, 20), (250, 20), (500, 50)]
+LARGE_INVOICE_ITEMS = [(250, 0), (500, 0), (1000, 0), (2000, 0)]
+
+METRICS = ("html_ms", "pdf_ms", "peak_rss_mb")
+
+
+# ==========================================
+# 1. ONE CASE (runs in a child process)
+# ==========================================
+def build_docket(db, items):
+    from datetime import date
+    from app.models.docketModels import Docket, DocketItem, DocketDeduction
+
+    docket = Docket(
+        scrdkt_number=f"BENCH{items:04d}", docket_date=date(2024, 1, 1), docket_type="Customer",
+        customer_name="Benchmark Customer", company_name="Benchmark Pty Ltd", include_gst=True, gst_percentage=10,
+    )
+    db.add(docket)
+    db.flush()
+    db.add_all([
+        DocketItem(docket_id=docket.id, metal=f"Copper grade {i % 7}", gross=1000 + i, tare=50, price=9.5,
+                   row_notes="mixed load" if i % 3 == 0 else None)
+        for i in range(items)
+    ])
+    db.add(DocketDeduction(docket_id=docket.id, type="pre", label="Contamination", amount=12.5))
+    db.commit()
+    return docket.id
+
+def build_invoice(db, items, transport):
+    from datetime import date
+    from app.models.invoiceModels import Invoice, InvoiceItem, TransportItem, Deduction
+
+    invoice = Invoice(
+        scrinv_number=f"BI{items:04d}T{transport:03d}", invoice_date=date(2024, 1, 1), currency="AUD",
+        bill_to_name="Benchmark Buyer", bill_from_name="Benchmark Seller", show_transport=transport > 0,
+    )
+    db.add(invoice)
+    db.flush()
+    db.add_all([
+        InvoiceItem(invoice_id=invoice.id, seal=f"S{i:05d}", container_number=f"CTR{i:07d}", metal="Copper",
+                    description=f"Copper cathode lot {i}", quantity=20 + i % 5, price=9500)
+        for i in range(items)
+    ])
+    db.add_all([TransportItem(invoice_id=invoice.id, name=f"Truck {i}", num_of_ctr=1, price_per_ctr=450) for i in range(transport)])
+    db.add(Deduction(invoice_id=invoice.id, type="post", label="Deposit", amount=1000))
+    db.commit()
+    return invoice.id
+
+def count_pages(pdf):
+    from io import BytesIO
+    from pypdf import PdfReader
+    try:
+        return len(PdfReader(BytesIO(pdf)).pages)
+    except Exception:
+        return None
+
+def run_case(case, iterations):
+    """Times one case in this process and returns its result dict."""
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    from app.models import docketModels, invoiceModels, settingsModels  # registers the tables on Base
+    from app.services import pdf_cache, render_resources
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    kind, sizes = case.split(":")
+    if kind == "docket":
+        from app.services.docket import docket_pdf
+        rows = int(sizes)
+        record_id = build_docket(db, rows)
+        render_html = lambda: docket_pdf.render_docket_html(db, record_id)
+        generate = lambda: docket_pdf.generate_docket_pdf(db, record_id)
+    else:
+        from app.services.invoice import invoice_pdf
+        if kind == "invoice-single":
+            invoice_pdf.LARGE_INVOICE_ROWS = 0  # never chunk
+        items, transport = (int(n) for n in sizes.split("+"))
+        rows = items + transport
+        record_id = build_invoice(db, items, transport)
+        render_html = lambda: invoice_pdf.render_invoice_html(db, record_id)
+        generate = lambda: invoice_pdf.generate_invoice_pdf(db, record_id)
+
+    # Warm-up: fills the template/asset/stylesheet caches, as in a running server
+    html = render_html()
+    generate()
+
+    html_times, pdf_times = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render_html()
+        html_times.append((time.perf_counter() - start) * 1000)
+
+        pdf_cache.clear()
+        start = time.perf_counter()
+        pdf = generate().getvalue()
+        pdf_times.append((time.perf_counter() - start) * 1000)
+
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+    return {
+        "case": case,
+        "html_ms": round(statistics.median(html_times), 3),
+        "html_ms_min": round(min(html_times), 3),
+        "pdf_ms": round(statistics.median(pdf_times), 3),
+        "pdf_ms_min": round(min(pdf_times), 3),
+        "peak_rss_mb": round(peak_mb, 1),
+        "html_bytes": len(html),
+        "pdf_bytes": len(pdf),
+        "pages": count_pages(pdf),
+        "rows": rows,
+        "pdf_ms_per_row": round(statistics.median(pdf_times) / max(rows, 1), 3),
+        "iterations": iterations,
+        "template_version": render_resources.version(),
+    }
+
+
+# ==========================================
+# 2. SUITE (parent process)
+# ==========================================
+def all_cases(large=False):
+    cases = [f"docket:{n}" for n in DOCKET_ITEMS] + [f"invoice:{i}+{t}" for i, t in INVOICE_ITEMS]
+    if large:
+        for kind in ("invoice", "invoice-single"):
+            cases += [f"{kind}:{i}+{t}" for i, t in LARGE_INVOICE_ITEMS]
+    return cases
+
+def run_in_subprocess(case, iterations):
+    env = {**os.environ, "PDF_RENDER_WORKERS": "0", "DATABASE_URL": os.environ.get("DATABASE_URL", "sqlite://")}
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.pdf_suite", "--case", case, "-n", str(iterations)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        lines = [line for line in proc.stderr.strip().splitlines() if line and not line.startswith(("(Background", " "))]
+        return {"case": case, "error": (lines or ["failed"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(results, baseline, threshold):
+    """Adds change_pct per metric against the baseline; returns the cases that regressed beyond threshold %."""
+    previous = {r["case"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result["case"])
+        if not before or "error" in result or "error" in before:
+            continue
+        result["change_pct"] = {}
+        for metric in METRICS:
+            if before.get(metric):
+                change = (result[metric] - before[metric]) / before[metric] * 100
+                result["change_pct"][metric] = round(change, 1)
+                if change > threshold:
+                    regressions.append(f"{result['case']} {metric} {before[metric]} -> {result[metric]} (+{change:.0f}%)")
+    return regressions
+
+def print_table(results):
+    print(f"{'case':<22}{'html ms':>10}{'pdf ms':>10}{'ms/row':>8}{'rss MB':>9}{'pages':>7}{'pdf KB':>9}   vs baseline", file=sys.stderr)
+    for r in results:
+        if "error" in r:
+            print(f"{r['case']:<22}  error: {r['error']}", file=sys.stderr)
+            continue
+        change = " ".join(f"{k.split('_')[0]} {v:+.0f}%" for k, v in r.get("change_pct", {}).items())
+        print(f"{r['case']:<22}{r['html_ms']:>10.2f}{r['pdf_ms']:>10.1f}{r['pdf_ms_per_row']:>8.2f}{r['peak_rss_mb']:>9.1f}{r['pages'] or '-':>7}"
+              f"{r['pdf_bytes'] / 1024:>9.1f}   {change}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--iterations", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write the JSON report here too")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="regression threshold in %% (default 10)")
+    parser.add_argument("--only", help="run cases starting with this (e.g. docket, invoice, docket:20)")
+    parser.add_argument("--large", action="store_true", help="add large invoices, chunked and single-document")
+    parser.add_argument("--case", help=argparse.SUPPRESS)  # internal: run one case in this process
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case, args.iterations)))
+        return
+
+    cases = [c for c in dict.fromkeys(all_cases(args.large)) if not args.only or c.startswith(args.only)]
+    results = []
+    for case in cases:
+        print(f"… {case}", file=sys.stderr)
+        results.append(run_in_subprocess(case, args.iterations))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "results": results,
+        "regressions": regressions,
+    }
+    print_table(results)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
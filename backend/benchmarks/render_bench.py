@@ -0,0 +1,253 @@
+# backend/benchmarks/render_bench.py
+"""
+Measures what the shared render_resources cache saves per docket/invoice render.
+
+    python -m benchmarks.render_bench            # resource loading only (template, CSS, font, images)
+    python -m benchmarks.render_bench --html     # full render_docket_html / render_invoice_html (needs WeasyPrint installed)
+    python -m benchmarks.render_bench --assets   # inline base64 assets vs asset: URLs: HTML size, parse and render time
+    python -m benchmarks.render_bench --fonts    # variable Lexend vs static subsets: font/PDF/attachment size, render and spool time
+    python -m benchmarks.render_bench --stylesheets  # <style> reparsed per render vs pre-parsed CSS + shared FontConfiguration
+
+"uncached" reproduces the old per-request behaviour (new Jinja Environment, every file re-read
+and re-encoded); "cached" is the shared per-process cache.
+"""
+
+import os
+import sys
+import re
+import time
+import base64
+import argparse
+import tempfile
+from jinja2 import Environment, FileSystemLoader
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from app.services import render_resources
+
+DOCKET_FILES = ("docket_template.html", "docket_template_styles.css", ["Recycling_Icon.png", "safari_copper_recycling_logo.png"])
+INVOICE_FILES = ("invoice_template.html", "invoice_template_styles.css", ["invoice_header_logo.png", "invoice_footer_logo.png"])
+
+
+def load_uncached(template_name, css_name, images):
+    """What every render used to do."""
+    template_dir = render_resources.TEMPLATE_DIR
+    env = Environment(loader=FileSystemLoader(template_dir))
+    template = env.get_template(template_name)
+    with open(os.path.join(template_dir, render_resources.FONT_FILE), "rb") as f:
+        font_b64 = base64.b64encode(f.read()).decode("utf-8")
+    with open(os.path.join(template_dir, css_name)) as f:
+        css = font_b64 + f.read()
+    logos = []
+    for image in images:
+        with open(os.path.join(template_dir, image), "rb") as f:
+            logos.append(base64.b64encode(f.read()).decode("utf-8"))
+    return template, css, logos
+
+def load_cached(template_name, css_name, images):
+    template = render_resources.get_template(template_name)
+    css = render_resources.get_css(css_name)
+    logos = [render_resources.get_base64(image) for image in images]
+    return template, css, logos
+
+def time_it(fn, iterations):
+    fn() # warm-up (fills the cache for the cached run)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+def bench_resources(iterations):
+    for label, files in (("docket", DOCKET_FILES), ("invoice", INVOICE_FILES)):
+        uncached = time_it(lambda: load_uncached(*files), iterations)
+        cached = time_it(lambda: load_cached(*files), iterations)
+        report(f"{label} resources", uncached, cached)
+
+def make_records(items=20):
+    """In-memory docket and invoice with `items` items each; returns (db, docket id, invoice id)."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from datetime import date
+    from app.database import Base
+    from app.models.docketModels import Docket, DocketItem
+    from app.models.invoiceModels import Invoice, InvoiceItem
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    docket = Docket(docket_date=date.today(), docket_type="Customer")
+    invoice = Invoice(scrinv_number="BENCH", invoice_date=date.today(), currency="AUD")
+    db.add_all([docket, invoice])
+    db.flush()
+    db.add_all([DocketItem(docket_id=docket.id, metal="Copper", gross=100, tare=10, price=9) for _ in range(items)])
+    db.add_all([InvoiceItem(invoice_id=invoice.id, description="Copper", quantity=10, price=9) for _ in range(items)])
+    db.commit()
+    return db, docket.id, invoice.id
+
+def bench_html(iterations):
+    from app.services.docket import docket_pdf
+    from app.services.invoice import invoice_pdf
+
+    db, docket_id, invoice_id = make_records()
+    for label, render in (("docket", lambda: docket_pdf.render_docket_html(db, docket_id)),
+                          ("invoice", lambda: invoice_pdf.render_invoice_html(db, invoice_id))):
+        def uncached():
+            render_resources.clear()
+            render()
+        report(f"{label} html", time_it(uncached, iterations), time_it(render, iterations))
+
+def inline_assets(html):
+    """The old payload: every asset: URL replaced by a base64 data: URI."""
+    return re.sub(
+        r"asset:([\w.-]+)",
+        lambda m: f"data:{render_resources.get_mime_type(m.group(1))};base64,{render_resources.get_base64(m.group(1))}",
+        html,
+    )
+
+def bench_assets(iterations):
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError):
+        print("(WeasyPrint not available)")
+        return
+    from app.services.docket import docket_pdf
+    from app.services.invoice import invoice_pdf
+
+    db, docket_id, invoice_id = make_records()
+    for label, html in (("docket", docket_pdf.render_docket_html(db, docket_id)),
+                        ("invoice", invoice_pdf.render_invoice_html(db, invoice_id))):
+        inline = inline_assets(html)
+        print(f"{label:<8} html size     inline {len(inline) / 1024:9.1f} KB   by URL {len(html) / 1024:9.1f} KB")
+        runs = max(iterations // 20, 3)
+        parse_inline = time_it(lambda: HTML(string=inline).render(), runs)
+        parse_url = time_it(lambda: HTML(string=html, url_fetcher=render_resources.url_fetcher).render(), runs)
+        report(f"{label} parse+layout", parse_inline, parse_url, ("inline", "by URL"))
+        pdf_inline = time_it(lambda: HTML(string=inline).write_pdf(), runs)
+        pdf_url = time_it(lambda: HTML(string=html, url_fetcher=render_resources.url_fetcher).write_pdf(), runs)
+        report(f"{label} write_pdf", pdf_inline, pdf_url, ("inline", "by URL"))
+
+def bench_fonts(iterations):
+    from email.mime.application import MIMEApplication
+    from app.services import font_subset
+
+    variable = len(render_resources.get_bytes(render_resources.FONT_FILE))
+    start = time.perf_counter()
+    subsets = {w: len(font_subset.get_instance(w)) for w in font_subset.get_weights()}
+    print(f"font bytes           variable {variable / 1024:8.1f} KB   subsets {sum(subsets.values()) / 1024:8.1f} KB "
+          f"({', '.join(f'{w}: {size / 1024:.0f} KB' for w, size in subsets.items())}; first build {time.perf_counter() - start:.2f}s)")
+
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError):
+        print("(WeasyPrint not available: reporting font size only)")
+        return
+    from app.services.docket import docket_pdf
+    from app.services.invoice import invoice_pdf
+
+    def render(html):
+        return HTML(string=html, url_fetcher=render_resources.url_fetcher).write_pdf()
+
+    def spool(pdf):
+        # What docket_printer does: write the PDF into the spool directory and fsync
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as f:
+            f.write(pdf)
+            f.flush()
+            os.fsync(f.fileno())
+
+    db, docket_id, invoice_id = make_records()
+    runs = max(iterations // 20, 3)
+    for label, render_html in (("docket", lambda: docket_pdf.render_docket_html(db, docket_id)),
+                               ("invoice", lambda: invoice_pdf.render_invoice_html(db, invoice_id))):
+        results = {}
+        for mode, enabled in (("variable", False), ("subset", True)):
+            font_subset.FONT_SUBSET = enabled
+            html = render_html()
+            pdf = render(html)
+            attachment = MIMEApplication(pdf, _subtype="pdf").as_bytes()
+            results[mode] = (len(pdf), len(attachment), time_it(lambda: render(html), runs), time_it(lambda: spool(pdf), runs))
+        font_subset.FONT_SUBSET = True
+
+        (pdf_v, mail_v, render_v, spool_v), (pdf_s, mail_s, render_s, spool_s) = results["variable"], results["subset"]
+        print(f"{label:<8} pdf size      variable {pdf_v / 1024:8.1f} KB   subset {pdf_s / 1024:8.1f} KB")
+        print(f"{label:<8} attachment    variable {mail_v / 1024:8.1f} KB   subset {mail_s / 1024:8.1f} KB")
+        report(f"{label} write_pdf", render_v, render_s, ("variable", "subset"))
+        report(f"{label} spool write", spool_v, spool_s, ("variable", "subset"))
+
+def bench_stylesheets(iterations):
+    """
+    WeasyPrint time only: the HTML is rendered by Jinja once up front, so template/asset
+    caching doesn't enter the numbers. Also checks every docket layout-N class paginates the same.
+    """
+    try:
+        from weasyprint import HTML, CSS
+        from weasyprint.text.fonts import FontConfiguration
+    except (ImportError, OSError):
+        print("(WeasyPrint not available)")
+        return
+    from app.services import pdf_render_pool
+    from app.services.docket import docket_pdf
+    from app.services.invoice import invoice_pdf
+
+    fetcher = render_resources.url_fetcher
+    runs = max(iterations // 20, 3)
+
+    def inline(html):
+        return HTML(string=html, url_fetcher=fetcher).write_pdf()
+
+    def parsed_per_render(html, stylesheet):
+        font_config = FontConfiguration()
+        css = CSS(string=render_resources.get_css(stylesheet), font_config=font_config, url_fetcher=fetcher)
+        return HTML(string=html, url_fetcher=fetcher).write_pdf(stylesheets=[css], font_config=font_config)
+
+    def pre_parsed(html, stylesheet):
+        return pdf_render_pool._render(html, stylesheet)[0]
+
+    db, docket_id, invoice_id = make_records()
+    for label, module, render_html, record_id in (
+        ("docket", docket_pdf, docket_pdf.render_docket_html, docket_id),
+        ("invoice", invoice_pdf, invoice_pdf.render_invoice_html, invoice_id),
+    ):
+        with_style = render_html(db, record_id)
+        without_style = render_html(db, record_id, inline_css=False)
+        base = time_it(lambda: inline(with_style), runs)
+        report(f"{label} css per render", base, time_it(lambda: parsed_per_render(without_style, module.STYLESHEET), runs), ("<style>", "CSS()"))
+        report(f"{label} css pre-parsed", base, time_it(lambda: pre_parsed(without_style, module.STYLESHEET), runs), ("<style>", "cached"))
+
+    print()
+    for items in (5, 10, 15, 20, 25, 30, 35, 40):
+        db, docket_id, _ = make_records(items)
+        pages_inline = len(HTML(string=docket_pdf.render_docket_html(db, docket_id), url_fetcher=fetcher).render().pages)
+        sheet, font_config = pdf_render_pool._get_stylesheet(docket_pdf.STYLESHEET)
+        pages_parsed = len(HTML(string=docket_pdf.render_docket_html(db, docket_id, inline_css=False), url_fetcher=fetcher)
+                           .render(stylesheets=[sheet], font_config=font_config).pages)
+        status = "same" if pages_inline == pages_parsed else "DIFFERENT"
+        print(f"layout-{items:<3} pages  <style> {pages_inline}   pre-parsed {pages_parsed}   {status}")
+
+def report(label, uncached_ms, cached_ms, names=("uncached", "cached")):
+    print(f"{label:<20} {names[0]} {uncached_ms:8.2f} ms   {names[1]} {cached_ms:8.2f} ms   ({uncached_ms / cached_ms:5.1f}x)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--html", action="store_true", help="time full HTML renders instead of resource loading")
+    parser.add_argument("--assets", action="store_true", help="compare inline base64 assets with asset: URLs")
+    parser.add_argument("--fonts", action="store_true", help="compare the variable font with the static subsets")
+    parser.add_argument("--stylesheets", action="store_true", help="compare inline <style> with pre-parsed CSS objects")
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.stylesheets:
+        bench_stylesheets(args.iterations)
+    elif args.fonts:
+        bench_fonts(args.iterations)
+    elif args.assets:
+        bench_assets(args.iterations)
+    elif args.html:
+        bench_html(args.iterations)
+    else:
+        bench_resources(args.iterations)
+    stats = render_resources.stats()
+    print(f"\ncache: {stats['hits']} hits, {stats['misses']} misses, {stats['bytes_saved'] / 1024 / 1024:.1f} MB of reads avoided")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,24 @@
 # backend/manage_db.py
 import os
 import sys
+import time
 import subprocess
+from datetime import datetime
 from urllib.parse import urlparse
 from dotenv import load_dotenv
-from app.utilities import reset_tables
+from app.utilities import reset_tables, change_journal, backup_catalog
+from app.utilities.backup_manager import detect_format, record_timing
 
 load_dotenv()
 
 BACKUP_ROOT = "/backups"
 
+# Parallel jobs for pg_restore (custom / directory dumps)
+RESTORE_JOBS = int(os.getenv("RESTORE_JOBS", str(os.cpu_count() or 2)))
+
+# Point-in-time dry runs are copied into this schema of the live database
+RECOVERY_SCHEMA = "recovery"
+
 def run_command(command):
     try:
         subprocess.check_call(command, shell=True)
@@ -18,14 +27,243 @@ def run_command(command):
         sys.exit(1)
 
 def list_backups():
-    all_backups = []
-    if not os.path.exists(BACKUP_ROOT):
-        return all_backups
-    for root, dirs, files in os.walk(BACKUP_ROOT):
-        for f in files:
-            if f.endswith(".sql"):
-                all_backups.append(os.path.join(root, f))
-    return sorted(all_backups, reverse=True)
+    """Backup entries from the catalog, newest first (no filesystem walk)."""
+    return backup_catalog.list_entries()
+
+def format_size(num_bytes):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f}{unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}TB"
+
+def get_connection_params():
+    """Returns (host, port, user, name) for psql/pg_restore and sets PGPASSWORD."""
+    db_url = os.getenv("DATABASE_URL")
+    if db_url:
+        parsed = urlparse(db_url)
+        os.environ["PGPASSWORD"] = parsed.password or "password"
+        return (
+            parsed.hostname or "db",
+            parsed.port or 5432,
+            parsed.username or "user",
+            parsed.path.lstrip("/") or "weight_docket_db",
+        )
+    os.environ["PGPASSWORD"] = os.getenv("POSTGRES_PASSWORD", "password")
+    return ("db", 5432, os.getenv("POSTGRES_USER", "user"), os.getenv("POSTGRES_DB", "weight_docket_db"))
+
+def count_archive_items(target):
+    """Number of TOC entries in a custom/directory archive (used for progress)."""
+    try:
+        listing = subprocess.run(["pg_restore", "-l", target], capture_output=True, text=True, check=True).stdout
+    except (subprocess.CalledProcessError, OSError):
+        return 0
+    return sum(1 for line in listing.splitlines() if line.strip() and not line.startswith(";"))
+
+def run_pg_restore(target, host, port, user, name):
+    """Runs pg_restore -j N and prints progress from its verbose output."""
+    total = count_archive_items(target)
+    command = [
+        "pg_restore", "-h", host, "-p", str(port), "-U", user, "-d", name,
+        "-j", str(RESTORE_JOBS), "--no-owner", "-v", target
+    ]
+    print(f"Restoring {name} with {RESTORE_JOBS} parallel jobs ({total} items)...")
+
+    done = 0
+    process = subprocess.Popen(command, stderr=subprocess.PIPE, text=True)
+    for line in process.stderr:
+        # pg_restore -v reports each item as it is created / loaded / finished
+        if "creating " in line or "processing data" in line or "finished item" in line:
+            done += 1
+            if total:
+                pct = min(done * 100 // total, 99)
+                print(f"\r   Progress: {pct}% ({done}/{total})", end="", flush=True)
+        elif "error" in line.lower():
+            print(f"\n{line.rstrip()}")
+    print()
+
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+
+def restore_backup(target, database=None):
+    """Drops the public schema and restores a .sql, .dump or .dir backup into it."""
+    host, port, user, name = get_connection_params()
+    name = database or name
+    fmt = detect_format(target)
+
+    print("\nWiping existing database schema to ensure a clean restore...")
+    drop_cmd = f"psql -h {host} -p {port} -U {user} -d {name} -c \"DROP SCHEMA public CASCADE; CREATE SCHEMA public;\""
+    subprocess.run(drop_cmd, shell=True, check=True)
+
+    start = time.monotonic()
+    try:
+        if fmt == "plain":
+            print(f"Restoring {name}...")
+            cmd = f"psql -h {host} -p {port} -U {user} -d {name} -f \"{target}\""
+            subprocess.run(cmd, shell=True, check=True)
+        elif fmt == "gzip":
+            print(f"Restoring {name}...")
+            cmd = f"set -o pipefail; gunzip -c \"{target}\" | psql -h {host} -p {port} -U {user} -d {name}"
+            subprocess.run(cmd, shell=True, check=True, executable="/bin/bash")
+        else:
+            run_pg_restore(target, host, port, user, name)
+    except subprocess.CalledProcessError:
+        record_timing("restore", fmt, target, time.monotonic() - start, success=False)
+        raise
+
+    elapsed = time.monotonic() - start
+    record_timing("restore", fmt, target, elapsed)
+    print(f"Restore took {elapsed:.1f}s")
+
+def restore_group(target, group):
+    """
+    Restores only one TABLE_GROUPS entry; every other table is left alone.
+    Group dumps (on-update) drop and recreate their own tables. From a full custom/directory
+    dump, the group's tables are truncated and their rows reloaded.
+    """
+    host, port, user, name = get_connection_params()
+    fmt = detect_format(target)
+    tables = [t.name for t in reset_tables.TABLE_GROUPS[group]]
+    entry = backup_catalog.get_entry(target)
+    psql = ["psql", "-h", host, "-p", str(port), "-U", user, "-d", name, "-v", "ON_ERROR_STOP=1"]
+
+    start = time.monotonic()
+    try:
+        if entry and entry.get("group") == group:
+            print(f"Restoring {group} tables from group dump...")
+            if fmt == "gzip":
+                with subprocess.Popen(["gunzip", "-c", target], stdout=subprocess.PIPE) as gunzip:
+                    subprocess.run(psql + ["-1"], stdin=gunzip.stdout, check=True)
+                if gunzip.returncode != 0:
+                    raise subprocess.CalledProcessError(gunzip.returncode, "gunzip")
+            else:
+                subprocess.run(psql + ["-1", "-f", target], check=True)
+        elif fmt in ("plain", "gzip"):
+            print("❌ Plain SQL full dumps can't be restored per group; pick a group or custom/directory backup.")
+            return
+        else:
+            print(f"Reloading {', '.join(tables)}...")
+            subprocess.run(psql + ["-c", f"TRUNCATE {', '.join(tables)} RESTART IDENTITY"], check=True)
+            command = [
+                "pg_restore", "-h", host, "-p", str(port), "-U", user, "-d", name,
+                "--data-only", "--disable-triggers", "--no-owner", "--single-transaction"
+            ]
+            for table in tables:
+                command += ["-t", table]
+            subprocess.run(command + [target], check=True)
+
+            # Data-only restores don't move the id sequences along
+            for table in tables:
+                subprocess.run(psql + ["-q", "-c", (
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}"
+                )], check=False)
+    except subprocess.CalledProcessError:
+        record_timing("restore", fmt, target, time.monotonic() - start, success=False)
+        raise
+
+    elapsed = time.monotonic() - start
+    record_timing("restore", fmt, target, elapsed)
+    print(f"Restore of {group} took {elapsed:.1f}s")
+
+def replay_journal(from_segment, engine=None, until=None, before_txid=None):
+    """Re-applies committed changes recorded since the base backup (optionally up to a point)."""
+    if engine is None:
+        from app.database import engine
+
+    print(f"Replaying change journal from segment {from_segment}...")
+    start = time.monotonic()
+    count = change_journal.replay(engine, from_segment, until=until, before_txid=before_txid)
+    elapsed = time.monotonic() - start
+    print(f"Replayed {count} transactions in {elapsed:.1f}s")
+
+def pick_restore_point():
+    """Asks for a timestamp or a transaction. Returns (point_in_time, until, before_txid) or None."""
+    table = input("Show recent changes for which table? (e.g. dockets, blank for all): ").strip() or None
+    print("\nRecent transactions (newest first):")
+    for tx in change_journal.recent_transactions(limit=20, table=table):
+        print(f"  {tx['ts'][:19]}  {tx['txid']}  {change_journal.summarize(tx)}")
+
+    print("\n1. Restore to a timestamp")
+    print("2. Restore to just before a transaction")
+    mode = input("\nSelect restore point type: ")
+
+    if mode == '1':
+        raw = input("Timestamp (YYYY-MM-DD HH:MM[:SS]): ").strip()
+        try:
+            until = datetime.fromisoformat(raw)
+        except ValueError:
+            print("Invalid timestamp.")
+            return None
+        return until, until, None
+
+    if mode == '2':
+        txid = input("Transaction id: ").strip()
+        tx = change_journal.find_transaction(txid)
+        if not tx:
+            print("Transaction not found in the journal.")
+            return None
+        return datetime.fromisoformat(tx["ts"]), None, txid
+
+    print("Invalid choice.")
+    return None
+
+def copy_to_recovery_schema(source_engine, target_engine, tables):
+    """Copies tables from the scratch database into RECOVERY_SCHEMA of the live database."""
+    from sqlalchemy import MetaData, Table, Column, select, text
+
+    with target_engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {RECOVERY_SCHEMA}"))
+
+    metadata = MetaData()
+    for table in tables:
+        # Plain column copy: no FKs / sequences tying it to the live tables
+        target = Table(table.name, metadata, *[Column(c.name, c.type) for c in table.columns], schema=RECOVERY_SCHEMA)
+        target.drop(bind=target_engine, checkfirst=True)
+        target.create(bind=target_engine)
+
+        copied = 0
+        with source_engine.connect() as src, target_engine.begin() as dst:
+            result = src.execution_options(stream_results=True).execute(select(table))
+            for batch in result.mappings().partitions(1000):
+                dst.execute(target.insert(), [dict(row) for row in batch])
+                copied += len(batch)
+        print(f"   {RECOVERY_SCHEMA}.{table.name}: {copied} rows")
+
+def restore_point_in_time_scratch(base, until, before_txid, tables):
+    """
+    Dry run: restores base + journal into a throwaway database, then copies the chosen
+    tables into the live database's RECOVERY_SCHEMA. Live tables are not touched.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.engine import make_url
+    from app.database import engine as live_engine, DATABASE_URL
+
+    host, port, user, name = get_connection_params()
+    scratch = f"{name}_pitr_scratch"
+
+    print(f"\nCreating scratch database {scratch}...")
+    subprocess.run(
+        ["psql", "-h", host, "-p", str(port), "-U", user, "-d", name,
+         "-c", f"DROP DATABASE IF EXISTS {scratch}", "-c", f"CREATE DATABASE {scratch}"],
+        check=True
+    )
+
+    scratch_engine = create_engine(make_url(DATABASE_URL).set(database=scratch))
+    try:
+        restore_backup(base["backup"], database=scratch)
+        replay_journal(base["segment"], engine=scratch_engine, until=until, before_txid=before_txid)
+
+        print(f"\nCopying into schema '{RECOVERY_SCHEMA}'...")
+        copy_to_recovery_schema(scratch_engine, live_engine, tables)
+    finally:
+        scratch_engine.dispose()
+        subprocess.run(
+            ["psql", "-h", host, "-p", str(port), "-U", user, "-d", name, "-c", f"DROP DATABASE IF EXISTS {scratch}"],
+            check=False
+        )
+
+    print(f"\nRecovered rows are in {RECOVERY_SCHEMA}.<table>; copy what you need back, e.g.")
+    print(f"   INSERT INTO public.dockets SELECT * FROM {RECOVERY_SCHEMA}.dockets WHERE id = ...;")
 
 def main():
     print("========================================")
@@ -35,6 +273,10 @@ def main():
     print("2. Apply migration to Database")
     print("3. Reset Database (DELETE DATA)")
     print("4. Restore from Backup file")
+    print("5. Restore latest base backup + replay change journal")
+    print("6. Point-in-time restore (timestamp / before a transaction)")
+    print("7. Verify backup checksums")
+    print("8. Restore one table group (dockets / invoices / settings)")
     print("0. Exit")
     
     choice = input("\nEnter choice: ")
@@ -99,43 +341,149 @@ def main():
             return
         
         print("\nAvailable Backups:")
-        for idx, path in enumerate(backups[:15]): # Show last 15
-            print(f"{idx + 1}. {path.replace(BACKUP_ROOT, '')}")
+        for idx, entry in enumerate(backups[:15]): # Show last 15
+            scope = entry.get("group") or "all"
+            print(f"{idx + 1}. {entry['timestamp']}  {entry['tier']:<10} {scope:<9} {entry['format']:<9} {format_size(entry['size'] or 0):>7}  {entry['path']}")
             
         pick = input("\nSelect number to restore (or 0 to cancel): ")
         if pick != '0' and pick.isdigit():
             try:
-                target = backups[int(pick)-1]
+                entry = backups[int(pick)-1]
+                target = backup_catalog.full_path(entry)
+                if entry.get("group"):
+                    confirm = input(f"RESTORE {entry['group'].upper()} from {target}? Those tables will be OVERWRITTEN. (yes/no): ")
+                    if confirm.lower() == 'yes':
+                        restore_group(target, entry["group"])
+                        print("\n✅ Restore complete!")
+                    return
                 confirm = input(f"RESTORE {target}? Current data will be OVERWRITTEN. (yes/no): ")
                 if confirm.lower() == 'yes':
-                    print("\nWiping existing database schema to ensure a clean restore...")
-                    
-                    db_url = os.getenv("DATABASE_URL")
-                    if db_url:
-                        parsed = urlparse(db_url)
-                        db_user = parsed.username or "user"
-                        db_name = parsed.path.lstrip("/") or "weight_docket_db"
-                        db_host = parsed.hostname or "db"
-                        db_port = parsed.port or 5432
-                        os.environ["PGPASSWORD"] = parsed.password or "password"
-                        drop_cmd = f"psql -h {db_host} -p {db_port} -U {db_user} -d {db_name} -c \"DROP SCHEMA public CASCADE; CREATE SCHEMA public;\""
-                        cmd = f"psql -h {db_host} -p {db_port} -U {db_user} -d {db_name} -f \"{target}\""
-                    else:
-                        db_user = os.getenv("POSTGRES_USER", "user")
-                        db_name = os.getenv("POSTGRES_DB", "weight_docket_db")
-                        os.environ["PGPASSWORD"] = os.getenv("POSTGRES_PASSWORD", "password")
-                        drop_cmd = f"psql -h db -U {db_user} -d {db_name} -c \"DROP SCHEMA public CASCADE; CREATE SCHEMA public;\""
-                        cmd = f"psql -h db -U {db_user} -d {db_name} -f \"{target}\""
-                    
-                    subprocess.run(drop_cmd, shell=True, check=True)
-                    print(f"Restoring {db_name}...")
-                    subprocess.run(cmd, shell=True, check=True)
+                    restore_backup(target)
                     print("\n✅ Restore complete!")
             except IndexError:
                 print("Invalid selection.")
             except subprocess.CalledProcessError as e:
                 print(f"\n❌ Restore failed: {e}")
 
+    elif choice == '5':
+        base = change_journal.latest_base()
+        if not base:
+            print("No base backup recorded in the change journal yet (taken by the daily scheduled backup).")
+            return
+
+        print(f"\nBase backup: {base['backup'].replace(BACKUP_ROOT, '')} (taken {base['started_at']})")
+        print(f"Journal replay starts at segment {base['segment']}")
+        confirm = input("RESTORE base and replay all changes since? Current data will be OVERWRITTEN. (yes/no): ")
+        if confirm.lower() != 'yes':
+            print("Cancelled.")
+            return
+
+        try:
+            restore_backup(base["backup"])
+            replay_journal(base["segment"])
+            print("\n✅ Restore complete!")
+        except subprocess.CalledProcessError as e:
+            print(f"\n❌ Restore failed: {e}")
+
+    elif choice == '6':
+        point = pick_restore_point()
+        if not point:
+            return
+        point_in_time, until, before_txid = point
+
+        base = change_journal.base_for(point_in_time)
+        if not base:
+            print("No base backup finished before that point; cannot restore to it.")
+            return
+        print(f"\nUsing base backup: {base['backup'].replace(BACKUP_ROOT, '')} (finished {base.get('finished_at', base['started_at'])})")
+
+        print("\n1. Dry run into scratch schema (live data untouched)")
+        print("2. Full restore (DELETE current data)")
+        mode = input("\nSelect: ")
+
+        try:
+            if mode == '1':
+                group = input(f"Which tables? ({', '.join(reset_tables.TABLE_GROUPS)}, blank for all): ").strip()
+                if group and group not in reset_tables.TABLE_GROUPS:
+                    print("Invalid group.")
+                    return
+                tables = reset_tables.TABLE_GROUPS[group] if group else [
+                    t for g in reset_tables.TABLE_GROUPS.values() for t in g
+                ]
+                restore_point_in_time_scratch(base, until, before_txid, tables)
+                print("\n✅ Dry run complete!")
+
+            elif mode == '2':
+                confirm = input("RESTORE to this point? Current data will be OVERWRITTEN. (yes/no): ")
+                if confirm.lower() != 'yes':
+                    print("Cancelled.")
+                    return
+                restore_backup(base["backup"])
+                replay_journal(base["segment"], until=until, before_txid=before_txid)
+
+                # Journal entries after the restore point belong to the abandoned timeline;
+                # take a fresh base so later journal restores start from here.
+                from app.utilities.backup_manager import create_scheduled_backup
+                print("\nTaking a new base backup of the restored state...")
+                create_scheduled_backup()
+                print("\n✅ Point-in-time restore complete!")
+                print("⚠️  Older bases would replay the abandoned changes; use the new base for future restores.")
+            else:
+                print("Invalid choice.")
+        except subprocess.CalledProcessError as e:
+            print(f"\n❌ Restore failed: {e}")
+
+    elif choice == '7':
+        backups = list_backups()
+        if not backups:
+            print(f"No backups found in {BACKUP_ROOT}")
+            return
+
+        results = {}
+        for entry in backups:
+            status = backup_catalog.verify(entry)
+            results[status] = results.get(status, 0) + 1
+            if status in ("missing", "mismatch"):
+                print(f"❌ {status.upper()}: {entry['path']}")
+
+        print(f"\nChecked {len(backups)} backups: " + ", ".join(f"{v} {k}" for k, v in results.items()))
+        if results.get("unverified"):
+            print("(Unverified backups had no stored checksum; it has been recorded for next time.)")
+
+    elif choice == '8':
+        group = input(f"Which group? ({', '.join(reset_tables.TABLE_GROUPS)}): ").strip()
+        if group not in reset_tables.TABLE_GROUPS:
+            print("Invalid group.")
+            return
+
+        # Group dumps of this group, plus full dumps that pg_restore can pick tables out of
+        backups = [
+            e for e in list_backups()
+            if e.get("group") == group or (not e.get("group") and e["format"] not in ("plain", "gzip"))
+        ]
+        if not backups:
+            print(f"No backups containing {group} found.")
+            return
+
+        print(f"\nBackups containing {group}:")
+        for idx, entry in enumerate(backups[:15]):
+            kind = "group" if entry.get("group") else "full"
+            print(f"{idx + 1}. {entry['timestamp']}  {entry['tier']:<10} {kind:<6} {format_size(entry['size'] or 0):>7}  {entry['path']}")
+
+        pick = input("\nSelect number to restore (or 0 to cancel): ")
+        if pick == '0' or not pick.isdigit():
+            return
+        try:
+            target = backup_catalog.full_path(backups[int(pick)-1])
+            confirm = input(f"RESTORE {group.upper()} from {target}? Those tables will be OVERWRITTEN. (yes/no): ")
+            if confirm.lower() == 'yes':
+                restore_group(target, group)
+                print("\n✅ Restore complete!")
+        except IndexError:
+            print("Invalid selection.")
+        except subprocess.CalledProcessError as e:
+            print(f"\n❌ Restore failed: {e}")
+
     elif choice == '0':
         print("Exiting.")
     else:
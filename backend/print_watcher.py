@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+# ./backend/print_watcher.py
+"""
+Printer watcher: prints the jobs queued by the backend as soon as their PDF lands in the spool.
+
+    python3 print_watcher.py                       # default CUPS printer, 2 jobs at a time
+    python3 print_watcher.py --queue office -j 3   # CUPS destination "office", 3 in parallel
+    python3 print_watcher.py --queue office=HP_Office --queue yard=Brother_Yard   # backend queue=CUPS destination
+    LP_COMMAND=./fake_lp.sh python3 print_watcher.py --polling
+
+Runs on the host next to CUPS (standard library only). New spool files are noticed through
+inotify (polling where that isn't available); the watcher then claims jobs from the backend,
+runs `lp` for up to --parallel jobs per queue at once, retries failures with backoff and
+reports printing/done/failed back. Each print logs the drop-to-lp latency (spool file
+written -> lp started); a summary is printed on exit.
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import shutil
+import signal
+import select
+import struct
+import logging
+import argparse
+import threading
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("print_watcher")
+
+# --- CONFIGURATION ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SPOOL_DIR = os.getenv("SPOOL_DIR", os.path.join(BASE_DIR, "print_spool"))
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
+# Backend print queues this watcher serves, each "name" or "name=CUPS destination"
+# (a bare name is also the destination; "default" = the system default printer)
+PRINT_QUEUES = os.getenv("PRINT_QUEUES", "default")
+# lp processes running at once per queue
+PRINT_PARALLEL = int(os.getenv("PRINT_PARALLEL", "2"))
+# Extra lp attempts after a failure, waiting PRINT_RETRY_DELAY, then twice as long each time
+PRINT_RETRIES = int(os.getenv("PRINT_RETRIES", "3"))
+PRINT_RETRY_DELAY = float(os.getenv("PRINT_RETRY_DELAY", "1"))
+# Claim anyway this often (jobs queued while the watcher was down, missed events);
+# also the scan interval when polling
+PRINT_POLL_SECONDS = float(os.getenv("PRINT_POLL_SECONDS", "5"))
+# lp stand-in for tests/other platforms; options are Draft quality (ink saver), fit to page
+LP_COMMAND = os.getenv("LP_COMMAND", "lp")
+LP_OPTIONS = os.getenv("LP_OPTIONS", "-o fit-to-page -o print-quality=3")
+LP_TIMEOUT = float(os.getenv("LP_TIMEOUT", "120"))
+# Time budget per job from claim to result, lp runs and retries included. Keep it under the
+# backend's PRINT_CLAIM_TIMEOUT (300s), which fails jobs it hasn't heard back about by then.
+PRINT_JOB_DEADLINE = float(os.getenv("PRINT_JOB_DEADLINE", "240"))
+
+# A new file can show up just before its job is committed; keep trying to claim this long
+EVENT_GRACE_SECONDS = 2.0
+
+
+# ==========================================
+# 1. SPOOL EVENTS (inotify, polling fallback)
+# ==========================================
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len (then the name)
+
+class InotifyWatcher:
+    """New PDFs in the spool directory through Linux inotify (via ctypes, no extra packages)."""
+
+    mode = "inotify"
+
+    def __init__(self, path):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {path}")
+        self._wake_r, self._wake_w = os.pipe()
+
+    def wait(self, timeout):
+        """Names of PDFs written or moved into the spool, or [] after timeout / wake()."""
+        readable, _, _ = select.select([self.fd, self._wake_r], [], [], timeout)
+        if self._wake_r in readable:
+            os.read(self._wake_r, 1024)
+        if self.fd not in readable:
+            return []
+        names = []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if name.lower().endswith(".pdf"):
+                names.append(name)
+        return names
+
+    def wake(self):
+        os.write(self._wake_w, b"x")
+
+    def close(self):
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            os.close(fd)
+
+class PollingWatcher:
+    """Fallback: lists the spool directory every `interval` seconds."""
+
+    mode = "polling"
+
+    def __init__(self, path, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self._seen = set(self._list())
+        self._wake = threading.Event()
+
+    def _list(self):
+        try:
+            return {e.name for e in os.scandir(self.path) if e.is_file() and e.name.lower().endswith(".pdf")}
+        except OSError:
+            return set()
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self._list()
+            new, self._seen = sorted(current - self._seen), current
+            remaining = deadline - time.monotonic()
+            if new or remaining <= 0:
+                return new
+            if self._wake.wait(min(self.interval, remaining)):
+                self._wake.clear()
+                return []
+
+    def wake(self):
+        self._wake.set()
+
+    def close(self):
+        pass
+
+def open_watcher(path, polling=False, poll_interval=1.0):
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"⚠️ inotify unavailable ({e}), polling every {poll_interval}s")
+    return PollingWatcher(path, poll_interval)
+
+
+# ==========================================
+# 2. BACKEND API
+# ==========================================
+class BackendError(Exception):
+    pass
+
+class Backend:
+    """Print job endpoints (/api/dockets/print-jobs)."""
+
+    def __init__(self, url=BACKEND_URL, timeout=10):
+        self.base = url.rstrip("/") + "/api/dockets/print-jobs"
+        self.timeout = timeout
+
+    def _post(self, path, params=None, body=None):
+        url = self.base + path
+        if params:
+            url += "?" + urllib.parse.urlencode({k: v for k, v in params.items() if v is not None})
+        data = json.dumps(body).encode() if body is not None else b""
+        request = urllib.request.Request(url, data=data, method="POST", headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read() or b"null")
+        except urllib.error.HTTPError as e:
+            raise BackendError(f"{e.code} {e.read()[:200].decode(errors='replace')}") from e
+        except (urllib.error.URLError, OSError) as e:
+            raise BackendError(str(e)) from e
+
+    def claim(self, queue):
+        """Next job for this queue, or None."""
+        return self._post("/claim", {"printer": queue})
+
+    def report(self, job_id, status, error=None):
+        return self._post(f"/{job_id}/status", body={"status": status, "error": error})
+
+
+# ==========================================
+# 3. LATENCY
+# ==========================================
+class LatencyStats:
+    """Drop-to-lp latency: spool file written -> lp started, in milliseconds."""
+
+    def __init__(self, keep=1000):
+        self._lock = threading.Lock()
+        self._samples = []
+        self._keep = keep
+
+    def add(self, ms):
+        with self._lock:
+            self._samples.append(ms)
+            del self._samples[:-self._keep]
+
+    def summary(self):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0}
+        pick = lambda q: samples[min(int(q * len(samples)), len(samples) - 1)]
+        return {
+            "count": len(samples),
+            "p50_ms": round(pick(0.5), 1),
+            "p95_ms": round(pick(0.95), 1),
+            "max_ms": round(samples[-1], 1),
+        }
+
+
+# ==========================================
+# 4. PRINTING
+# ==========================================
+class PrintQueue:
+    """One backend queue / CUPS destination with its own lp workers, so a slow printer only delays its own jobs."""
+
+    def __init__(self, spec, parallel):
+        name, _, destination = spec.partition("=")
+        self.name = name.strip()
+        self.destination = destination.strip() or self.name
+        self.parallel = max(parallel, 1)
+        self.active = 0
+        self.executor = ThreadPoolExecutor(max_workers=self.parallel, thread_name_prefix=f"lp-{name}")
+
+    @property
+    def free(self):
+        return self.parallel - self.active
+
+class PrintWatcher:
+    def __init__(self, backend, queues, spool_dir=SPOOL_DIR, parallel=PRINT_PARALLEL, retries=PRINT_RETRIES,
+                 retry_delay=PRINT_RETRY_DELAY, poll_seconds=PRINT_POLL_SECONDS, lp_command=LP_COMMAND,
+                 lp_options=LP_OPTIONS, polling=False, job_deadline=PRINT_JOB_DEADLINE):
+        self.backend = backend
+        self.spool_dir = spool_dir
+        self.failed_dir = os.path.join(spool_dir, "failed")
+        self.queues = [PrintQueue(name, parallel) for name in queues]
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.job_deadline = job_deadline
+        self.poll_seconds = poll_seconds
+        self.lp_command = shlex.split(lp_command)
+        self.lp_options = shlex.split(lp_options)
+        self.latency = LatencyStats()
+        self.counts = {"done": 0, "failed": 0, "retries": 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        os.makedirs(self.failed_dir, exist_ok=True)
+        self.watcher = open_watcher(spool_dir, polling, poll_interval=min(1.0, poll_seconds))
+
+    # --- main loop ---
+    def run(self):
+        logger.info(f"🖨️  Watching {self.spool_dir} ({self.watcher.mode}); queues: "
+                    + ", ".join(f"{q.name} x{q.parallel}" for q in self.queues))
+        self.dispatch()
+        while not self._stop.is_set():
+            names = self.watcher.wait(self.poll_seconds)
+            if self._stop.is_set():
+                break
+            self.dispatch(expect_new=bool(names))
+        self.shutdown()
+
+    def stop(self):
+        self._stop.set()
+        self.watcher.wake()
+
+    def shutdown(self):
+        for queue in self.queues:
+            queue.executor.shutdown(wait=True)
+        self.watcher.close()
+        logger.info(f"🛑 Stopped. {self.counts['done']} printed, {self.counts['failed']} failed, "
+                    f"drop-to-lp latency {self.latency.summary()}")
+
+    def dispatch(self, expect_new=False):
+        """Claims jobs while a queue has a free lp slot. After a new file, waits briefly for its job row."""
+        deadline = time.monotonic() + (EVENT_GRACE_SECONDS if expect_new else 0)
+        delay = 0.02
+        while True:
+            claimed = self._claim_available()
+            if claimed or time.monotonic() >= deadline or self._stop.is_set():
+                return claimed
+            if not any(queue.free > 0 for queue in self.queues):
+                # Every lp slot is busy; finishing jobs wake the loop
+                return claimed
+            time.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+    def _claim_available(self):
+        claimed = 0
+        for queue in self.queues:
+            while queue.free > 0 and not self._stop.is_set():
+                try:
+                    job = self.backend.claim(queue.name)
+                except BackendError as e:
+                    logger.error(f"❌ Can't reach the backend to claim jobs: {e}")
+                    return claimed
+                if not job:
+                    break
+                with self._lock:
+                    queue.active += 1
+                queue.executor.submit(self._run_job, queue, job)
+                claimed += 1
+        return claimed
+
+    # --- one job ---
+    def _run_job(self, queue, job):
+        try:
+            self.print_job(queue, job)
+        except Exception as e:
+            logger.exception(f"❌ Job {job.get('id')} crashed: {e}")
+            self._report(job["id"], "failed", str(e))
+        finally:
+            with self._lock:
+                queue.active -= 1
+            # A slot is free: claim whatever is waiting
+            self.watcher.wake()
+
+    def print_job(self, queue, job):
+        # Claims only happen for a free lp slot, so the job's clock starts about now
+        deadline = time.monotonic() + self.job_deadline
+        path = os.path.join(self.spool_dir, os.path.basename(job["filename"]))
+        if not os.path.isfile(path):
+            logger.error(f"❌ Job {job['id']}: {job['filename']} is missing from {self.spool_dir}")
+            self._report(job["id"], "failed", "Spool file missing")
+            self._count("failed")
+            return
+
+        self._report(job["id"], "printing")
+        dropped_at = os.path.getmtime(path)
+        command = self.lp_command + ["-n", str(job.get("copies") or 1)] + self.lp_options
+        if queue.destination != "default":
+            command += ["-d", queue.destination]
+        command.append(path)
+
+        delay = self.retry_delay
+        for attempt in range(self.retries + 1):
+            if attempt == 0:
+                latency_ms = (time.time() - dropped_at) * 1000
+                self.latency.add(latency_ms)
+            ok, output = run_lp(command, timeout=min(LP_TIMEOUT, deadline - time.monotonic()))
+            if ok:
+                logger.info(f"✅ Job {job['id']}: {job.get('copies') or 1} x {job['filename']} -> {queue.destination} "
+                            f"(drop-to-lp {latency_ms:.0f} ms{f', attempt {attempt + 1}' if attempt else ''})")
+                self._report(job["id"], "done")
+                self._count("done")
+                _remove(path)
+                return
+            if attempt < self.retries and time.monotonic() + delay >= deadline:
+                # Report before the backend gives up on the claim and rejects a late result
+                output += f" (gave up after {self.job_deadline:.0f}s)"
+                break
+            if attempt < self.retries and not self._stop.is_set():
+                logger.warning(f"⚠️ Job {job['id']} on {queue.name} failed ({output}), retrying in {delay:.1f}s")
+                self._count("retries")
+                time.sleep(delay)
+                delay = min(delay * 2, 60)
+
+        # Keep the PDF for a manual reprint
+        logger.error(f"❌ Job {job['id']} failed on {queue.name}: {output}")
+        self._report(job["id"], "failed", output)
+        self._count("failed")
+        shutil.move(path, os.path.join(self.failed_dir, os.path.basename(path)))
+
+    def _report(self, job_id, status, error=None):
+        """Status update with retries: the job's outcome must not be lost to a backend restart."""
+        delay = 0.5
+        for attempt in range(6):
+            try:
+                return self.backend.report(job_id, status, error)
+            except BackendError as e:
+                if str(e).startswith(("404", "409", "400")):
+                    logger.warning(f"⚠️ Job {job_id}: backend rejected {status}: {e}")
+                    return None
+                if attempt == 5:
+                    logger.error(f"❌ Job {job_id}: couldn't report {status}: {e}")
+                    return None
+                time.sleep(delay)
+                delay = min(delay * 2, 10)
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+def run_lp(command, timeout=LP_TIMEOUT):
+    """(succeeded, lp output)."""
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=max(timeout, 0.1))
+    except FileNotFoundError:
+        return False, f"{command[0]}: command not found"
+    except subprocess.TimeoutExpired:
+        return False, f"{command[0]} timed out after {timeout:.0f}s"
+    output = (result.stderr or result.stdout).strip()
+    return result.returncode == 0, output or f"exit code {result.returncode}"
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ==========================================
+# 5. ENTRY POINT
+# ==========================================
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spool", default=SPOOL_DIR, help="spool directory (default %(default)s)")
+    parser.add_argument("--backend", default=BACKEND_URL, help="backend URL (default %(default)s)")
+    parser.add_argument("--queue", action="append", help="queue name[=CUPS destination], repeatable (default: PRINT_QUEUES)")
+    parser.add_argument("-j", "--parallel", type=int, default=PRINT_PARALLEL, help="lp jobs at once per queue")
+    parser.add_argument("--retries", type=int, default=PRINT_RETRIES)
+    parser.add_argument("--deadline", type=float, default=PRINT_JOB_DEADLINE,
+                        help="seconds per job, retries included; keep under the backend's PRINT_CLAIM_TIMEOUT")
+    parser.add_argument("--polling", action="store_true", help="scan the spool instead of using inotify")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s", datefmt="%H:%M:%S")
+    queues = args.queue or [q.strip() for q in PRINT_QUEUES.split(",") if q.strip()]
+    os.makedirs(args.spool, exist_ok=True)
+
+    watcher = PrintWatcher(Backend(args.backend), queues, spool_dir=args.spool, parallel=args.parallel,
+                           retries=args.retries, polling=args.polling, job_deadline=args.deadline)
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: watcher.stop())
+    watcher.run()
+
+if __name__ == "__main__":
+    main()
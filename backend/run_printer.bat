@@ -5,6 +5,9 @@ setlocal enabledelayedexpansion
 :: Use the hardcoded name for Task Scheduler stability
 set "PRINTER_NAME=HP8C43C2 (HP Photosmart 5520 series)"
 set "SUMATRA_EXE=SumatraPDF.exe"
+:: Print jobs are claimed from, and reported back to, the backend
+if not defined BACKEND_URL set "BACKEND_URL=http://localhost:8000"
+set "JOBS_URL=%BACKEND_URL%/api/dockets/print-jobs"
 
 :: Set absolute path to current directory to avoid OneDrive confusion
 set "BASE_DIR=%~dp0"
@@ -42,7 +45,14 @@ if exist "%SPOOL_DIR%\*.pdf" (
 if exist "%PROC_DIR%\*.pdf" (
     for %%f in ("%PROC_DIR%\*.pdf") do (
         set "fname=%%~nxf"
-        
+
+        :: Claim the job for this file (the response starts with {"id":N,...)
+        set "JOB_ID="
+        for /f "tokens=2 delims=:," %%j in ('curl -s -X POST "%JOBS_URL%/claim?filename=!fname!&printer=%COMPUTERNAME%"') do (
+            if not defined JOB_ID set "JOB_ID=%%j"
+        )
+        if defined JOB_ID curl -s -o nul -X POST "%JOBS_URL%/!JOB_ID!/status" -H "Content-Type: application/json" -d "{\"status\": \"printing\"}"
+
         :: Simple Quantity Check (Looks for Qty-X in name)
         set "COPIES=1"
         echo !fname! | findstr /i "Qty-" >nul
@@ -63,9 +73,11 @@ if exist "%PROC_DIR%\*.pdf" (
         if !errorlevel! equ 0 (
             timeout /t 2 >nul
             del /f /q "%PROC_DIR%\!fname!"
+            if defined JOB_ID curl -s -o nul -X POST "%JOBS_URL%/!JOB_ID!/status" -H "Content-Type: application/json" -d "{\"status\": \"done\"}"
             echo [%TIME%] ✅ Done.
         ) else (
             echo [%TIME%] ❌ Error.
+            if defined JOB_ID curl -s -o nul -X POST "%JOBS_URL%/!JOB_ID!/status" -H "Content-Type: application/json" -d "{\"status\": \"failed\", \"error\": \"SumatraPDF exit code !errorlevel!\"}"
             move /y "%PROC_DIR%\!fname!" "%ERROR_DIR%\" >nul
         )
     )
@@ -1,52 +1,13 @@
 #!/bin/bash
 # ./backend/run_printer.sh
 
-SPOOL_DIR="print_spool"
-PROC_DIR="$SPOOL_DIR/processing"
-
-mkdir -p "$SPOOL_DIR"
-mkdir -p "$PROC_DIR"
-
-echo "🖨️  Async Watcher started."
-echo "   Watching: $SPOOL_DIR"
-echo "   Queueing: $PROC_DIR"
-echo "   Quality:  Draft (Ink Saver)"
-
-# Enable nullglob to handle empty directories gracefully
-shopt -s nullglob
-
-while true; do
-    # 1. INSTANTLY CLAIM FILES
-    # Move all new PDFs to processing to unblock the UI
-    for file in "$SPOOL_DIR"/*.pdf; do
-        if [ -f "$file" ]; then
-            mv "$file" "$PROC_DIR/"
-            echo "📥 Queued: $(basename "$file")"
-        fi
-    done
-
-    # 2. PROCESS QUEUE
-    for file in "$PROC_DIR"/*.pdf; do
-        if [ -f "$file" ]; then
-            filename=$(basename "$file")
-            
-            # Extract Copies
-            if [[ "$filename" =~ Qty-([0-9]+) ]]; then
-                COPIES="${BASH_REMATCH[1]}"
-            else
-                COPIES=1
-            fi
-
-            echo "🖨️  Printing $COPIES copies of $filename (Draft Mode)..."
-
-            # Send to CUPS with Draft Quality (3)
-            # -o print-quality=3 usually maps to Draft/Fast
-            lp -n "$COPIES" -o fit-to-page -o print-quality=3 "$file"
-
-            # Delete
-            rm "$file"
-        fi
-    done
-
-    sleep 2
-done
\ No newline at end of file
+# Starts the printer watcher (print_watcher.py): inotify on print_spool, parallel lp per
+# queue, retries, results reported to the backend. Configure it with environment variables:
+#   BACKEND_URL     backend address (default http://localhost:8000)
+#   PRINT_QUEUES    CUPS destinations, comma separated (default: the default printer)
+#   PRINT_PARALLEL  lp jobs at once per queue (default 2)
+#   LP_COMMAND      lp replacement, e.g. a fake for testing
+# Extra arguments are passed through (python3 print_watcher.py --help).
+
+cd "$(dirname "$0")" || exit 1
+exec python3 -u print_watcher.py "$@"
@@ -0,0 +1,99 @@
+# backend/tests/backup/backup_catalog_test.py
+
+import os
+import pytest
+from datetime import datetime, timedelta
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.utilities import backup_catalog, backup_manager
+
+@pytest.fixture
+def backup_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup_catalog, "BACKUP_ROOT", str(tmp_path))
+    monkeypatch.setattr(backup_catalog, "CATALOG_FILE", str(tmp_path / "catalog.json"))
+    monkeypatch.setattr(backup_manager, "BLOB_ROOT", str(tmp_path / "blobs"))
+    for tier in ["daily", "weekly", "on_update"]:
+        (tmp_path / tier).mkdir()
+    return tmp_path
+
+def make_backup(root, tier, when, content="DATA"):
+    path = root / tier / f"scheduled_backup_{when.strftime('%Y-%m-%d_%H%M%S')}.sql"
+    path.write_text(content)
+    return str(path)
+
+# ==========================================
+# 1. TEST: Catalog entries
+# ==========================================
+def test_rebuild_then_list_newest_first(backup_root):
+    older = make_backup(backup_root, "daily", datetime(2025, 1, 1, 11))
+    newer = make_backup(backup_root, "weekly", datetime(2025, 1, 5, 11))
+    (backup_root / "daily" / "half_written.sql.partial").write_text("x")
+
+    entries = backup_catalog.list_entries()
+
+    assert [e["path"] for e in entries] == [os.path.relpath(newer, backup_root), os.path.relpath(older, backup_root)]
+    assert entries[0]["tier"] == "weekly"
+    assert entries[0]["format"] == "plain"
+    assert (backup_root / "catalog.json").exists()
+
+def test_add_link_copies_metadata(backup_root):
+    daily = make_backup(backup_root, "daily", datetime(2025, 1, 5, 11))
+    backup_catalog.add_entry(backup_catalog.make_entry(daily, sha256="abc", duration=1.5))
+    weekly = str(backup_root / "weekly" / os.path.basename(daily))
+
+    backup_catalog.add_link(daily, weekly)
+
+    entry = backup_catalog.list_entries("weekly")[0]
+    assert entry["sha256"] == "abc"
+    assert entry["duration"] == 1.5
+    assert entry["schema_revision"] == backup_catalog.get_schema_revision()
+
+def test_schema_revision_is_alembic_head():
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    config = Config(os.path.join(backend_dir, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(backend_dir, "alembic"))
+    assert backup_catalog.get_schema_revision() == ScriptDirectory.from_config(config).get_current_head()
+
+# ==========================================
+# 2. TEST: Retention + verification
+# ==========================================
+def test_cleanup_uses_catalog_timestamps(backup_root):
+    old = make_backup(backup_root, "daily", datetime.now() - timedelta(days=10))
+    recent = make_backup(backup_root, "daily", datetime.now() - timedelta(days=1))
+    backup_catalog.rebuild()
+
+    backup_manager.cleanup_old_files(str(backup_root / "daily"), days=7)
+
+    assert not os.path.exists(old)
+    assert os.path.exists(recent)
+    assert len(backup_catalog.list_entries("daily")) == 1
+
+def test_first_write_keeps_existing_backups(backup_root):
+    # An install from before the catalog: backups on disk, no catalog.json
+    old = make_backup(backup_root, "daily", datetime(2020, 1, 1, 11))
+    weekly = make_backup(backup_root, "weekly", datetime.now() - timedelta(days=3))
+    new = make_backup(backup_root, "daily", datetime.now())
+    backup_catalog.add_entry(backup_catalog.make_entry(new, sha256="abc"))
+
+    assert [e["path"] for e in backup_catalog.list_entries("daily")] == [
+        os.path.relpath(new, backup_root), os.path.relpath(old, backup_root)
+    ]
+    assert backup_catalog.get_entry(new)["sha256"] == "abc"
+    assert backup_catalog.get_entry(weekly) is not None
+
+    backup_manager.cleanup_old_files(str(backup_root / "daily"), days=7)
+    assert not os.path.exists(old)
+    assert [e["path"] for e in backup_catalog.list_entries("daily")] == [os.path.relpath(new, backup_root)]
+
+def test_verify_detects_changes(backup_root):
+    path = make_backup(backup_root, "daily", datetime(2025, 2, 1, 11))
+    entry = backup_catalog.add_entry(backup_catalog.make_entry(path, sha256=backup_manager.file_digest(path)))
+    assert backup_catalog.verify(entry) == "ok"
+
+    with open(path, "a") as f:
+        f.write("corrupted")
+    assert backup_catalog.verify(entry) == "mismatch"
+
+    os.remove(path)
+    assert backup_catalog.verify(entry) == "missing"
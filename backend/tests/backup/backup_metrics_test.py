@@ -0,0 +1,67 @@
+# backend/tests/backup/backup_metrics_test.py
+
+import json
+from datetime import datetime, timedelta
+
+from app.utilities import backup_metrics
+from app.utilities.percentiles import percentile, describe
+
+def write_runs(path, runs):
+    with open(path, "w") as f:
+        for run in runs:
+            f.write(json.dumps(run) + "\n")
+
+# ==========================================
+# 1. TEST: Summary from the timings log
+# ==========================================
+def test_summary_groups_runs_by_action_and_tier(tmp_path, monkeypatch):
+    log = tmp_path / "backup_timings.jsonl"
+    monkeypatch.setattr(backup_metrics, "TIMINGS_FILE", str(log))
+    write_runs(log, [
+        {"action": "dump", "tier": "on_update", "format": "plain", "seconds": 0.4, "bytes": 4000, "success": True, "at": "2026-01-01T10:00:00", "lag_seconds": 6},
+        {"action": "dump", "tier": "on_update", "format": "plain", "seconds": 3, "bytes": 6000, "success": True, "at": "2026-01-01T10:05:00", "lag_seconds": 40},
+        {"action": "dump", "tier": "on_update", "format": "plain", "seconds": 1, "bytes": 0, "success": False, "at": "2026-01-01T10:10:00"},
+        {"action": "restore", "tier": "daily", "format": "custom", "seconds": 12, "bytes": 9000, "success": True, "at": "2026-01-01T11:00:00"},
+    ])
+
+    result = backup_metrics.summary()["by_kind"]
+
+    on_update = result["dump:on_update"]
+    assert on_update["runs"] == 3
+    assert on_update["failures"] == 1
+    assert on_update["last_failure_at"] == "2026-01-01T10:10:00"
+    assert on_update["duration_seconds"]["max"] == 3
+    assert on_update["duration_seconds"]["histogram"]["0.5"] == 1
+    assert on_update["duration_seconds"]["histogram"]["5"] == 1
+    assert on_update["size_bytes"]["avg"] == 5000
+    assert on_update["lag_seconds"]["max"] == 40
+    assert result["restore:daily"]["throughput_bytes_per_second"]["avg"] == 750
+
+# ==========================================
+# 2. TEST: Lag between a commit and the dump covering it
+# ==========================================
+def test_mark_covered_reports_commit_lag(monkeypatch):
+    monkeypatch.setattr(backup_metrics, "_commits", {"last_commit_at": None, "oldest_uncovered_at": None, "last_covered_at": None})
+
+    backup_metrics.note_commit()
+    committed_at = backup_metrics._commits["oldest_uncovered_at"]
+    backup_metrics.note_commit()
+
+    lag = backup_metrics.mark_covered(committed_at + timedelta(seconds=7))
+    assert lag == 7
+    assert backup_metrics.current_lag()["uncovered_for_seconds"] == 0
+
+    # Nothing waiting: no lag to report
+    assert backup_metrics.mark_covered(datetime.now()) is None
+
+# ==========================================
+# 3. TEST: Shared percentile helpers
+# ==========================================
+def test_percentile_and_describe():
+    values = [5, 1, 4, 2, 3, 10, 7, 6, 9, 8]
+    assert percentile(values, 50) == 5
+    assert percentile(values, 95) == 10
+    assert percentile([], 50) is None
+
+    assert describe([0.12345, 0.5], digits=2) == {"count": 2, "p50": 0.12, "p95": 0.5, "max": 0.5}
+    assert describe([], pcts=(99,), suffix="_ms") == {"count": 0, "p99_ms": None, "max_ms": None}
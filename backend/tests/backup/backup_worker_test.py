@@ -0,0 +1,92 @@
+# backend/tests/backup/backup_worker_test.py
+
+import time
+import threading
+
+from app.utilities.backup_worker import BackupWorker
+
+# ==========================================
+# 1. TEST: Coalescing bursts of commits
+# ==========================================
+def test_burst_of_commits_runs_one_backup():
+    calls = []
+    worker = BackupWorker(lambda tables: calls.append(tables) or True, quiet_period=0.2, max_delay=5)
+
+    # Action: 20 commits in quick succession
+    for _ in range(20):
+        worker.notify()
+        time.sleep(0.01)
+
+    time.sleep(0.6)
+
+    # Assert: one dump covered the whole burst
+    assert len(calls) == 1
+    status = worker.status()
+    assert status["last_commits_covered"] == 20
+    assert status["pending"] is False
+
+def test_touched_tables_are_merged_per_run():
+    calls = []
+    worker = BackupWorker(lambda tables: calls.append(tables) or True, quiet_period=0.1, max_delay=5)
+
+    worker.notify({"global_settings"})
+    worker.notify({"dockets", "docket_items"})
+    time.sleep(0.4)
+
+    assert calls == [{"global_settings", "dockets", "docket_items"}]
+
+def test_max_delay_caps_waiting_under_constant_commits():
+    calls = []
+    worker = BackupWorker(lambda tables: calls.append(tables) or True, quiet_period=0.3, max_delay=0.5)
+
+    # Commits keep arriving faster than the quiet period for ~1.2s
+    end = time.monotonic() + 1.2
+    while time.monotonic() < end:
+        worker.notify()
+        time.sleep(0.05)
+
+    # Assert: the max delay forced at least one dump during the stream
+    assert len(calls) >= 1
+
+# ==========================================
+# 2. TEST: Force joins an in-flight dump
+# ==========================================
+def test_force_joins_running_backup():
+    started = threading.Event()
+    release = threading.Event()
+    running = []
+    overlaps = []
+
+    def slow_backup(tables):
+        if running:
+            overlaps.append(1)
+        running.append(1)
+        started.set()
+        release.wait(2)
+        running.pop()
+        return True
+
+    worker = BackupWorker(slow_backup, quiet_period=0, max_delay=0)
+    worker.notify()
+    assert started.wait(2)
+
+    # Release the dump shortly after force() starts waiting
+    threading.Timer(0.2, release.set).start()
+    result = worker.force(timeout=3)
+
+    # Assert
+    assert result["joined"] is True
+    assert result["completed"] is True
+    assert result["runs_completed"] == 1
+    assert overlaps == []
+
+def test_force_runs_backup_when_idle():
+    calls = []
+    worker = BackupWorker(lambda tables: calls.append(tables) or True, quiet_period=60, max_delay=60)
+
+    result = worker.force(timeout=2)
+
+    assert result["joined"] is False
+    assert result["completed"] is True
+    assert result["last_success"] is True
+    assert calls == [None] # forced runs are full dumps
@@ -0,0 +1,149 @@
+# backend/tests/backup/change_journal_test.py
+
+import pytest
+from datetime import date, datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.docketModels import Docket, DocketItem
+from app.models.settingsModels import GlobalSetting
+from app.utilities import change_journal
+
+# --- SETUP DATABASES ---
+# "live" is the database being journaled, "restored" is where the journal is replayed
+def make_engine():
+    return create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+@pytest.fixture
+def journal_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(change_journal, "JOURNAL_DIR", str(tmp_path / "journal"))
+    monkeypatch.setattr(change_journal, "JOURNAL_ENABLED", True)
+    monkeypatch.setattr(change_journal, "JOURNAL_FSYNC", False)
+    return tmp_path / "journal"
+
+@pytest.fixture
+def live():
+    engine = make_engine()
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def restored():
+    engine = make_engine()
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+def docket_rows(engine):
+    with engine.connect() as conn:
+        dockets = conn.execute(Docket.__table__.select().order_by(Docket.id)).mappings().all()
+        items = conn.execute(DocketItem.__table__.select().order_by(DocketItem.id)).mappings().all()
+    return [dict(d) for d in dockets], [dict(i) for i in items]
+
+# ==========================================
+# 1. TEST: Capture + replay round trip
+# ==========================================
+def test_replay_reproduces_committed_changes(journal_dir, live, restored):
+    # Insert
+    dkt = Docket(scrdkt_number="SCR1", docket_type="Customer", docket_date=date(2025, 3, 1), customer_name="Ann")
+    live.add(dkt)
+    live.flush()
+    live.add_all([DocketItem(docket_id=dkt.id, metal="Copper", gross=10, tare=1, price=5) for _ in range(3)])
+    live.commit()
+
+    # Update + bulk delete + re-insert (the upsert_docket pattern)
+    dkt.customer_name = "Annie"
+    live.query(DocketItem).filter(DocketItem.docket_id == dkt.id).delete()
+    live.add(DocketItem(docket_id=dkt.id, metal="Brass", gross=4, tare=0, price=3))
+    live.commit()
+
+    # A rolled back change must not be journaled
+    live.add(GlobalSetting(key="ignored", value="x"))
+    live.flush()
+    live.rollback()
+
+    # Action
+    count = change_journal.replay(restored, metadata=Base.metadata)
+
+    # Assert
+    assert count == 2
+    assert docket_rows(restored) == docket_rows(live.get_bind())
+    with restored.connect() as conn:
+        assert conn.execute(GlobalSetting.__table__.select()).first() is None
+
+def test_replay_handles_cascade_delete(journal_dir, live, restored):
+    dkt = Docket(scrdkt_number="SCR2", docket_type="Customer")
+    dkt.items = [DocketItem(metal="Lead", gross=1, tare=0, price=1)]
+    live.add(dkt)
+    live.commit()
+
+    live.delete(dkt)
+    live.commit()
+
+    change_journal.replay(restored, metadata=Base.metadata)
+
+    assert docket_rows(restored) == ([], [])
+
+# ==========================================
+# 2. TEST: Segments + bases
+# ==========================================
+def test_rotate_compresses_segment_and_replay_starts_at_base(journal_dir, live, restored):
+    live.add(GlobalSetting(key="before_base", value="1"))
+    live.commit()
+
+    # Base dump taken here; replay only needs segments from this point
+    segment = change_journal.rotate()
+    assert segment == 2
+    assert (journal_dir / "segment_000001.jsonl.gz").exists()
+
+    live.add(GlobalSetting(key="after_base", value="2"))
+    live.commit()
+
+    count = change_journal.replay(restored, from_segment=segment, metadata=Base.metadata)
+
+    assert count == 1
+    with restored.connect() as conn:
+        keys = [r.key for r in conn.execute(GlobalSetting.__table__.select())]
+    assert keys == ["after_base"]
+
+# ==========================================
+# 3. TEST: Point-in-time replay
+# ==========================================
+def test_replay_stops_before_transaction(journal_dir, live, restored):
+    for n in range(3):
+        live.add(Docket(scrdkt_number=f"SCR{n}", docket_type="Customer"))
+        live.commit()
+
+    # The wrong docket gets deleted
+    live.query(Docket).filter(Docket.scrdkt_number == "SCR1").delete()
+    live.commit()
+    live.add(Docket(scrdkt_number="SCR9", docket_type="Customer"))
+    live.commit()
+
+    bad = change_journal.recent_transactions(limit=2, table="dockets")[1]
+    assert change_journal.summarize(bad).startswith("delete dockets#")
+
+    # Action
+    count = change_journal.replay(restored, metadata=Base.metadata, before_txid=bad["txid"])
+
+    # Assert: everything up to (not including) the delete is back
+    assert count == 3
+    numbers = [d["scrdkt_number"] for d in docket_rows(restored)[0]]
+    assert numbers == ["SCR0", "SCR1", "SCR2"]
+
+def test_replay_until_timestamp(journal_dir, live, restored):
+    live.add(GlobalSetting(key="first", value="1"))
+    live.commit()
+    cutoff = datetime.fromisoformat(change_journal.recent_transactions(limit=1)[0]["ts"])
+
+    live.add(GlobalSetting(key="second", value="2"))
+    live.commit()
+
+    change_journal.replay(restored, metadata=Base.metadata, until=cutoff)
+
+    with restored.connect() as conn:
+        keys = [r.key for r in conn.execute(GlobalSetting.__table__.select())]
+    assert keys == ["first"]
@@ -1,9 +1,13 @@
+import os
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 
+# Render PDFs in the test process (no worker pool) so WeasyPrint can be mocked
+os.environ.setdefault("PDF_RENDER_WORKERS", "0")
+
 from app.database import Base, get_db
 from app.main import app
 
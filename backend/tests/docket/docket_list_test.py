@@ -0,0 +1,69 @@
+# backend/tests/docket/docket_list_test.py
+
+import pytest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.docketModels import Docket
+from app.services import list_pagination
+from app.services.docket import docket_list
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    list_pagination.clear()
+    session = TestingSessionLocal()
+    for i in range(1, 13):
+        session.add(Docket(id=i, scrdkt_number=f"SCR{i}", docket_date=date(2024, 1, i), customer_name=f"Customer {i}"))
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def ids(result):
+    return [row["id"] for row in result["data"]]
+
+# ==========================================
+# 1. TEST: Page numbers still work and return cursors
+# ==========================================
+def test_page_mode_unchanged(db):
+    result = docket_list.get_dockets_paginated(db, 2, 5)
+    assert ids(result) == [7, 6, 5, 4, 3]
+    assert (result["total"], result["page"], result["limit"]) == (12, 2, 5)
+    assert result["next_cursor"] and result["prev_cursor"]
+    assert docket_list.get_dockets_paginated(db, 1, 5)["prev_cursor"] is None
+
+# ==========================================
+# 2. TEST: Cursors seek by id and stay put when new dockets arrive
+# ==========================================
+def test_cursor_mode(db):
+    first = docket_list.get_dockets_paginated(db, 1, 5, include_total=False)
+    assert ids(first) == [12, 11, 10, 9, 8] and first["total"] is None
+
+    # A docket saved meanwhile would shift every OFFSET page by one; the cursor doesn't move
+    db.add(Docket(id=13, scrdkt_number="SCR13", customer_name="New"))
+    db.commit()
+    second = docket_list.get_dockets_paginated(db, limit=5, cursor=first["next_cursor"])
+    assert ids(second) == [7, 6, 5, 4, 3]
+
+    last = docket_list.get_dockets_paginated(db, limit=5, cursor=second["next_cursor"])
+    assert ids(last) == [2, 1] and last["next_cursor"] is None
+
+    back = docket_list.get_dockets_paginated(db, limit=5, cursor=last["prev_cursor"])
+    assert ids(back) == [7, 6, 5, 4, 3]
+    newest = docket_list.get_dockets_paginated(db, limit=5, cursor=back["prev_cursor"])
+    assert ids(newest) == [12, 11, 10, 9, 8] and newest["prev_cursor"] is not None
+    assert ids(docket_list.get_dockets_paginated(db, limit=5, cursor=newest["prev_cursor"])) == [13]
+
+def test_cursor_respects_filters(db):
+    first = docket_list.get_dockets_paginated(db, 1, 2, start_date=date(2024, 1, 3), end_date=date(2024, 1, 6))
+    assert ids(first) == [6, 5]
+    rest = docket_list.get_dockets_paginated(db, limit=2, start_date=date(2024, 1, 3), end_date=date(2024, 1, 6),
+                                             cursor=first["next_cursor"])
+    assert ids(rest) == [4, 3] and rest["next_cursor"] is None and rest["total"] == 4
@@ -0,0 +1,81 @@
+# backend/tests/docket/docket_prerender_test.py
+
+import time
+import threading
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.settingsModels import GlobalSetting
+from app.services.docket import docket_prerender
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+class SlowRender:
+    """Records which dockets were rendered; the first render blocks until released."""
+
+    def __init__(self):
+        self.rendered = []
+        self.release = threading.Event()
+
+    def __call__(self, db, docket_id):
+        if not self.rendered:
+            self.release.wait(2)
+        self.rendered.append(docket_id)
+
+# ==========================================
+# 1. TEST: A newer save supersedes a queued pre-render
+# ==========================================
+def test_newer_save_replaces_queued_render(db):
+    render = SlowRender()
+    with patch("app.services.docket.docket_pdf.generate_docket_pdf", render):
+        docket_prerender.schedule(db, 1)   # occupies the single worker
+        time.sleep(0.05)
+        docket_prerender.schedule(db, 2)   # queued ...
+        docket_prerender.schedule(db, 2)   # ... and replaced by a newer save
+        render.release.set()
+        docket_prerender._executor.submit(lambda: None).result(2) # drain the queue
+
+    # Docket 2 was rendered once, for the latest save
+    assert render.rendered == [1, 2]
+    assert docket_prerender.stats()["superseded"] >= 1
+
+# ==========================================
+# 2. TEST: Print claims a queued render instead of rendering twice
+# ==========================================
+def test_print_cancels_queued_render(db):
+    render = SlowRender()
+    with patch("app.services.docket.docket_pdf.generate_docket_pdf", render):
+        docket_prerender.schedule(db, 10)
+        time.sleep(0.05)
+        docket_prerender.schedule(db, 11)
+
+        assert docket_prerender.claim(11) is False
+        render.release.set()
+        docket_prerender.claim(10)
+        assert render.rendered == [10]
+
+# ==========================================
+# 3. TEST: The setting turns it off
+# ==========================================
+def test_disabled_setting_skips_prerender(db):
+    db.add(GlobalSetting(key=docket_prerender.SETTING_KEY, value="false"))
+    db.commit()
+
+    render = SlowRender()
+    with patch("app.services.docket.docket_pdf.generate_docket_pdf", render):
+        docket_prerender.schedule(db, 20)
+        assert docket_prerender.claim(20) is False
+    assert render.rendered == []
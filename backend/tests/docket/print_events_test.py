@@ -0,0 +1,123 @@
+# backend/tests/docket/print_events_test.py
+
+import json
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+
+from app.services.docket import print_events
+
+@pytest.fixture(autouse=True)
+def broker():
+    print_events.clear()
+    yield
+    print_events.clear()
+
+def parse(chunk):
+    """(id, event, data) of one SSE message, or None for retry/comment lines."""
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(":"))
+    if "event" not in fields:
+        return None
+    return int(fields["id"]), fields["event"], json.loads(fields["data"])
+
+async def collect(stream, count, timeout=2):
+    """The first `count` events of a stream (ignoring retry/keep-alive lines)."""
+    events = []
+    async def read():
+        async for chunk in stream:
+            event = parse(chunk)
+            if event:
+                events.append(event)
+                if len(events) == count:
+                    return
+    await asyncio.wait_for(read(), timeout)
+    await stream.aclose()
+    return events
+
+# ==========================================
+# 1. TEST: Events published from other threads reach every subscriber
+# ==========================================
+def test_fan_out_from_threads():
+    async def scenario():
+        streams = [print_events.stream(), print_events.stream(), print_events.stream(filename="b.pdf")]
+        # Start each subscription (registers it) before publishing
+        for s in streams:
+            await s.__anext__()
+        def publish():
+            print_events.publish_job({"filename": "a.pdf", "status": "claimed"})
+            print_events.publish_job({"filename": "b.pdf", "status": "done"})
+        threading.Thread(target=publish).start()
+        return await asyncio.gather(collect(streams[0], 2), collect(streams[1], 2), collect(streams[2], 1))
+
+    everything, also_everything, only_b = asyncio.run(scenario())
+    assert [e[2]["filename"] for e in everything] == ["a.pdf", "b.pdf"]
+    assert everything == also_everything
+    assert [e[2]["status"] for e in only_b] == ["done"]
+    assert print_events.stats()["subscribers"] == 0
+
+# ==========================================
+# 2. TEST: Reconnecting with Last-Event-ID replays only what was missed
+# ==========================================
+def test_resume_from_last_event_id():
+    for status in ("queued", "claimed", "printing"):
+        print_events.publish_job({"filename": "a.pdf", "status": status})
+    first_id = print_events.last_id() - 2
+
+    events = asyncio.run(collect(print_events.stream(last_event_id=str(first_id)), 2))
+    assert [e[2]["status"] for e in events] == ["claimed", "printing"]
+
+# ==========================================
+# 3. TEST: An id older than the buffer (or from before a restart) gets a reset
+# ==========================================
+def test_expired_id_sends_reset():
+    with patch.object(print_events, "_events", print_events.deque(maxlen=2)):
+        for status in ("queued", "claimed", "printing", "done"):
+            print_events.publish_job({"filename": "a.pdf", "status": status})
+        oldest = print_events.last_id() - 3
+        events = asyncio.run(collect(print_events.stream(last_event_id=str(oldest)), 3))
+
+    assert events[0][1] == "reset"
+    assert [e[2]["status"] for e in events[1:]] == ["printing", "done"]
+
+    restarted = asyncio.run(collect(print_events.stream(last_event_id=str(print_events.last_id() + 50)), 1))
+    assert restarted[0][1] == "reset"
+
+# ==========================================
+# 4. TEST: A subscriber that stops reading is dropped, not buffered forever
+# ==========================================
+def test_slow_subscriber_dropped():
+    async def scenario():
+        with patch.object(print_events, "PRINT_EVENTS_QUEUE", 3):
+            stream = print_events.stream()
+            await stream.__anext__()
+        for i in range(10):
+            print_events.publish_job({"filename": f"{i}.pdf", "status": "queued"})
+        await asyncio.sleep(0.05)
+        # Whatever was queued, then the stream ends
+        return [chunk async for chunk in stream]
+
+    chunks = asyncio.run(scenario())
+    assert len([c for c in chunks if parse(c)]) <= 3
+    assert print_events.stats()["dropped_subscribers"] == 1
+
+# ==========================================
+# 5. TEST: The route's snapshot session is closed before the stream starts
+# ==========================================
+def test_route_releases_session_before_streaming():
+    from app.routes import docketRoutes
+
+    class FakeSession:
+        closed = False
+        def close(self):
+            self.closed = True
+
+    session = FakeSession()
+    job = {"filename": "a.pdf", "status": "queued"}
+    with patch.object(docketRoutes, "SessionLocal", lambda: session), \
+         patch.object(docketRoutes.docket_printer, "get_job_by_filename", lambda db, filename: job):
+        response = docketRoutes.stream_print_events(filename="a.pdf", last_event_id=None)
+        # No connection is held while the client stays subscribed
+        assert session.closed
+        events = asyncio.run(collect(response.body_iterator, 1))
+    assert events[0][2]["status"] == "queued"
@@ -0,0 +1,117 @@
+# backend/tests/docket/print_jobs_test.py
+
+import io
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.printModels import PrintJob
+from app.services.docket import docket_printer
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def spool(tmp_path):
+    with patch.object(docket_printer, "SPOOL_DIR", str(tmp_path)), \
+         patch.object(docket_printer, "generate_docket_pdf", lambda db, docket_id: io.BytesIO(b"%PDF-1.7")), \
+         patch.object(docket_printer.docket_prerender, "claim", lambda docket_id: False), \
+         patch.object(docket_printer.docket_prerender, "record_print", lambda *args: None):
+        yield tmp_path
+
+# ==========================================
+# 1. TEST: Printing enqueues a job next to its spool file
+# ==========================================
+def test_print_enqueues_job(db, spool):
+    result = docket_printer.print_docket_to_printer(db, 7, copies=2)
+
+    assert (spool / result["filename"]).exists()
+    job = db.query(PrintJob).filter(PrintJob.id == result["job_id"]).first()
+    assert (job.status, job.copies, job.docket_id) == ("queued", 2, 7)
+    assert docket_printer.check_print_status(db, result["filename"])["status"] == "pending"
+
+# ==========================================
+# 2. TEST: Claim -> printing -> done, each job claimed once
+# ==========================================
+def test_watcher_lifecycle(db, spool):
+    first = docket_printer.print_docket_to_printer(db, 1)
+    docket_printer.print_docket_to_printer(db, 2)
+
+    job = docket_printer.claim_next_job(db, printer="office")
+    assert job["filename"] == first["filename"]
+    assert (job["status"], job["printer"], job["attempts"]) == ("claimed", "office", 1)
+
+    # The second watcher gets the next job, then nothing
+    assert docket_printer.claim_next_job(db, printer="yard")["docket_id"] == 2
+    assert docket_printer.claim_next_job(db, printer="yard") is None
+
+    docket_printer.update_job_status(db, job["id"], "printing")
+    assert docket_printer.check_print_status(db, first["filename"])["status"] == "printing"
+    docket_printer.update_job_status(db, job["id"], "done")
+    assert docket_printer.check_print_status(db, first["filename"])["status"] == "completed"
+
+    # A finished job can't be reported again
+    with pytest.raises(HTTPException) as exc:
+        docket_printer.update_job_status(db, job["id"], "printing")
+    assert exc.value.status_code == 409
+
+# ==========================================
+# 3. TEST: A failed lp is a failure, with its error, per printer
+# ==========================================
+def test_failure_recorded_in_stats(db, spool):
+    docket_printer.print_docket_to_printer(db, 1)
+    ok = docket_printer.claim_next_job(db, "office")
+    docket_printer.update_job_status(db, ok["id"], "done")
+
+    bad = docket_printer.print_docket_to_printer(db, 2)
+    job = docket_printer.claim_next_job(db, "office")
+    docket_printer.update_job_status(db, job["id"], "failed", "lp: The printer or class does not exist.")
+
+    status = docket_printer.check_print_status(db, bad["filename"])
+    assert status["status"] == "failed"
+    assert "does not exist" in status["job"]["error"]
+
+    office = docket_printer.get_print_stats(db)["printers"]["office"]
+    assert (office["done"], office["failed"], office["failure_rate"]) == (1, 1, 0.5)
+    assert office["last_error"].startswith("lp:")
+
+# ==========================================
+# 4. TEST: Abandoned claims are re-queued, abandoned prints are failed
+# ==========================================
+def test_stale_claims_expire(db, spool):
+    long_ago = datetime.now() - timedelta(seconds=docket_printer.PRINT_CLAIM_TIMEOUT + 60)
+    db.add_all([
+        PrintJob(filename="claimed.pdf", copies=1, status="claimed", attempts=1, created_at=long_ago, claimed_at=long_ago),
+        PrintJob(filename="printing.pdf", copies=1, status="printing", attempts=1, created_at=long_ago, claimed_at=long_ago),
+    ])
+    db.commit()
+
+    job = docket_printer.claim_next_job(db, "office")
+    assert (job["filename"], job["attempts"]) == ("claimed.pdf", 2)
+    assert docket_printer.check_print_status(db, "printing.pdf")["status"] == "failed"
+
+# ==========================================
+# 5. TEST: Queue writes don't trigger backups
+# ==========================================
+def test_print_jobs_not_backed_up(db, spool):
+    touched = []
+    with patch("app.database.ON_UPDATE_BACKUP_MODE", "dump"), \
+         patch("app.database.backup_worker.notify_commit", lambda tables: touched.append(tables)), \
+         patch("app.database.backup_metrics.note_commit", lambda: None):
+        docket_printer.print_docket_to_printer(db, 1)
+        job = docket_printer.claim_next_job(db, "office")
+        docket_printer.update_job_status(db, job["id"], "done")
+    assert touched == []
@@ -0,0 +1,137 @@
+# backend/tests/docket/print_routing_test.py
+
+import io
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.docketModels import Docket
+from app.models.printModels import PrintJob
+from app.services.docket import docket_printer, print_routing
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    session.add_all([
+        Docket(id=1, scrdkt_number="SCR1", docket_date=date(2024, 1, 1), docket_type="Customer"),
+        Docket(id=2, scrdkt_number="SCR2", docket_date=date(2024, 1, 1), docket_type="Sales"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def queues(tmp_path):
+    """Queues office + yard; Sales dockets and the weighbridge terminal go to the yard."""
+    print_routing.clear()
+    with patch.object(print_routing, "PRINT_QUEUES", ["office", "yard"]), \
+         patch.object(print_routing, "ROUTES", print_routing.parse_routes("docket_type:Sales=yard; terminal:Weighbridge=yard")), \
+         patch.object(docket_printer, "SPOOL_DIR", str(tmp_path)), \
+         patch.object(docket_printer, "generate_docket_pdf", lambda db, docket_id: io.BytesIO(b"%PDF-1.7")), \
+         patch.object(docket_printer.docket_prerender, "claim", lambda docket_id: False), \
+         patch.object(docket_printer.docket_prerender, "record_print", lambda *args: None):
+        print_routing.note_seen("office")
+        print_routing.note_seen("yard")
+        yield
+    print_routing.clear()
+
+def job(db, filename):
+    return db.query(PrintJob).filter(PrintJob.filename == filename).first()
+
+# ==========================================
+# 1. TEST: Routes by docket type and terminal, otherwise least busy
+# ==========================================
+def test_routing_rules(db, queues):
+    sales = docket_printer.print_docket_to_printer(db, 2)
+    assert (sales["queue"], job(db, sales["filename"]).route) == ("yard", "docket_type")
+    assert "_Q-yard_" in sales["filename"] and sales["filename"].startswith("PRINT_Qty-1_ID-2_")
+
+    terminal = docket_printer.print_docket_to_printer(db, 1, terminal="weighbridge", copies=2)
+    assert (terminal["queue"], job(db, terminal["filename"]).route) == ("yard", "terminal")
+
+    # The yard now has two jobs waiting, so unrouted dockets go to the office
+    other = docket_printer.print_docket_to_printer(db, 1, copies=3)
+    assert (other["queue"], job(db, other["filename"]).route) == ("office", "least_busy")
+
+    with pytest.raises(HTTPException) as exc:
+        docket_printer.print_docket_to_printer(db, 1, queue="basement")
+    assert exc.value.status_code == 400
+
+# ==========================================
+# 2. TEST: Each watcher claims its own queue's jobs
+# ==========================================
+def test_watchers_claim_their_queue(db, queues):
+    sales = docket_printer.print_docket_to_printer(db, 2)
+    office = docket_printer.print_docket_to_printer(db, 1, queue="office")
+
+    assert docket_printer.claim_next_job(db, "office")["filename"] == office["filename"]
+    # The yard's job isn't stalled, so the office doesn't take it
+    assert docket_printer.claim_next_job(db, "office") is None
+    assert docket_printer.claim_next_job(db, "yard")["filename"] == sales["filename"]
+
+# ==========================================
+# 3. TEST: Failover away from a stalled queue
+# ==========================================
+def test_failover_from_stalled_queue(db, queues):
+    waiting = docket_printer.print_docket_to_printer(db, 2)   # routed to the yard
+    assert waiting["queue"] == "yard"
+
+    # The yard's watcher stops asking for work
+    with patch.object(print_routing, "_last_seen", {"office": print_routing.time.time(), "yard": 0}):
+        stats = print_routing.get_queue_stats(db)["queues"]
+        assert stats["yard"]["stalled"] and not stats["office"]["stalled"]
+
+        # New Sales dockets go to the office instead...
+        rerouted = docket_printer.print_docket_to_printer(db, 2)
+        assert (rerouted["queue"], job(db, rerouted["filename"]).route) == ("office", "failover")
+
+        # ...and the office takes over what was waiting on the yard
+        docket_printer.claim_next_job(db, "office")
+        taken = docket_printer.claim_next_job(db, "office")
+    assert taken["filename"] == waiting["filename"]
+    assert (taken["queue"], taken["route"], taken["printer"]) == ("office", "failover", "office")
+
+def test_old_backlog_counts_as_stalled(db, queues):
+    long_ago = datetime.now() - timedelta(seconds=print_routing.PRINT_QUEUE_STALL_SECONDS + 5)
+    db.add(PrintJob(filename="old.pdf", queue="yard", copies=1, status="queued", attempts=0, created_at=long_ago))
+    db.commit()
+    assert print_routing.stalled_queues(db) == {"yard"}
+
+# ==========================================
+# 4. TEST: Per-queue depth and throughput
+# ==========================================
+def test_queue_stats(db, queues):
+    for _ in range(3):
+        docket_printer.print_docket_to_printer(db, 2)
+    done = docket_printer.claim_next_job(db, "yard")
+    docket_printer.update_job_status(db, done["id"], "done")
+    docket_printer.claim_next_job(db, "yard")
+
+    yard = print_routing.get_queue_stats(db)["queues"]["yard"]
+    assert (yard["queued"], yard["claimed"], yard["depth"]) == (1, 1, 2)
+    assert (yard["done_last_hour"], yard["failed_last_hour"]) == (1, 0)
+
+# ==========================================
+# 5. TEST: Without queues nothing is routed (existing watchers keep working)
+# ==========================================
+def test_no_queues_configured(db, tmp_path):
+    with patch.object(docket_printer, "SPOOL_DIR", str(tmp_path)), \
+         patch.object(docket_printer, "generate_docket_pdf", lambda db, docket_id: io.BytesIO(b"%PDF-1.7")), \
+         patch.object(print_routing, "PRINT_QUEUES", []):
+        result = docket_printer.print_docket_to_printer(db, 2)
+        assert result["queue"] is None and "_Q-" not in result["filename"]
+        assert docket_printer.claim_next_job(db, "anything")["filename"] == result["filename"]
+
+def test_invalid_route_rejected():
+    with pytest.raises(ValueError):
+        print_routing.parse_routes("colour:red=office")
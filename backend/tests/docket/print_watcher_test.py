@@ -0,0 +1,234 @@
+# backend/tests/docket/print_watcher_test.py
+
+import sys
+import time
+import threading
+import pytest
+
+import print_watcher
+
+class FakeBackend:
+    """In-memory /print-jobs API: hands out queued jobs, records every status report."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queued = []
+        self.reports = []
+
+    def add(self, job_id, filename, copies=1, queue=None):
+        with self.lock:
+            self.queued.append({"id": job_id, "filename": filename, "copies": copies, "queue": queue})
+
+    def claim(self, queue):
+        with self.lock:
+            for job in self.queued:
+                if job["queue"] in (None, queue):
+                    self.queued.remove(job)
+                    return job
+            return None
+
+    def report(self, job_id, status, error=None):
+        with self.lock:
+            self.reports.append((job_id, status, error))
+
+    def final(self, job_id):
+        with self.lock:
+            statuses = [(s, e) for j, s, e in self.reports if j == job_id and s in ("done", "failed")]
+        return statuses[-1] if statuses else None
+
+def fake_lp(tmp_path, sleep=0.0, fail_until=0):
+    """
+    lp stand-in: logs its arguments with start/end times, sleeps, and fails for files
+    containing "fail" (or for the first `fail_until` calls per file).
+    """
+    script = tmp_path / "fake_lp.py"
+    script.write_text(f"""
+import sys, time, os
+log = {str(tmp_path / "lp.log")!r}
+path = sys.argv[-1]
+counter = path + ".calls"
+calls = int(open(counter).read()) + 1 if os.path.exists(counter) else 1
+open(counter, "w").write(str(calls))
+start = time.time()
+time.sleep({sleep})
+with open(log, "a") as f:
+    f.write(f"{{start}} {{time.time()}} {{' '.join(sys.argv[1:])}}\\n")
+if "fail" in os.path.basename(path) or calls <= {fail_until}:
+    print("lp: printer not responding", file=sys.stderr)
+    sys.exit(1)
+""")
+    return f"{sys.executable} {script}"
+
+def lp_calls(tmp_path):
+    log = tmp_path / "lp.log"
+    if not log.exists():
+        return []
+    return [line.split(" ", 2) for line in log.read_text().splitlines()]
+
+@pytest.fixture
+def spool(tmp_path):
+    path = tmp_path / "print_spool"
+    path.mkdir()
+    return path
+
+def start(watcher):
+    thread = threading.Thread(target=watcher.run, daemon=True)
+    thread.start()
+    time.sleep(0.1)
+    return thread
+
+def drop(spool, backend, job_id, name, copies=1, queue=None):
+    """Writes the PDF then queues its job, in the backend's order."""
+    (spool / name).write_bytes(b"%PDF-1.7")
+    backend.add(job_id, name, copies, queue)
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+# ==========================================
+# 1. TEST: A dropped file is printed right away and reported done
+# ==========================================
+@pytest.mark.parametrize("polling", [False, True])
+def test_drop_prints_and_reports(tmp_path, spool, polling):
+    backend = FakeBackend()
+    watcher = print_watcher.PrintWatcher(backend, ["default"], spool_dir=str(spool), poll_seconds=30,
+                                         lp_command=fake_lp(tmp_path), polling=polling)
+    thread = start(watcher)
+    if not polling:
+        assert watcher.watcher.mode == "inotify"
+
+    drop(spool, backend, 1, "PRINT_Qty-2_ID-5_1.pdf", copies=2)
+    assert wait_for(lambda: backend.final(1))
+    watcher.stop()
+    thread.join(5)
+
+    assert backend.final(1) == ("done", None)
+    assert [s for j, s, _ in backend.reports] == ["printing", "done"]
+    args = lp_calls(tmp_path)[0][2].split()
+    assert args[:2] == ["-n", "2"] and "-d" not in args
+    assert not (spool / "PRINT_Qty-2_ID-5_1.pdf").exists()
+
+    # Drop-to-lp latency is measured; without the 30s poll it comes from the file event
+    latency = watcher.latency.summary()
+    assert latency["count"] == 1
+    assert latency["max_ms"] < 2000
+
+# ==========================================
+# 2. TEST: Jobs on a queue print in parallel, up to --parallel
+# ==========================================
+def test_parallel_lp_per_queue(tmp_path, spool):
+    backend = FakeBackend()
+    watcher = print_watcher.PrintWatcher(backend, ["office"], spool_dir=str(spool), parallel=3, poll_seconds=30,
+                                         lp_command=fake_lp(tmp_path, sleep=0.5))
+    thread = start(watcher)
+    for job_id in range(1, 7):
+        drop(spool, backend, job_id, f"job{job_id}.pdf")
+    assert wait_for(lambda: all(backend.final(j) for j in range(1, 7)), timeout=10)
+    watcher.stop()
+    thread.join(5)
+
+    calls = lp_calls(tmp_path)
+    assert len(calls) == 6
+    assert all("-d office" in c[2] for c in calls)
+    # Never more than 3 lp processes at once, and more than one at some point
+    spans = [(float(s), float(e)) for s, e, _ in calls]
+    overlap = max(sum(1 for s2, e2 in spans if s2 < e and e2 > s) for s, e in spans)
+    assert 1 < overlap <= 3
+
+# ==========================================
+# 3. TEST: Each queue prints to its own destination; a slow one doesn't hold up the other
+# ==========================================
+def test_queues_map_to_destinations(tmp_path, spool):
+    backend = FakeBackend()
+    watcher = print_watcher.PrintWatcher(backend, ["office=HP_Office", "yard=Brother_Yard"], spool_dir=str(spool),
+                                         parallel=1, poll_seconds=30, lp_command=fake_lp(tmp_path, sleep=0.3))
+    thread = start(watcher)
+    for job_id in range(1, 4):
+        drop(spool, backend, job_id, f"PRINT_Qty-1_ID-{job_id}_Q-yard_1.pdf", queue="yard")
+    drop(spool, backend, 4, "PRINT_Qty-1_ID-4_Q-office_1.pdf", queue="office")
+    assert wait_for(lambda: all(backend.final(j) for j in range(1, 5)), timeout=10)
+    watcher.stop()
+    thread.join(5)
+
+    yard = sorted((float(start), args) for start, _, args in lp_calls(tmp_path) if "_Q-yard_" in args)
+    office = [(float(start), args) for start, _, args in lp_calls(tmp_path) if "_Q-office_" in args]
+    assert len(yard) == 3 and all("-d Brother_Yard" in args for _, args in yard)
+    assert len(office) == 1 and "-d HP_Office" in office[0][1]
+    # The office job started before the yard's backlog (3 x 0.3s, one at a time) was through
+    assert office[0][0] < yard[-1][0]
+
+# ==========================================
+# 4. TEST: Failures are retried with backoff, then reported with lp's error
+# ==========================================
+def test_retry_then_fail(tmp_path, spool):
+    backend = FakeBackend()
+    watcher = print_watcher.PrintWatcher(backend, ["default"], spool_dir=str(spool), retries=2, retry_delay=0.05,
+                                         poll_seconds=30, lp_command=fake_lp(tmp_path, fail_until=1))
+    thread = start(watcher)
+    drop(spool, backend, 1, "flaky.pdf")
+    drop(spool, backend, 2, "fail.pdf")
+    assert wait_for(lambda: backend.final(1) and backend.final(2))
+    watcher.stop()
+    thread.join(5)
+
+    # First call failed, the retry printed it
+    assert backend.final(1) == ("done", None)
+    status, error = backend.final(2)
+    assert status == "failed" and "not responding" in error
+    assert len([c for c in lp_calls(tmp_path) if c[2].endswith("fail.pdf")]) == 3
+    assert (spool / "failed" / "fail.pdf").exists()
+    assert watcher.counts == {"done": 1, "failed": 1, "retries": 3}
+
+# ==========================================
+# 5. TEST: A job without its spool file fails without running lp
+# ==========================================
+def test_missing_file_reported(tmp_path, spool):
+    backend = FakeBackend()
+    backend.add(1, "gone.pdf")
+    watcher = print_watcher.PrintWatcher(backend, ["default"], spool_dir=str(spool), poll_seconds=30,
+                                         lp_command=fake_lp(tmp_path))
+    thread = start(watcher)
+    assert wait_for(lambda: backend.final(1))
+    watcher.stop()
+    thread.join(5)
+
+    assert backend.final(1) == ("failed", "Spool file missing")
+    assert lp_calls(tmp_path) == []
+
+# ==========================================
+# 6. TEST: Retries stop at the job deadline, before the backend's claim timeout
+# ==========================================
+def test_retries_bounded_by_deadline(tmp_path, spool):
+    backend = FakeBackend()
+    watcher = print_watcher.PrintWatcher(backend, ["default"], spool_dir=str(spool), retries=10, retry_delay=0.2,
+                                         poll_seconds=30, lp_command=fake_lp(tmp_path, sleep=0.1), job_deadline=0.6)
+    thread = start(watcher)
+    started = time.monotonic()
+    drop(spool, backend, 1, "fail.pdf")
+    assert wait_for(lambda: backend.final(1))
+    elapsed = time.monotonic() - started
+    watcher.stop()
+    thread.join(5)
+
+    status, error = backend.final(1)
+    assert status == "failed" and "gave up after" in error
+    assert elapsed < 1.5
+    assert len(lp_calls(tmp_path)) < 4
+
+def test_lp_timeout_capped_by_deadline(tmp_path, spool):
+    backend = FakeBackend()
+    watcher = print_watcher.PrintWatcher(backend, ["default"], spool_dir=str(spool), retries=2, retry_delay=0.05,
+                                         poll_seconds=30, lp_command=fake_lp(tmp_path, sleep=5), job_deadline=0.5)
+    thread = start(watcher)
+    started = time.monotonic()
+    drop(spool, backend, 1, "stuck.pdf")
+    assert wait_for(lambda: backend.final(1))
+    assert time.monotonic() - started < 2
+    watcher.stop()
+    thread.join(5)
+    assert "timed out" in backend.final(1)[1]
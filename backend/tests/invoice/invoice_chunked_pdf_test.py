@@ -0,0 +1,110 @@
+# backend/tests/invoice/invoice_chunked_pdf_test.py
+
+import io
+import re
+import pytest
+from datetime import date
+from unittest.mock import patch
+from pypdf import PdfReader, PdfWriter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.invoiceModels import Invoice, InvoiceItem, TransportItem
+from app.services import pdf_cache
+from app.services.invoice import invoice_pdf
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(invoice_pdf, "LARGE_INVOICE_ROWS", 8)
+    monkeypatch.setattr(invoice_pdf, "INVOICE_CHUNK_ROWS", 4)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def make_invoice(db, items):
+    inv = Invoice(scrinv_number="BIG01", invoice_date=date(2024, 1, 1), invoice_type="Container", bill_to_name="Buyer")
+    db.add(inv)
+    db.flush()
+    # Item i costs i * 10.00
+    db.add_all([InvoiceItem(invoice_id=inv.id, seal=f"SEAL{i}", container_number=f"CTR{i}", description="Copper",
+                            quantity=1, price=i * 10) for i in range(1, items + 1)])
+    db.add(TransportItem(invoice_id=inv.id, name="TRUCKCO", num_of_ctr=1, price_per_ctr=5))
+    db.commit()
+    return inv.id
+
+def fake_render(html, **kwargs):
+    """One page per chunk; the page-number overlay gets one page per <div>."""
+    writer = PdfWriter()
+    for _ in range(html.count("<div></div>") + 1 if "counter(pages)" in html else 1):
+        writer.add_blank_page(width=842, height=1191)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+# ==========================================
+# 1. TEST: Chunks carry the running total and split header/footer
+# ==========================================
+def test_large_invoice_is_split_into_chunks(db):
+    invoice_id = make_invoice(db, 10)
+    chunks = invoice_pdf.render_invoice_chunks(db, invoice_id)
+
+    assert len(chunks) == 3
+    assert "invoice_header_logo.png" in chunks[0] and "(continued)" not in chunks[0]
+    assert all("(continued)" in c and "invoice_header_logo.png" not in c for c in chunks[1:])
+    assert [len(re.findall(r"SEAL\d+<", c)) for c in chunks] == [4, 4, 2]
+
+    # Items 1-4 = 100.00, items 5-8 = 260.00 more
+    assert "Carried forward" in chunks[0] and "100.00" in chunks[0]
+    assert "Brought forward" in chunks[1] and "360.00" in chunks[1]
+    assert "Brought forward" in chunks[2] and "Carried forward" not in chunks[2]
+
+    # Transport, totals and payment details only at the end
+    assert all("TRUCKCO" not in c and "SEND PAYMENT TO" not in c for c in chunks[:2])
+    assert "TRUCKCO" in chunks[2] and "SEND PAYMENT TO" in chunks[2]
+
+def test_small_invoice_is_not_chunked(db):
+    assert invoice_pdf.render_invoice_chunks(db, make_invoice(db, 5)) is None
+
+# ==========================================
+# 2. TEST: Chunk PDFs are joined in order and numbered
+# ==========================================
+def test_chunked_pdf_joins_pages(db):
+    invoice_id = make_invoice(db, 10)
+    pdf_cache.clear()
+    with patch.object(invoice_pdf.pdf_render_pool.pool, "render", side_effect=fake_render) as render:
+        pdf = invoice_pdf.generate_invoice_pdf(db, invoice_id).getvalue()
+
+    assert len(PdfReader(io.BytesIO(pdf)).pages) == 3
+    # 3 chunks + 1 page-number overlay, chunks with the pre-parsed stylesheet
+    assert render.call_count == 4
+    assert sum(1 for c in render.call_args_list if c.kwargs.get("stylesheet") == invoice_pdf.STYLESHEET) == 3
+    overlay = next(c.args[0] for c in render.call_args_list if "counter(pages)" in c.args[0])
+    assert "size: 842.0pt 1191.0pt" in overlay
+
+# ==========================================
+# 3. TEST: The invoice data is built once per PDF, and exports chunk too
+# ==========================================
+def test_small_invoice_builds_context_once(db):
+    invoice_id = make_invoice(db, 5)
+    pdf_cache.clear()
+    with patch.object(invoice_pdf.pdf_render_pool.pool, "render", side_effect=fake_render), \
+         patch.object(invoice_pdf, "get_invoice_context", wraps=invoice_pdf.get_invoice_context) as context:
+        invoice_pdf.generate_invoice_pdf(db, invoice_id)
+    assert context.call_count == 1
+
+def test_export_renders_large_invoice_in_chunks(db):
+    from app.services import batch_export
+
+    invoice_id = make_invoice(db, 10)
+    with patch.object(invoice_pdf.pdf_render_pool.pool, "render", side_effect=fake_render) as render:
+        pdf = batch_export._render_pdf(engine, "invoice", invoice_id)
+
+    assert len(PdfReader(io.BytesIO(pdf)).pages) == 3
+    assert render.call_count == 4
@@ -0,0 +1,98 @@
+# backend/tests/invoice/invoice_list_test.py
+
+import pytest
+from datetime import date
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.invoiceModels import Invoice
+from app.services import list_pagination
+from app.services.invoice import invoice_list
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    list_pagination.clear()
+    session = TestingSessionLocal()
+    # Paid and unpaid, repeated dates and undated invoices: every part of the sort key matters
+    dates = [date(2024, 1, 5), date(2024, 1, 5), None, date(2024, 2, 1), date(2023, 12, 31), None, date(2024, 1, 5)]
+    for i in range(21):
+        session.add(Invoice(
+            scrinv_number=f"A{i:04d}", bill_to_name=f"Customer {i}",
+            status="Paid" if i % 3 == 0 else "Draft", invoice_date=dates[i % len(dates)],
+        ))
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def ids(result):
+    return [row["id"] for row in result["data"]]
+
+def by_page(db, limit):
+    pages, page = [], 1
+    while True:
+        result = invoice_list.get_invoices_paginated(db, page, limit)
+        if not result["data"]:
+            return pages
+        pages.append(ids(result))
+        page += 1
+
+# ==========================================
+# 1. TEST: Cursors walk the same pages as page numbers, both ways
+# ==========================================
+def test_cursor_pages_match_offset_pages(db):
+    expected = by_page(db, 4)
+    assert sum(len(p) for p in expected) == 21
+
+    first = invoice_list.get_invoices_paginated(db, 1, 4)
+    assert first["prev_cursor"] is None
+    walked, result = [ids(first)], first
+    while result["next_cursor"]:
+        result = invoice_list.get_invoices_paginated(db, limit=4, cursor=result["next_cursor"])
+        walked.append(ids(result))
+    assert walked == expected
+    assert result["page"] is None and result["total"] == 21
+
+    back = [ids(result)]
+    while result["prev_cursor"]:
+        result = invoice_list.get_invoices_paginated(db, limit=4, cursor=result["prev_cursor"])
+        back.append(ids(result))
+    assert back[::-1] == expected
+
+    # Unpaid first, newest first (undated first), then id
+    order = sorted(db.query(Invoice).all(), key=lambda inv: (
+        inv.status == "Paid", inv.invoice_date is not None, -(inv.invoice_date or date.min).toordinal(), -inv.id
+    ))
+    assert sum(walked, []) == [inv.id for inv in order]
+
+# ==========================================
+# 2. TEST: The total is optional, and cached in cursor mode until an invoice is saved
+# ==========================================
+def test_total_optional_and_cached(db):
+    first = invoice_list.get_invoices_paginated(db, 1, 5, include_total=False)
+    assert first["total"] is None
+
+    cursor = first["next_cursor"]
+    assert invoice_list.get_invoices_paginated(db, limit=5, cursor=cursor)["total"] == 21
+    db.add(Invoice(scrinv_number="Z0001", bill_to_name="Late", invoice_date=date(2020, 1, 1)))
+    db.commit()
+    assert invoice_list.get_invoices_paginated(db, limit=5, cursor=cursor)["total"] == 21
+    # Page mode always counts
+    assert invoice_list.get_invoices_paginated(db, 1, 5)["total"] == 22
+
+    list_pagination.invalidate_counts("invoice")
+    assert invoice_list.get_invoices_paginated(db, limit=5, cursor=cursor)["total"] == 22
+
+def test_invalid_cursor_rejected(db):
+    docket_cursor = list_pagination.encode_cursor("docket", "next", [5])
+    for cursor in ["not-a-cursor", docket_cursor, list_pagination.encode_cursor("invoice", "next", ["x", None, 1])]:
+        with pytest.raises(HTTPException) as exc:
+            invoice_list.get_invoices_paginated(db, limit=5, cursor=cursor)
+        assert exc.value.status_code == 400
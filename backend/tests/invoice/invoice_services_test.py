@@ -119,7 +119,7 @@ def test_get_unique_selectors(db):
 # We assume WeasyPrint is hard to run in some test environments, 
 # so we check if the HTML renders and variables are passed correctly.
 
-@patch("app.services.invoice.invoice_pdf.HTML") # Mock WeasyPrint
+@patch("app.services.pdf_render_pool.HTML") # Mock WeasyPrint (renders inline: PDF_RENDER_WORKERS=0 in conftest)
 def test_generate_invoice_pdf_success(mock_html, db):
     # Setup Data
     inv = Invoice(
@@ -159,10 +159,10 @@ def test_render_html_logic(db):
     db.add(inv)
     db.commit()
 
-    # We patch environment loading to avoid needing real template files
-    with patch("app.services.invoice.invoice_pdf.Environment") as mock_env:
+    # We patch template loading to avoid needing real template files
+    with patch("app.services.render_resources.get_template") as mock_get_template:
         mock_template = MagicMock()
-        mock_env.return_value.get_template.return_value = mock_template
+        mock_get_template.return_value = mock_template
         
         # Action
         invoice_pdf.render_invoice_html(db, inv.id)
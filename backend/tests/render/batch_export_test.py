@@ -0,0 +1,106 @@
+# backend/tests/render/batch_export_test.py
+
+import io
+import zipfile
+import threading
+import pytest
+from datetime import date
+from unittest.mock import patch
+from pypdf import PdfReader, PdfWriter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.docketModels import Docket
+from app.services import batch_export
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_export, "EXPORT_DIR", str(tmp_path))
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    for day in (1, 5, 10, 20):
+        session.add(Docket(scrdkt_number=f"D{day:03d}", customer_name=f"Customer {day}", docket_date=date(2024, 3, day)))
+    session.add(Docket(scrdkt_number="EMPTY", customer_name="", docket_date=date(2024, 3, 2))) # hidden from the list
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+def one_page_pdf(_html, **kwargs):
+    writer = PdfWriter()
+    writer.add_blank_page(width=100, height=100)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+def run_export(db, fmt, **filters):
+    with patch("app.services.docket.docket_pdf.render_docket_html", lambda db, docket_id, **kwargs: f"<p>{docket_id}</p>"), \
+         patch.object(batch_export.pdf_render_pool.pool, "render", side_effect=one_page_pdf):
+        job = batch_export.start_export(db, "docket", fmt, **filters)
+        batch_export.get_job(job["id"]).future.result(10)
+    return batch_export.get_status(job["id"])
+
+# ==========================================
+# 1. TEST: ZIP uses the list filters
+# ==========================================
+def test_zip_export_uses_list_filters(db):
+    status = run_export(db, "zip", start_date=date(2024, 3, 2), end_date=date(2024, 3, 15))
+
+    assert status["status"] == "done"
+    assert (status["total"], status["done"], status["failed"]) == (2, 2, 0)
+    path, filename, media_type = batch_export.get_download(status["id"])
+    assert filename == "dockets_2024-03-02_2024-03-15.zip" and media_type == "application/zip"
+    with zipfile.ZipFile(path) as archive:
+        assert archive.namelist() == ["docket_D005.pdf", "docket_D010.pdf"]
+
+# ==========================================
+# 2. TEST: Merged PDF has one page per docket, in date order
+# ==========================================
+def test_merged_pdf_export(db):
+    status = run_export(db, "pdf")
+
+    assert status["status"] == "done" and status["done"] == 4
+    path, _, _ = batch_export.get_download(status["id"])
+    reader = PdfReader(path)
+    assert len(reader.pages) == 4
+    assert [item.title for item in reader.outline] == ["docket D001", "docket D005", "docket D010", "docket D020"]
+
+# ==========================================
+# 3. TEST: Cancelling stops the export and leaves no file
+# ==========================================
+def test_cancel_running_export(db, monkeypatch):
+    monkeypatch.setattr(batch_export, "EXPORT_CONCURRENCY", 1)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_render(html, **kwargs):
+        started.set()
+        release.wait(2)
+        return one_page_pdf(html)
+
+    with patch("app.services.docket.docket_pdf.render_docket_html", lambda db, docket_id, **kwargs: ""), \
+         patch.object(batch_export.pdf_render_pool.pool, "render", side_effect=slow_render):
+        job = batch_export.start_export(db, "docket", "zip")
+        assert started.wait(2)
+        batch_export.cancel_export(job["id"])
+        release.set()
+        batch_export.get_job(job["id"]).future.result(10)
+
+    status = batch_export.get_status(job["id"])
+    assert status["status"] == "cancelled"
+    assert status["done"] < 4
+    with pytest.raises(Exception):
+        batch_export.get_download(job["id"])
+
+# ==========================================
+# 4. TEST: Oversized ranges are refused up front
+# ==========================================
+def test_export_limit(db, monkeypatch):
+    monkeypatch.setattr(batch_export, "EXPORT_MAX_DOCUMENTS", 3)
+    with pytest.raises(Exception) as exc:
+        batch_export.start_export(db, "docket", "zip")
+    assert exc.value.status_code == 400
@@ -0,0 +1,43 @@
+# backend/tests/render/docket_render_test.py
+
+import pytest
+from datetime import date
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.docketModels import Docket
+from app.services.docket import docket_pdf
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+# ==========================================
+# 1. TEST: The company block (logo, name, address) is rendered
+# ==========================================
+@pytest.mark.parametrize("company, logo", [
+    ("SAFARI COPPER RECYCLING PTY LTD", "safari_copper_recycling_logo.png"),
+    ("Other Metals Pty Ltd", "Recycling_Icon.png"),
+])
+def test_company_block_rendered(db, company, logo):
+    db.add(Docket(id=1, scrdkt_number="SCR1", docket_date=date(2024, 1, 1), is_saved=True,
+                  company_name=company, company_address="1 Foundry Rd", customer_name="Taqi"))
+    db.commit()
+
+    html = docket_pdf.render_docket_html(db, 1, inline_css=False)
+    assert html.count('class="company-logo"') == 1
+    assert f'src="asset:{logo}' in html
+    assert html.count('class="company-text"') == 1
+    assert "1 Foundry Rd" in html
+
+    preview = docket_pdf.render_docket_html(db, 1, asset_base="/api/assets")
+    assert f'src="/api/assets/{logo}' in preview
@@ -0,0 +1,65 @@
+# backend/tests/render/font_subset_test.py
+
+import io
+import os
+import shutil
+import pytest
+from fontTools.ttLib import TTFont
+
+from app.services import render_resources, font_subset
+
+REAL_FONT = os.path.join(render_resources.TEMPLATE_DIR, render_resources.FONT_FILE)
+
+@pytest.fixture
+def template_dir(tmp_path, monkeypatch):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    shutil.copy(REAL_FONT, templates / render_resources.FONT_FILE)
+    monkeypatch.setattr(render_resources, "TEMPLATE_DIR", str(templates))
+    monkeypatch.setattr(font_subset, "FONT_CACHE_DIR", str(tmp_path / "fonts"))
+    render_resources.clear()
+    yield templates
+    render_resources.clear()
+
+# ==========================================
+# 1. TEST: Weights come from the templates
+# ==========================================
+def test_weights_follow_the_stylesheets(template_dir):
+    (template_dir / "styles.css").write_text("h1 { font-weight: 600; } p { font-weight: normal; } b { font-weight: bold }")
+    assert font_subset.get_weights() == (400, 600, 700)
+
+    css = render_resources.get_css("styles.css")
+    for weight in (400, 600, 700):
+        assert f"url(asset:{font_subset.instance_name(weight)})" in css
+        assert f"font-weight: {weight};" in css
+    assert render_resources.FONT_FILE not in css
+
+# ==========================================
+# 2. TEST: Instances are static, subsetted and cached on disk
+# ==========================================
+def test_instance_is_static_subset(template_dir):
+    data = render_resources.url_fetcher(f"asset:{font_subset.instance_name(700)}")["string"]
+
+    font = TTFont(io.BytesIO(data))
+    assert "fvar" not in font
+    assert ord("A") in font.getBestCmap() and ord("€") in font.getBestCmap()
+    assert ord("あ") not in font.getBestCmap()
+    assert len(data) < os.path.getsize(REAL_FONT) / 2
+
+    # A second process (render worker) reads it from disk instead of regenerating
+    assert font_subset.stats()["generated"] == 1
+    font_subset.clear()
+    assert font_subset.get_instance(700) == data
+    assert font_subset.stats()["generated"] == 0
+    assert font_subset.stats()["disk_hits"] == 1
+
+# ==========================================
+# 3. TEST: A broken font falls back to the variable font
+# ==========================================
+def test_broken_font_falls_back(template_dir):
+    (template_dir / render_resources.FONT_FILE).write_bytes(b"not a font")
+    (template_dir / "styles.css").write_text("body { color: red; }")
+
+    css = render_resources.get_css("styles.css")
+    assert f"url(asset:{render_resources.FONT_FILE})" in css
+    assert font_subset.stats()["disabled_reason"]
@@ -0,0 +1,88 @@
+# backend/tests/render/pdf_cache_test.py
+
+import os
+import pytest
+
+from app.services import pdf_cache, render_resources
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(render_resources, "version", lambda: "v1")
+    monkeypatch.setattr(pdf_cache, "PDF_CACHE_DIR", "")
+    monkeypatch.setattr(pdf_cache, "_stats", {k: 0 for k in pdf_cache._stats})
+    pdf_cache.clear()
+    yield
+    pdf_cache.clear()
+
+class Renderer:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, html):
+        self.calls += 1
+        return f"%PDF {html}".encode()
+
+# ==========================================
+# 1. TEST: Same content renders once
+# ==========================================
+def test_same_content_is_rendered_once():
+    render = Renderer()
+
+    first = pdf_cache.get_or_render("docket", 1, "<p>A</p>", render)
+    second = pdf_cache.get_or_render("docket", 1, "<p>A</p>", render)
+
+    assert first.read() == second.read() == b"%PDF <p>A</p>"
+    assert render.calls == 1
+    assert pdf_cache.stats()["hits"] == 1
+    assert pdf_cache.stats()["misses"] == 1
+
+# ==========================================
+# 2. TEST: Saves and template edits invalidate
+# ==========================================
+def test_invalidate_and_changed_content():
+    render = Renderer()
+    pdf_cache.get_or_render("invoice", 5, "<p>v1</p>", render)
+
+    pdf_cache.invalidate("invoice", 5)
+    assert pdf_cache.stats()["entries"] == 0
+
+    # Edited record: new content, new key, old entry replaced
+    pdf_cache.get_or_render("invoice", 5, "<p>v1</p>", render)
+    pdf_cache.get_or_render("invoice", 5, "<p>v2</p>", render)
+    assert render.calls == 3
+    assert pdf_cache.stats()["entries"] == 1
+
+def test_template_version_change_clears_cache(monkeypatch):
+    render = Renderer()
+    pdf_cache.get_or_render("docket", 1, "<p>A</p>", render)
+
+    monkeypatch.setattr(render_resources, "version", lambda: "v2")
+    pdf_cache.get_or_render("docket", 1, "<p>A</p>", render)
+    assert render.calls == 2
+
+# ==========================================
+# 3. TEST: LRU eviction and the disk tier
+# ==========================================
+def test_lru_evicts_oldest(monkeypatch):
+    monkeypatch.setattr(pdf_cache, "PDF_CACHE_MAX_ENTRIES", 2)
+    render = Renderer()
+    for docket_id in (1, 2, 3):
+        pdf_cache.get_or_render("docket", docket_id, f"<p>{docket_id}</p>", render)
+
+    assert pdf_cache.stats()["entries"] == 2
+    assert pdf_cache.stats()["evictions"] == 1
+    pdf_cache.get_or_render("docket", 1, "<p>1</p>", render)
+    assert render.calls == 4
+
+def test_disk_tier_survives_memory_clear(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_cache, "PDF_CACHE_DIR", str(tmp_path))
+    render = Renderer()
+    pdf_cache.get_or_render("docket", 1, "<p>A</p>", render)
+    pdf_cache.clear()
+
+    assert pdf_cache.get_or_render("docket", 1, "<p>A</p>", render).read() == b"%PDF <p>A</p>"
+    assert render.calls == 1
+    assert pdf_cache.stats()["disk_hits"] == 1
+
+    pdf_cache.invalidate("docket", 1)
+    assert not any(name.endswith(".pdf") for _, _, names in os.walk(tmp_path) for name in names)
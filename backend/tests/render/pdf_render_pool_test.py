@@ -0,0 +1,156 @@
+# backend/tests/render/pdf_render_pool_test.py
+
+import os
+import time
+import threading
+import pytest
+from unittest.mock import patch
+from concurrent.futures.process import BrokenProcessPool
+from fastapi import HTTPException
+
+from app.services import pdf_render_pool
+from app.services.pdf_render_pool import PdfRenderPool
+
+class SlowHTML:
+    """Stands in for weasyprint.HTML; write_pdf sleeps so renders overlap."""
+    delay = 0.3
+
+    def __init__(self, string, url_fetcher=None):
+        self.string = string
+
+    def write_pdf(self, target, **kwargs):
+        time.sleep(self.delay)
+        target.write(b"%PDF-" + self.string.encode())
+
+# ==========================================
+# 1. TEST: Inline rendering returns the PDF and records latency
+# ==========================================
+@patch("app.services.pdf_render_pool.HTML", SlowHTML)
+def test_inline_render_returns_pdf_and_stats():
+    pool = PdfRenderPool(workers=0, max_queue=4)
+
+    assert pool.render("<p>hi</p>") == b"%PDF-<p>hi</p>"
+
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["latency_seconds"]["max"] >= SlowHTML.delay
+
+# ==========================================
+# 2. TEST: A full queue rejects instead of piling up
+# ==========================================
+@patch("app.services.pdf_render_pool.HTML", SlowHTML)
+def test_full_queue_rejects_with_503():
+    pool = PdfRenderPool(workers=0, max_queue=1)
+    background = threading.Thread(target=pool.render, args=("<p>first</p>",))
+    background.start()
+    time.sleep(0.05)
+
+    with pytest.raises(HTTPException) as exc:
+        pool.render("<p>second</p>")
+    background.join()
+
+    assert exc.value.status_code == 503
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["completed"] == 1
+
+# ==========================================
+# 3. TEST: Render failures are counted and re-raised
+# ==========================================
+def test_failed_render_is_counted():
+    pool = PdfRenderPool(workers=0)
+    with patch.object(pdf_render_pool, "HTML", side_effect=ValueError("bad html")):
+        with pytest.raises(ValueError):
+            pool.render("<p>")
+    assert pool.stats()["failed"] == 1
+    assert pool.stats()["in_flight"] == 0
+
+# ==========================================
+# 4. TEST: Stylesheets are parsed once per process and rebuilt on change
+# ==========================================
+def test_stylesheet_is_parsed_once(monkeypatch):
+    css_text = {"value": "body { color: red; }"}
+    monkeypatch.setattr(pdf_render_pool.render_resources, "get_css", lambda name: css_text["value"])
+    monkeypatch.setattr(pdf_render_pool, "_style_state", {"font_config": None, "sheets": {}})
+    calls = []
+
+    class RecordingHTML(SlowHTML):
+        delay = 0
+        def write_pdf(self, target, **kwargs):
+            calls.append(kwargs)
+            super().write_pdf(target)
+
+    with patch.object(pdf_render_pool, "HTML", RecordingHTML), \
+         patch.object(pdf_render_pool, "CSS") as css, \
+         patch.object(pdf_render_pool, "FontConfiguration") as font_config:
+        pool = PdfRenderPool(workers=0)
+        pool.render("<p>a</p>", stylesheet="styles.css")
+        pool.render("<p>b</p>", stylesheet="styles.css")
+        assert css.call_count == 1 and font_config.call_count == 1
+        assert calls[0]["stylesheets"] == calls[1]["stylesheets"] == [css.return_value]
+        assert calls[0]["font_config"] is calls[1]["font_config"]
+
+        css_text["value"] = "body { color: blue; }"
+        pool.render("<p>c</p>", stylesheet="styles.css")
+        assert css.call_count == 2 and font_config.call_count == 2
+        assert css.call_args.kwargs["string"] == "body { color: blue; }"
+
+        pool.render("<p>d</p>")
+        assert calls[-1] == {}
+
+# ==========================================
+# 5. TEST: The worker process pool (spawned workers, recycling, timeout, crash)
+# ==========================================
+def pid_render(html_content, stylesheet=None):
+    """Picklable render for real workers: echoes the HTML and the worker's pid; "sleep" hangs, "die" crashes."""
+    if html_content == "sleep":
+        time.sleep(30)
+    if html_content == "die":
+        os._exit(1)
+    return f"%PDF-{html_content}:{os.getpid()}".encode(), 0.0
+
+def worker_pid(pdf):
+    return int(pdf.decode().rsplit(":", 1)[1])
+
+def test_process_pool_renders_and_recycles():
+    pool = PdfRenderPool(workers=1, max_tasks_per_child=2, render_fn=pid_render)
+    try:
+        first, second, third = (pool.render(f"<p>{i}</p>") for i in range(3))
+        assert first.startswith(b"%PDF-<p>0</p>:")
+        assert worker_pid(first) != os.getpid()
+        # Two renders per worker, then a fresh executor takes over
+        assert worker_pid(first) == worker_pid(second) != worker_pid(third)
+        stats = pool.stats()
+        assert (stats["completed"], stats["recycles"]) == (3, 1)
+    finally:
+        pool.shutdown()
+
+def test_process_pool_timeout_kills_worker():
+    pool = PdfRenderPool(workers=1, timeout=30, render_fn=pid_render)
+    try:
+        # Start the worker first: spawning it counts against the timeout
+        before = worker_pid(pool.render("<p>warm</p>"))
+        pool.timeout = 0.5
+        start = time.monotonic()
+        with pytest.raises(HTTPException) as exc:
+            pool.render("sleep")
+        assert exc.value.status_code == 504
+        assert time.monotonic() - start < 10
+        assert pool.stats()["timeouts"] == 1
+
+        # The stuck worker was killed; the next render gets a new one
+        pool.timeout = 30
+        assert worker_pid(pool.render("<p>after</p>")) != before
+    finally:
+        pool.shutdown()
+
+def test_process_pool_survives_worker_crash():
+    pool = PdfRenderPool(workers=1, render_fn=pid_render)
+    try:
+        # A crash is retried once on a fresh pool; crashing again, it is raised
+        with pytest.raises(BrokenProcessPool):
+            pool.render("die")
+        assert pool.stats()["recycles"] == 2
+        assert pool.render("<p>ok</p>").startswith(b"%PDF-<p>ok</p>")
+    finally:
+        pool.shutdown()
@@ -0,0 +1,103 @@
+# backend/tests/render/render_resources_test.py
+
+import os
+import base64
+import pytest
+
+from app.services import render_resources
+
+@pytest.fixture
+def template_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(render_resources, "TEMPLATE_DIR", str(tmp_path))
+    render_resources.clear()
+    yield tmp_path
+    render_resources.clear()
+
+def touch_later(path, content):
+    """Rewrites a file and pushes its mtime forward (some filesystems have coarse mtimes)."""
+    path.write_text(content)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+# ==========================================
+# 1. TEST: Files are read once, then served from memory
+# ==========================================
+def test_files_are_cached_until_they_change(template_dir):
+    logo = template_dir / "logo.png"
+    logo.write_bytes(b"\x89PNG-one")
+
+    first = render_resources.get_base64("logo.png")
+    second = render_resources.get_base64("logo.png")
+    assert first == second == base64.b64encode(b"\x89PNG-one").decode()
+    assert render_resources.stats()["misses"] == 1
+    assert render_resources.stats()["hits"] == 1
+
+    touch_later(logo, "changed")
+    assert render_resources.get_base64("logo.png") == base64.b64encode(b"changed").decode()
+    assert render_resources.stats()["misses"] == 2
+
+def test_missing_file_is_empty(template_dir):
+    assert render_resources.get_base64("nope.png") == ""
+    assert render_resources.get_css("nope.css") == ""
+
+# ==========================================
+# 2. TEST: CSS references the font by URL and follows edits
+# ==========================================
+def test_css_references_font_and_reloads(template_dir):
+    (template_dir / render_resources.FONT_FILE).write_bytes(b"font-bytes")
+    css = template_dir / "styles.css"
+    css.write_text("body { color: red; }")
+
+    result = render_resources.get_css("styles.css")
+    assert "font-family: 'Lexend'" in result
+    assert f"url(asset:{render_resources.FONT_FILE})" in result
+    assert base64.b64encode(b"font-bytes").decode() not in result
+    assert result.endswith("body { color: red; }")
+
+    preview = render_resources.get_css("styles.css", "/api/assets")
+    assert f"url(/api/assets/{render_resources.FONT_FILE}?v={render_resources.version()})" in preview
+
+    touch_later(css, "body { color: blue; }")
+    assert render_resources.get_css("styles.css").endswith("body { color: blue; }")
+
+# ==========================================
+# 3. TEST: Templates are compiled once and auto-reloaded
+# ==========================================
+def test_template_reloads_after_edit(template_dir):
+    page = template_dir / "page.html"
+    page.write_text("Hello {{ name }}")
+
+    assert render_resources.get_template("page.html").render(name="A") == "Hello A"
+    assert render_resources.get_template("page.html") is render_resources.get_template("page.html")
+
+    touch_later(page, "Bye {{ name }}")
+    assert render_resources.get_template("page.html").render(name="A") == "Bye A"
+
+# ==========================================
+# 4. TEST: url_fetcher serves assets from memory, never templates
+# ==========================================
+def test_url_fetcher_serves_cached_assets(template_dir):
+    (template_dir / "logo.png").write_bytes(b"\x89PNG-one")
+    (template_dir / "page.html").write_text("secret")
+
+    first = render_resources.url_fetcher("asset:logo.png")
+    second = render_resources.url_fetcher("asset:logo.png")
+    assert first["string"] == second["string"] == b"\x89PNG-one"
+    assert first["mime_type"] == "image/png"
+    assert render_resources.stats()["misses"] == 1
+    assert render_resources.stats()["asset_fetches"] == 2
+
+    for bad in ("asset:page.html", "asset:../main.py", "asset:missing.png"):
+        with pytest.raises(ValueError):
+            render_resources.url_fetcher(bad)
+
+def test_asset_route_serves_versioned_assets(template_dir, client):
+    (template_dir / "logo.png").write_bytes(b"\x89PNG-one")
+
+    response = client.get("/api/assets/logo.png?v=abc")
+    assert response.status_code == 200
+    assert response.content == b"\x89PNG-one"
+    assert response.headers["content-type"] == "image/png"
+    assert "immutable" in response.headers["cache-control"]
+
+    assert client.get("/api/assets/page.html").status_code == 404
@@ -43,6 +43,13 @@ export default function DefaultsTab({ form, currencies, units, selectors, onSave
                                 </Form.Item>
                             </Col>
                         </Row>
+                        <Row gutter={16}>
+                            <Col span={12}>
+                                <Form.Item label="Prepare PDF on Save (faster printing)" name="prerender_dockets" valuePropName="checked">
+                                    <Switch />
+                                </Form.Item>
+                            </Col>
+                        </Row>
                     </Card>
 
                     {/* --- INVOICE DEFAULTS --- */}
@@ -69,6 +69,7 @@ export default function Settings() {
           default_docket_currency: defData.default_docket_currency || defData.default_currency || 'AUD',
           default_docket_unit: defData.default_docket_unit || defData.default_unit || 'kg',
           default_docket_gst_percentage: Number(defData.default_docket_gst_percentage) || Number(defData.default_gst_percentage) || 10,
+          prerender_dockets: defData.prerender_dockets !== 'false', // on unless turned off
 
           // INVOICE DEFAULTS
           default_invoice_gst_enabled: defData.default_invoice_gst_enabled === 'true',
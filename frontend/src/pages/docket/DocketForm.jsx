@@ -19,7 +19,7 @@ import { useConfirmReset } from '../../scripts/utilities/confirmReset';
 import useInvoiceSelectors from '../../hooks/invoice/useInvoiceSelectors';
 
 // Utilities
-import { SaveDocket, DownloadPDFDocket, PrintDocket, CheckPrintStatus } from '../../scripts/utilities/docketUtils';
+import { SaveDocket, DownloadPDFDocket, PrintDocket, SubscribePrintStatus } from '../../scripts/utilities/docketUtils';
 import { getDefaults, getCurrencies, getUnits } from '../../services/settingsService';
 import docketService from '../../services/docketService'; 
 import '../../styles/Form.css'; 
@@ -118,29 +118,34 @@ export default function DocketForm({ mode = 'new', existingDocket = null }) {
         formValuesRef.current = allValues;
     };
 
-    // --- REUSABLE POLLING FUNCTION ---
+    // --- REUSABLE PRINT STATUS LISTENER ---
     const startPrintPolling = (filename, qty) => {
         setPrinting(true);
         message.info('Sending to printer, please wait...');
-        
-        let attempts = 0;
-        const maxRetries = 10;
-        
-        const pollInterval = setInterval(async () => {
-            attempts++;
-            const status = await CheckPrintStatus(filename);
 
-            if (status === 'completed') {
-                clearInterval(pollInterval);
-                setPrinting(false);
+        let unsubscribe = () => {};
+        let slowTimer = null;
+        const stop = () => {
+            clearTimeout(slowTimer);
+            unsubscribe();
+            setPrinting(false);
+        };
+
+        slowTimer = setTimeout(() => {
+            stop();
+            message.warning("Sent to queue, but printer script seems slow or offline.");
+        }, 10000);
+
+        unsubscribe = SubscribePrintStatus(filename, ({ status, job }) => {
+            if (status === 'completed' || status === 'printing') {
+                stop();
                 message.success(`Printing Started (${qty} copies)`);
-                
-            } else if (attempts >= maxRetries) {
-                clearInterval(pollInterval);
-                setPrinting(false);
-                message.warning("Sent to queue, but printer script seems slow or offline.");
+
+            } else if (status === 'failed') {
+                stop();
+                message.error(`Printing failed: ${job?.error || 'unknown error'}`);
             }
-        }, 1000);
+        });
     };
 
     // --- EFFECT: RESUME STATE AFTER REDIRECT ---
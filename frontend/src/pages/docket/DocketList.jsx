@@ -25,6 +25,8 @@ export default function DocketList() {
     pageSize: 10,
     total: 0
   });
+  // page -> cursor that starts it, from the neighbouring pages' responses
+  const cursors = useRef({});
 
   const [searchText, setSearchText] = useState('');
   const [dateRange, setDateRange] = useState(null);
@@ -51,7 +53,11 @@ export default function DocketList() {
           end = dates[1].format('YYYY-MM-DD');
       }
 
-      const response = await getAllDockets(page, pageSize, search, start, end);
+      // Pages next to one already loaded are fetched by cursor (an index seek), others by page number
+      if (page === 1) cursors.current = {};
+      const response = await getAllDockets(page, pageSize, search, start, end, cursors.current[page]);
+      if (response.next_cursor) cursors.current[page + 1] = response.next_cursor;
+      if (response.prev_cursor && page > 2) cursors.current[page - 1] = response.prev_cursor;
       
       setDockets(response.data);
       setPagination({
@@ -107,6 +113,7 @@ export default function DocketList() {
   };
 
   const handleTableChange = (newPagination) => {
+    if (newPagination.pageSize !== pagination.pageSize) cursors.current = {};
     setPagination(prev => ({ ...prev, current: newPagination.current, pageSize: newPagination.pageSize }));
   };
 
@@ -29,6 +29,8 @@ export default function InvoiceList() {
     pageSize: 10,
     total: 0
   });
+  // page -> cursor that starts it, from the neighbouring pages' responses
+  const cursors = useRef({});
 
   const [searchText, setSearchText] = useState('');
   const [dateRange, setDateRange] = useState(null);
@@ -70,7 +72,11 @@ export default function InvoiceList() {
           end = dates[1].format('YYYY-MM-DD');
       }
 
-      const response = await getAllInvoices(page, pageSize, search, start, end);
+      // Pages next to one already loaded are fetched by cursor (an index seek), others by page number
+      if (page === 1) cursors.current = {};
+      const response = await getAllInvoices(page, pageSize, search, start, end, cursors.current[page]);
+      if (response.next_cursor) cursors.current[page + 1] = response.next_cursor;
+      if (response.prev_cursor && page > 2) cursors.current[page - 1] = response.prev_cursor;
       
       setInvoices(response.data);
       setPagination({
@@ -126,6 +132,7 @@ export default function InvoiceList() {
   };
 
   const handleTableChange = (newPagination) => {
+    if (newPagination.pageSize !== pagination.pageSize) cursors.current = {};
     setPagination(prev => ({ ...prev, current: newPagination.current, pageSize: newPagination.pageSize }));
   };
 
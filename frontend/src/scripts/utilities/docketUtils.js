@@ -130,8 +130,10 @@ export const DownloadPDFDocket = async (docketId, scrdktID) => {
 
 export const PrintDocket = async (docketId, copies = 1) => {
   try {
+    // Optional per-computer name, matched by the backend's PRINT_ROUTES (terminal:<name>=<queue>)
+    const terminal = localStorage.getItem('printTerminal') || undefined;
     const res = await axios.post(`${API}/${docketId}/print`, null, {
-      params: { copies }
+      params: { copies, terminal }
     });
     return res.data;
   } catch (err) {
@@ -140,11 +142,30 @@ export const PrintDocket = async (docketId, copies = 1) => {
   }
 };
 
+// Calls onUpdate({ status, job }) as the print job changes: one Server-Sent Events
+// connection (resumes by itself after a dropped connection), or polling if the browser
+// has no EventSource. Returns a function that stops listening.
+export const SubscribePrintStatus = (filename, onUpdate) => {
+    if (typeof EventSource === 'undefined') {
+        const pollInterval = setInterval(async () => onUpdate(await CheckPrintStatus(filename)), 1000);
+        return () => clearInterval(pollInterval);
+    }
+
+    const source = new EventSource(`${API}/print-events?filename=${encodeURIComponent(filename)}`);
+    source.addEventListener('job', (event) => {
+        const job = JSON.parse(event.data);
+        onUpdate({ status: job.client_status, job });
+    });
+    // Missed events (server restarted): ask for the current state once
+    source.addEventListener('reset', async () => onUpdate(await CheckPrintStatus(filename)));
+    return () => source.close();
+};
+
 export const CheckPrintStatus = async (filename) => {
     try {
         const res = await axios.get(`${API}/print-status/${filename}`);
-        return res.data.status; 
+        return res.data; 
     } catch (err) {
-        return "error";
+        return { status: "error" };
     }
 }
\ No newline at end of file
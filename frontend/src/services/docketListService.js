@@ -4,13 +4,14 @@ import axios from 'axios';
 
 const API_URL = '/api/dockets';
 
-export const getAllDockets = async (page = 1, limit = 10, search = '', startDate = null, endDate = null) => {
+export const getAllDockets = async (page = 1, limit = 10, search = '', startDate = null, endDate = null, cursor = null) => {
   const params = {
     page,
     limit,
     search,
     start_date: startDate,
     end_date: endDate,
+    cursor: cursor || undefined, // next_cursor / prev_cursor of an adjacent page (faster than page)
     _t: new Date().getTime() // Cache buster
   };
   const response = await axios.get(`${API_URL}/list`, { params });
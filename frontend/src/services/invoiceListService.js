@@ -5,13 +5,14 @@ import axios from 'axios';
 const API_URL = '/api/invoices';
 
 // Get all invoices
-export const getAllInvoices = async (page = 1, limit = 10, search = '', startDate = null, endDate = null) => {
+export const getAllInvoices = async (page = 1, limit = 10, search = '', startDate = null, endDate = null, cursor = null) => {
   const params = {
     page,
     limit,
     search,
     start_date: startDate,
     end_date: endDate,
+    cursor: cursor || undefined, // next_cursor / prev_cursor of an adjacent page (faster than page)
     _t: new Date().getTime()
   };
   const response = await axios.get(`${API_URL}/list`, { params });